@@ -0,0 +1,3 @@
+from aoc2023.runner import main
+
+main()
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple, Type, Union
+
+from aoc2023.puzzle import AOCPuzzle, PuzzleInput
+from aoc2023.state_cache import class_name, class_source_digest, input_digest
+
+"""
+On-disk cache of puzzle answers
+
+Answers are stored as small json files in a local folder, keyed by:
+* the puzzle class
+* the input content hash (SHA-256 of the file or in-memory buffer; callers which already know it can pass it)
+* the solve argument (for puzzles which need one)
+* the sources hash of the puzzle module and of the aoc2023 modules it imports (so that code changes, including in shared modules
+  like intervals or search, invalidate old answers)
+
+On a hit, the answer is returned without building the puzzle (i.e. neither parsing nor solving).
+The cache is used by the run command (--answer-cache option), and by API callers; other commands (solve-all, batch, daemon) don't use it.
+Entries expire after a time to live, and least recently used ones are evicted when the cache gets too large.
+Hits/misses/expirations/evictions are accumulated in a stats file of the cache folder (approximate if several processes share the cache).
+"""
+
+# Default cache folder
+DEFAULT_ANSWER_CACHE_DIR = Path.home() / ".cache" / "aoc2023" / "answers"
+
+# Default entries time to live (seconds)
+DEFAULT_TTL = 30 * 24 * 3600
+
+# Default cache size (bytes)
+DEFAULT_MAX_SIZE = 16 * 1024 * 1024
+
+# Cache entries extension
+ENTRY_EXT = ".json"
+
+# Statistics file
+STATS_FILE = "stats.json"
+
+# Puzzle solution
+Solution = Union[int, str, List[str]]
+
+
+# Hash of a solve argument (None, int or tuple of ints)
+def arg_digest(solve_arg) -> str:
+    return hashlib.sha256(repr(solve_arg).encode()).hexdigest()[:16]
+
+
+class AnswerCache:
+    def __init__(self, cache_dir: Path = DEFAULT_ANSWER_CACHE_DIR, ttl: float = DEFAULT_TTL, max_size: int = DEFAULT_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_size = max_size
+
+        # Statistics of this instance (not yet saved)
+        self.counters: Dict[str, int] = {}
+
+    def entry_path(self, puzzle_class: Type[AOCPuzzle], input_file: PuzzleInput, solve_arg=None, digest: str = None) -> Path:
+        digest = digest or input_digest(input_file)
+        return self.cache_dir / f"{class_name(puzzle_class)}-{digest}-{arg_digest(solve_arg)}-{class_source_digest(puzzle_class)}{ENTRY_EXT}"
+
+    @property
+    def entries(self) -> List[Path]:
+        return [p for p in self.cache_dir.glob(f"*{ENTRY_EXT}") if p.name != STATS_FILE] if self.cache_dir.is_dir() else []
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def get(self, puzzle_class: Type[AOCPuzzle], input_file: PuzzleInput, solve_arg=None, digest: str = None) -> Tuple[bool, Solution]:
+        # Check file existence
+        assert digest is not None or not isinstance(input_file, Path) or input_file.is_file(), f"File not found: {input_file}"
+
+        # Cached and not expired?
+        entry = self.entry_path(puzzle_class, input_file, solve_arg, digest)
+        try:
+            stat = entry.stat()
+            if time.time() - stat.st_mtime > self.ttl:
+                logging.info(f"Expired cached answer {entry}")
+                entry.unlink(missing_ok=True)
+                self.count("expired")
+            else:
+                solution = json.loads(entry.read_bytes())["solution"]
+                os.utime(entry)
+                self.count("hits")
+                return True, solution
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            # Corrupted entry: forget it
+            logging.warning(f"Can't read cached answer from {entry}: {e}")
+            entry.unlink(missing_ok=True)
+        self.count("misses")
+        return False, None
+
+    def put(self, puzzle_class: Type[AOCPuzzle], input_file: PuzzleInput, solution: Solution, solve_arg=None, digest: str = None):
+        # Write in a temporary file first, as concurrent processes may share the cache
+        entry = self.entry_path(puzzle_class, input_file, solve_arg, digest)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_entry = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        source = str(input_file) if isinstance(input_file, Path) else None
+        tmp_entry.write_text(json.dumps({"solution": solution, "input": source, "arg": solve_arg}))
+        os.replace(tmp_entry, entry)
+        logging.info(f"Stored answer in {entry}")
+        self.evict()
+
+    def solve(self, puzzle_class: Type[AOCPuzzle], input_file: PuzzleInput, solve_arg=None, digest: str = None) -> Tuple[Solution, bool]:
+        # Cached answer, or build and solve puzzle (returns the solution, and whether it was cached)
+        digest = digest or input_digest(input_file)
+        found, solution = self.get(puzzle_class, input_file, solve_arg, digest)
+        if not found:
+            p = puzzle_class(input_file)
+            solution = p.solve() if solve_arg is None else p.solve(solve_arg)
+            self.put(puzzle_class, input_file, solution, solve_arg, digest)
+        self.save_stats()
+        return solution, found
+
+    def evict(self):
+        # Remove expired entries, then least recently used ones until the cache size fits
+        now = time.time()
+        entries = sorted(((p, p.stat()) for p in self.entries), key=lambda t: t[1].st_mtime)
+        total_size = sum(s.st_size for _, s in entries)
+        for entry, stat in entries:
+            expired = now - stat.st_mtime > self.ttl
+            if not expired and total_size <= self.max_size:
+                break
+            logging.info(f"Evicting cached answer {entry}")
+            entry.unlink(missing_ok=True)
+            total_size -= stat.st_size
+            self.count("expired" if expired else "evictions")
+
+    def invalidate(self, puzzle_class: Type[AOCPuzzle] = None, input_file: PuzzleInput = None):
+        # Remove all entries matching the class and/or input (or all entries if none is specified)
+        prefix = f"{class_name(puzzle_class)}-" if puzzle_class is not None else ""
+        digest = f"-{input_digest(input_file)}-" if input_file is not None else ""
+        for entry in filter(lambda p: p.name.startswith(prefix) and digest in p.name, self.entries):
+            logging.info(f"Invalidating cached answer {entry}")
+            entry.unlink(missing_ok=True)
+
+    def save_stats(self):
+        # Accumulate counters of this instance in the stats file
+        if not self.counters:
+            return
+        stats = self.stats()
+        stats.pop("hit_rate")
+        stats_file = self.cache_dir / STATS_FILE
+        stats_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = stats_file.with_name(f"{STATS_FILE}.{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(stats))
+        os.replace(tmp_file, stats_file)
+        self.counters.clear()
+
+    def stats(self) -> Dict[str, float]:
+        # Saved statistics, including counters of this instance
+        stats_file = self.cache_dir / STATS_FILE
+        try:
+            stats = json.loads(stats_file.read_bytes())
+        except (FileNotFoundError, ValueError):
+            stats = {}
+        out = {name: stats.get(name, 0) + self.counters.get(name, 0) for name in ("hits", "misses", "expired", "evictions")}
+        lookups = out["hits"] + out["misses"]
+        out["hit_rate"] = out["hits"] / lookups if lookups else 0.0
+        return out
@@ -0,0 +1,65 @@
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, List, Type, Union
+
+from aoc2023.puzzle import AOCPuzzle, PuzzleInput
+
+"""
+Batch API: solve many inputs of a same puzzle class
+
+All inputs (files or in-memory buffers) are parsed first, then solved together through the puzzle class solve_batch() method
+(one by one by default; some days solve all inputs at once, e.g. with vectorized operations).
+Solutions are returned in inputs order, with aggregated throughput metrics.
+"""
+
+
+# Batch results and metrics
+@dataclass
+class BatchResult:
+    solutions: List[Union[int, str, List[str]]] = field(default_factory=list)
+    bytes_read: int = 0
+    parse_time: float = 0.0
+    solve_time: float = 0.0
+    wall_time: float = 0.0
+
+    @property
+    def inputs(self) -> int:
+        return len(self.solutions)
+
+    @property
+    def inputs_per_s(self) -> float:
+        return self.inputs / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes_read / (1024 * 1024) / self.wall_time if self.wall_time > 0 else 0.0
+
+    def metrics(self) -> dict:
+        out = asdict(self)
+        del out["solutions"]
+        out.update({"inputs": self.inputs, "inputs_per_s": self.inputs_per_s, "mb_per_s": self.mb_per_s})
+        return out
+
+    def metrics_json(self) -> str:
+        return json.dumps(self.metrics(), indent=4)
+
+
+# Solve a batch of inputs for a given puzzle class
+def solve_batch(puzzle_class: Type[AOCPuzzle], inputs: Iterable[PuzzleInput], solve_arg=None) -> BatchResult:
+    out = BatchResult()
+    start = time.perf_counter()
+
+    # Parse all inputs
+    puzzles = [puzzle_class(i) for i in inputs]
+    out.bytes_read = sum(p.instrumentation.bytes_read for p in puzzles)
+    parsed = time.perf_counter()
+    out.parse_time = parsed - start
+
+    # Solve them all
+    out.solutions = puzzle_class.solve_batch(puzzles) if solve_arg is None else puzzle_class.solve_batch(puzzles, solve_arg)
+    assert len(out.solutions) == len(puzzles), f"Expected {len(puzzles)} solutions, got {len(out.solutions)}"
+    end = time.perf_counter()
+    out.solve_time = end - parsed
+    out.wall_time = end - start
+    return out
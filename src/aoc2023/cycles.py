@@ -0,0 +1,66 @@
+from typing import Callable, Dict, Hashable, List, Sequence
+
+"""
+Cycle detection in a sequence of states (state n+1 = step(state n))
+
+States are indexed by their key (a compact hashable value like bytes or an int bitset, by default the state itself), so that a repeating state
+is found with a single dict lookup per step. States are only computed when needed: "state after N steps" queries stop as soon as either
+N steps or a cycle are reached, and are then answered from the recorded states.
+"""
+
+
+class CycleDetector:
+    def __init__(self, initial: object, step: Callable[[object], object], key: Callable[[object], Hashable] = None):
+        self.step = step
+        self.key = key if key is not None else (lambda state: state)
+
+        # Recorded states, and their indexes by key
+        self.states: List[object] = [initial]
+        self.indexes: Dict[Hashable, int] = {self.key(initial): 0}
+
+        # Cycle, once found: index of the first repeated state, and cycle length
+        self.start: int = None
+        self.length: int = None
+
+    @property
+    def found(self) -> bool:
+        return self.length is not None
+
+    def advance(self) -> bool:
+        # Compute one more state (returns False once a cycle is found)
+        if self.found:
+            return False
+        state = self.step(self.states[-1])
+        state_key = self.key(state)
+        index = self.indexes.get(state_key)
+        if index is not None:
+            self.start, self.length = index, len(self.states) - index
+            return False
+        self.indexes[state_key] = len(self.states)
+        self.states.append(state)
+        return True
+
+    def run(self, max_steps: int = None) -> bool:
+        # Compute states until finding a cycle (or reaching max steps); returns True if a cycle was found
+        while (max_steps is None or len(self.states) <= max_steps) and self.advance():
+            pass
+        return self.found
+
+    def index(self, steps: int) -> int:
+        # Index of the recorded state equivalent to the state after required steps
+        self.run(steps)
+        if steps < len(self.states):
+            return steps
+        return self.start + (steps - self.start) % self.length
+
+    def state_at(self, steps: int) -> object:
+        # State after required steps
+        return self.states[self.index(steps)]
+
+    def sum_until(self, values: Sequence[int], steps: int) -> int:
+        # Sum of values (one per recorded state) over the first states of the sequence, until required steps (excluded)
+        self.run(steps)
+        if steps <= len(self.states):
+            return sum(values[:steps])
+        cycles, remaining = divmod(steps - self.start, self.length)
+        return sum(values[: self.start]) + cycles * sum(values[self.start : self.start + self.length]) + sum(values[self.start : self.start + remaining])
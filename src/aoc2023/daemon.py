@@ -0,0 +1,302 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import List, Tuple
+
+from aoc2023.registry import REGISTRY
+from aoc2023.runner import SOLVE_ARGS
+from aoc2023.state_cache import class_name, restore_state, state_of
+
+"""
+Warm solver daemon, serving puzzle solve requests on a local Unix socket
+
+The daemon process preloads all puzzle modules (and their heavy dependencies) in a set of worker processes, which stay alive
+between requests. Each worker keeps parsed puzzles state in memory (LRU, bounded size): requests are routed to workers by
+input content hash, so that repeated inputs are always handled by the worker which already parsed them.
+
+Protocol: each message is a frame made of a header (json) and a payload (raw bytes), prefixed by both lengths (2 x uint32, big endian).
+Requests headers:
+* {"op": "solve", "day": 17, "step": 2, "arg": null}, with input content as payload
+* {"op": "stats"}
+* {"op": "shutdown"}
+Responses headers are json objects, with an "error" field if the request failed (a worker process which died is restarted, and the
+request which was running on it fails).
+"""
+
+# Default socket path
+DEFAULT_SOCKET = Path.home() / ".cache" / "aoc2023" / "daemon.sock"
+
+# Default parsed state memory cache size, per worker (bytes)
+DEFAULT_MEMORY_CACHE_SIZE = 256 * 1024 * 1024
+
+# Frame prefix: header and payload lengths
+FRAME_PREFIX = struct.Struct(">II")
+
+
+# Read exactly n bytes from a socket
+def recv_exactly(sock: socket.socket, n: int) -> bytes:
+    out = bytearray()
+    while len(out) < n:
+        chunk = sock.recv(min(n - len(out), 1024 * 1024))
+        if not chunk:
+            raise EOFError(f"Connection closed ({len(out)}/{n} bytes received)")
+        out.extend(chunk)
+    return bytes(out)
+
+
+# Send a frame
+def send_frame(sock: socket.socket, header: dict, payload: bytes = b""):
+    header_bytes = json.dumps(header).encode()
+    sock.sendall(FRAME_PREFIX.pack(len(header_bytes), len(payload)) + header_bytes)
+    if payload:
+        sock.sendall(payload)
+
+
+# Receive a frame
+def recv_frame(sock: socket.socket) -> Tuple[dict, bytes]:
+    header_size, payload_size = FRAME_PREFIX.unpack(recv_exactly(sock, FRAME_PREFIX.size))
+    header_bytes = recv_exactly(sock, header_size)
+    payload = recv_exactly(sock, payload_size)
+
+    # Whole frame is read before decoding the header, so that the stream stays in sync if it is invalid
+    return json.loads(header_bytes), payload
+
+
+# Worker process state: parsed puzzles (pickled state without the input, as solve may modify the puzzle), by class name and input digest
+class ParsedStates:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.states: OrderedDict = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> bytes:
+        state = self.states.get(key)
+        if state is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.states.move_to_end(key)
+        return state
+
+    def put(self, key: Tuple[str, str], state: bytes):
+        self.states[key] = state
+        self.size += len(state)
+
+        # Evict least recently used states until the cache size fits
+        while self.size > self.max_size and self.states:
+            _, evicted = self.states.popitem(last=False)
+            self.size -= len(evicted)
+
+    def stats(self) -> dict:
+        return {"pid": os.getpid(), "entries": len(self.states), "size": self.size, "hits": self.hits, "misses": self.misses}
+
+
+# Parsed states of the current worker process
+WORKER_STATES: ParsedStates = None
+
+
+# Worker process initializer: preload everything
+def init_worker(memory_cache_size: int):
+    global WORKER_STATES
+    WORKER_STATES = ParsedStates(memory_cache_size)
+
+    # Heavy dependencies are lazily imported by puzzles: import them once for all
+    import networkx  # noqa: F401
+    import numpy  # noqa: F401
+    import z3  # noqa: F401
+
+    for day, step in REGISTRY:
+        REGISTRY.get(day, step)
+
+
+# Check a worker is ready
+def worker_stats() -> dict:
+    return WORKER_STATES.stats()
+
+
+# Solve a request (in a worker process)
+def solve_request(day: int, step: int, digest: str, data: bytes, solve_arg=None) -> dict:
+    out = {"day": day, "step": step, "cached": False}
+    try:
+        puzzle_class = REGISTRY.get(day, step)
+        key = (class_name(puzzle_class), digest)
+
+        # Parse, or restore from memory
+        start = time.perf_counter()
+        state = WORKER_STATES.get(key)
+        if state is None:
+            p = puzzle_class(data)
+            WORKER_STATES.put(key, pickle.dumps(state_of(p), protocol=pickle.HIGHEST_PROTOCOL))
+        else:
+            p = restore_state(puzzle_class, pickle.loads(state), data)
+            out["cached"] = True
+        out["parse_time"] = time.perf_counter() - start
+
+        # Solve
+        start = time.perf_counter()
+        solve_arg = solve_arg if solve_arg is not None else SOLVE_ARGS.get((day, step))
+        out["solution"] = p.solve() if solve_arg is None else p.solve(tuple(solve_arg) if isinstance(solve_arg, list) else solve_arg)
+        out["solve_time"] = time.perf_counter() - start
+    except Exception as e:
+        out["error"] = f"{type(e).__name__}: {e}"
+    return out
+
+
+# Request handler: serve frames until the client disconnects
+class RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                header, payload = recv_frame(self.request)
+            except EOFError:
+                return
+            except ValueError as e:
+                send_frame(self.request, {"error": f"Invalid request: {e}"})
+                continue
+            send_frame(self.request, self.server.solver.handle(header, payload))
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class SolverDaemon:
+    def __init__(self, socket_path: Path = DEFAULT_SOCKET, workers: int = None, memory_cache_size: int = DEFAULT_MEMORY_CACHE_SIZE):
+        self.socket_path = socket_path
+        self.started = time.time()
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.memory_cache_size = memory_cache_size
+
+        # One single-process pool per worker, so that requests can be routed by input
+        self.workers = [self.new_worker() for _ in range(workers or os.cpu_count())]
+
+        # Start (and warm) all workers now
+        for w in self.workers:
+            w.submit(worker_stats).result()
+        logging.info(f"{len(self.workers)} warm workers started")
+
+        # Listen on socket
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if socket_path.exists():
+            socket_path.unlink()
+        self.server = DaemonServer(str(socket_path), RequestHandler)
+        self.server.solver = self
+
+    def new_worker(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=1, initializer=init_worker, initargs=(self.memory_cache_size,))
+
+    def run_on_worker(self, index: int, func, *args):
+        # Run a function on a worker, restarting it if its process died (the running request fails)
+        worker = self.workers[index]
+        try:
+            return worker.submit(func, *args).result()
+        except BrokenProcessPool:
+            with self.lock:
+                if self.workers[index] is worker:
+                    logging.warning(f"Worker {index} died, restarting it")
+                    worker.shutdown(wait=False)
+                    self.workers[index] = self.new_worker()
+            raise
+
+    def handle(self, header: dict, payload: bytes) -> dict:
+        with self.lock:
+            self.requests += 1
+        try:
+            return self.handle_request(header, payload)
+        except Exception as e:
+            # Request failed, but the daemon keeps serving
+            logging.warning(f"Request {header} failed: {type(e).__name__}: {e}")
+            return {"error": f"{type(e).__name__}: {e}"}
+
+    def handle_request(self, header: dict, payload: bytes) -> dict:
+        assert isinstance(header, dict), f"Invalid request header: {header}"
+        op = header.get("op")
+        if op == "solve":
+            assert "day" in header and "step" in header, f"Missing day/step in request: {header}"
+
+            # Route to a worker by input content
+            start = time.perf_counter()
+            digest = hashlib.sha256(payload).hexdigest()
+            out = self.run_on_worker(int(digest[:8], 16) % len(self.workers), solve_request, header["day"], header["step"], digest, payload, header.get("arg"))
+            out["latency"] = time.perf_counter() - start
+            return out
+        if op == "stats":
+            return {
+                "uptime": time.time() - self.started,
+                "requests": self.requests,
+                "workers": [self.run_on_worker(i, worker_stats) for i in range(len(self.workers))],
+            }
+        if op == "shutdown":
+            # Stop serving from another thread (shutdown waits for the serving loop to exit)
+            threading.Thread(target=self.server.shutdown).start()
+            return {"shutdown": True}
+        return {"error": f"Unknown request: {op}"}
+
+    def serve_forever(self):
+        logging.info(f"Serving on {self.socket_path}")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        self.server.server_close()
+        self.socket_path.unlink(missing_ok=True)
+        for w in self.workers:
+            w.shutdown()
+
+
+# Client for the solver daemon
+class DaemonClient:
+    def __init__(self, socket_path: Path = DEFAULT_SOCKET, timeout: float = None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(str(socket_path))
+
+    def request(self, header: dict, payload: bytes = b"") -> dict:
+        send_frame(self.sock, header, payload)
+        return recv_frame(self.sock)[0]
+
+    def solve(self, day: int, step: int, data: bytes, solve_arg=None) -> dict:
+        return self.request({"op": "solve", "day": day, "step": step, "arg": solve_arg}, data)
+
+    def stats(self) -> dict:
+        return self.request({"op": "stats"})
+
+    def shutdown(self) -> dict:
+        return self.request({"op": "shutdown"})
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# Wait for a daemon to be ready
+def wait_ready(socket_path: Path = DEFAULT_SOCKET, timeout: float = 60.0) -> List[dict]:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            with DaemonClient(socket_path) as c:
+                return c.stats()["workers"]
+        except OSError:
+            assert time.perf_counter() < deadline, f"Solver daemon not ready after {timeout}s: {socket_path}"
+            time.sleep(0.1)
@@ -1,6 +1,5 @@
-import logging
-
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.tracing import trace
 
 """
 Template for puzzle solution implementation
@@ -11,7 +10,7 @@ Solutions for https://adventofcode.com/2023/day/0
 class D00Puzzle(AOCPuzzle):
     def parse_line(self, index: int, line: str) -> str:
         # Super call to get line
-        logging.info(">>> parsed line")
+        trace(">>> parsed line")
         super().parse_line(index, line)
 
 
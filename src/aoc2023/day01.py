@@ -1,7 +1,7 @@
-import logging
 from pathlib import Path
 
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.tracing import trace
 
 """
 Solutions for https://adventofcode.com/2023/day/1
@@ -9,6 +9,10 @@ Solutions for https://adventofcode.com/2023/day/1
 
 
 class D01Puzzle(AOCPuzzle):
+    STREAMING = True
+    KEEP_INPUT_LINES = False
+    CHUNKED_PARSING = ("digits",)
+
     def __init__(self, input_file: Path):
         self.digits = []
         super().__init__(input_file)
@@ -23,7 +27,7 @@ class D01Step1Puzzle(D01Puzzle):
         # Parse digits
         line_digits = [int(i) for i in filter(lambda c: c >= "0" and c <= "9", super().parse_line(index, line))]
         self.digits.append(line_digits)
-        logging.info(f"digits for line {index}: {line_digits[0]} and {line_digits[-1]}")
+        trace("digits for line %s: %s and %s", index, line_digits[0], line_digits[-1])
 
 
 # Map for digits mapping
@@ -65,4 +69,4 @@ class D01Step2Puzzle(D01Puzzle):
             # Just increment by one, since there may be overlaps like "twone" or "nineight"
             i += 1
         self.digits.append(line_digits)
-        logging.info(f"digits for line {index}: {line_digits[0]} and {line_digits[-1]}")
+        trace("digits for line %s: %s and %s", index, line_digits[0], line_digits[-1])
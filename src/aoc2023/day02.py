@@ -1,8 +1,8 @@
-import logging
 import re
 from pathlib import Path
 
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.tracing import trace
 
 """
 Solutions for https://adventofcode.com/2023/day/2
@@ -19,6 +19,10 @@ BLUE_PATTERN = re.compile("([0-9]+) blue")
 
 
 class D02Puzzle(AOCPuzzle):
+    STREAMING = True
+    KEEP_INPUT_LINES = False
+    CHUNKED_PARSING = ("games",)
+
     def __init__(self, input_file: Path):
         self.games = {}
         super().__init__(input_file)
@@ -43,7 +47,7 @@ class D02Puzzle(AOCPuzzle):
                         b = int(m.group(1))
                 g_sets.append((r, g, b))
             self.games[g_id] = g_sets
-            logging.info(f">>> game {g_id}: {g_sets}")
+            trace(">>> game %s: %s", g_id, g_sets)
 
 
 class D02Step1Puzzle(D02Puzzle):
@@ -1,41 +1,51 @@
 import re
 from pathlib import Path
 
-from aoc2023.puzzle import AOCPuzzle
+from aoc2023.grid import GridPuzzle
 
 """
 Solutions for https://adventofcode.com/2023/day/3
 """
 
-# Numbers and symbols patterns
-NUM_PATTERN = re.compile("([0-9]+)")
-SMB_PATTERN = re.compile("[^0-9.]")
-GEAR_PATTERN = re.compile(r"\*")
+# Numbers and gears patterns
+NUM_PATTERN = re.compile(b"([0-9]+)")
+GEAR_PATTERN = re.compile(rb"\*")
 
+# Cell values
+DOT = ord(".")
+ZERO = ord("0")
+NINE = ord("9")
 
-class D03Puzzle(AOCPuzzle):
+
+class D03Puzzle(GridPuzzle):
     def __init__(self, input_file: Path):
         super().__init__(input_file)
-        self.line_length = len(self.input_lines[0])
+        self.line_length = self.grid.width
 
-        # Prepend padded line in front of all lines
-        self.padded_lines = ["." * self.line_length] + self.input_lines
+        # Rows, with a padded row in front of them
+        self.rows = self.grid.rows()
+        self.padded_rows = [b"." * self.line_length] + self.rows
 
 
 class D03Step1Puzzle(D03Puzzle):
     def solve(self) -> int:
+        # Lazy import (heavy dependency)
+        import numpy as np
+
+        # Mark all cells adjacent to a symbol (including diagonals)
+        a = self.grid.array
+        symbols = np.pad((a != DOT) & ((a < ZERO) | (a > NINE)), 1)
+        near_symbol = np.zeros(a.shape, dtype=bool)
+        for dy in range(3):
+            for dx in range(3):
+                near_symbol |= symbols[dy : dy + a.shape[0], dx : dx + a.shape[1]]
+
         # Iterate on lines to find numbers
         total_parts = 0
-        for i in range(len(self.input_lines)):
-            for m_num in re.finditer(NUM_PATTERN, self.input_lines[i]):
-                # Number boundaries
-                s, e = m_num.span()
-                s, e = max(s - 1, 0), min(e + 1, self.line_length)
-
-                # Build a single list with all symbols around the number
-                symbols_around = "".join(r[s:e] for r in self.padded_lines[i : i + 3])
-                if SMB_PATTERN.search(symbols_around):
-                    # At least one symbol found around: this is a part number
+        for i, row in enumerate(self.rows):
+            for m_num in NUM_PATTERN.finditer(row):
+                # At least one symbol found around: this is a part number
+                if near_symbol[i, m_num.start() : m_num.end()].any():
                     total_parts += int(m_num.group(1))
 
         return total_parts
@@ -45,12 +55,12 @@ class D03Step2Puzzle(D03Puzzle):
     def solve(self) -> int:
         # Iterate on lines to find gears
         total_gears = 0
-        for i in range(len(self.input_lines)):
-            for m_gear in re.finditer(GEAR_PATTERN, self.input_lines[i]):
+        for i, row in enumerate(self.rows):
+            for m_gear in GEAR_PATTERN.finditer(row):
                 # Find all numbers around
                 numbers = []
-                for r in self.padded_lines[i : i + 3]:
-                    for m_nb in re.finditer(NUM_PATTERN, r):
+                for r in self.padded_rows[i : i + 3]:
+                    for m_nb in NUM_PATTERN.finditer(r):
                         if (m_nb.start() - 1) <= m_gear.start() <= m_nb.end():
                             numbers.append(int(m_nb.group(1)))
                 if len(numbers) == 2:
@@ -1,23 +1,21 @@
-import logging
-import re
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 
+from aoc2023.ints import extract_ints
+from aoc2023.models import slotted
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.sidecar import Tokens
+from aoc2023.tracing import trace
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
 
 """
 Solutions for https://adventofcode.com/2023/day/4
 """
 
-# Pattern for line parsing
-LINE_PATTERN = re.compile("Card +([0-9]+): ([^|]+)\\|(.+)")
-
-# Pattern for numbers parsing
-NUMBER_PATTERN = re.compile("[0-9]+")
-
 
-@dataclass
+@slotted
 class CardModel:
     index: int
     winning_ones: List[int]
@@ -29,20 +27,27 @@ class CardModel:
 
 
 class D04Puzzle(AOCPuzzle):
+    BUFFERED_PARSING = True
+    KEEP_INPUT_LINES = False
+    CHUNKED_PARSING = ("cards",)
+    SIDECAR_FORMAT = "d04.v1"
+
     def __init__(self, input_file: Path):
         self.cards: Dict[int, CardModel] = {}
         super().__init__(input_file)
 
-    def parse_line(self, index: int, line: str) -> str:
-        m = LINE_PATTERN.match(super().parse_line(index, line))
-        if m:  # pragma: no branch
-            card = CardModel(
-                int(m.group(1)),
-                [int(n.group(0)) for n in re.finditer(NUMBER_PATTERN, m.group(2))],
-                [int(n.group(0)) for n in re.finditer(NUMBER_PATTERN, m.group(3))],
-            )
-            self.cards[card.index] = card
-            logging.info(f">>> card on line {index}: {card}")
+    @classmethod
+    def tokenize(cls, data: bytes) -> Tokens:
+        # One row per card: index, winning numbers, given numbers (counts are the same for all cards, given by the first line)
+        first_line = data.split(b"\n", 1)[0]
+        winning = len(extract_ints(first_line.split(b"|", 1)[0])) - 1
+        return {"cards": extract_ints(data, len(extract_ints(first_line)))}, {"winning": winning}
+
+    def load_tokens(self, arrays: Dict[str, "np.ndarray"], meta: dict):
+        given_start = meta["winning"] + 1
+        for row in arrays["cards"].tolist():
+            self.cards[row[0]] = CardModel(row[0], row[1:given_start], row[given_start:])
+        trace(">>> parsed %s cards", len(self.cards))
 
 
 class D04Step1Puzzle(D04Puzzle):
@@ -52,7 +57,7 @@ class D04Step1Puzzle(D04Puzzle):
         for card in self.cards.values():
             if card.winning_numbers_count > 0:
                 card_score = pow(2, card.winning_numbers_count - 1)
-                logging.info(f"card {card.index} score: {card_score} ({card.winning_numbers_count})")
+                trace("card %s score: %s (%s)", card.index, card_score, card.winning_numbers_count)
                 score += card_score
         return score
 
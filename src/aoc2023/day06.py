@@ -1,45 +1,49 @@
-import logging
-import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, Dict, List
 
+from aoc2023.ints import extract_ints
+from aoc2023.models import slotted
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.sidecar import Tokens
+from aoc2023.tracing import trace
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
 
 """
 Solutions for https://adventofcode.com/2023/day/6
 """
 
 
-SEPARATED_DIGITS_PATTERN = re.compile("([0-9]+)")
-ONE_BIG_DIGIT_PATTERN = re.compile("([0-9 ]+)")
-
-
-@dataclass
+@slotted
 class Record:
     time: int
     dist: int = 0
 
 
 class D06Puzzle(AOCPuzzle, ABC):
+    BUFFERED_PARSING = True
+    KEEP_INPUT_LINES = False
+    SIDECAR_FORMAT = "d06.v1"
+
     def __init__(self, input_file: Path):
         self.records: List[Record] = []
         super().__init__(input_file)
-        logging.info(f"Parsed records: {self.records}")
+        trace("Parsed records: %s", self.records)
 
     @abstractmethod
-    def get_pattern(self) -> re.Pattern:  # pragma: no cover
+    def records_of(self, times: List[int], dists: List[int]) -> List[Record]:  # pragma: no cover
         pass
 
-    def parse_line(self, index: int, line: str) -> str:
-        line = super().parse_line(index, line)
-        if line.startswith("Time:"):
-            for m in re.finditer(self.get_pattern(), line):
-                self.records.append(Record(int(m.group(1).replace(" ", ""))))
-        elif line.startswith("Distance:"):  # pragma: no branch
-            for m, rec in zip(re.finditer(self.get_pattern(), line), self.records):
-                rec.dist = int(m.group(1).replace(" ", ""))
+    @classmethod
+    def tokenize(cls, data: bytes) -> Tokens:
+        # Times and distances rows
+        return {"records": extract_ints(data).reshape(2, -1)}, {}
+
+    def load_tokens(self, arrays: Dict[str, "np.ndarray"], meta: dict):
+        times, dists = arrays["records"].tolist()
+        self.records = self.records_of(times, dists)
 
     def solve(self) -> int:
         # t = time
@@ -59,7 +63,7 @@ class D06Puzzle(AOCPuzzle, ABC):
                 valid_values -= 2
                 x += 1
 
-            logging.info(f"For record {rec}: {valid_values} valid values")
+            trace("For record %s: %s valid values", rec, valid_values)
 
             all_valid_values *= valid_values
 
@@ -67,10 +71,11 @@ class D06Puzzle(AOCPuzzle, ABC):
 
 
 class D06Step1Puzzle(D06Puzzle):
-    def get_pattern(self) -> re.Pattern:
-        return SEPARATED_DIGITS_PATTERN
+    def records_of(self, times: List[int], dists: List[int]) -> List[Record]:
+        return [Record(t, d) for t, d in zip(times, dists)]
 
 
 class D06Step2Puzzle(D06Puzzle):
-    def get_pattern(self) -> re.Pattern:
-        return ONE_BIG_DIGIT_PATTERN
+    def records_of(self, times: List[int], dists: List[int]) -> List[Record]:
+        # Numbers are just concatenated
+        return [Record(int("".join(map(str, times))), int("".join(map(str, dists))))]
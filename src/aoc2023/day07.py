@@ -1,11 +1,12 @@
-import logging
 import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import Counter
 from pathlib import Path
 from typing import Dict
 
+from aoc2023.models import slotted
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.tracing import trace
 
 """
 Solutions for https://adventofcode.com/2023/day/7
@@ -35,7 +36,7 @@ STEP2_COMP_CHAR["J"] = "1"
 
 
 # Hand model
-@dataclass
+@slotted
 class Hand:
     strength: int  # Hand strength, determined by cards combination
     comp_str: str  # Representative string for comparison for equivalent strength
@@ -47,8 +48,13 @@ class Hand:
 
 
 class D07Puzzle(AOCPuzzle, ABC):
+    STREAMING = True
+    KEEP_INPUT_LINES = False
+    CHUNKED_PARSING = ("hands",)
+
     def __init__(self, input_file: Path):
         self.hands = []
+        self.comp_table = str.maketrans(self.mapping())
         super().__init__(input_file)
 
     @abstractmethod
@@ -90,18 +96,9 @@ class D07Puzzle(AOCPuzzle, ABC):
             hand = m.group(1)
             bid = int(m.group(2))
 
-            # Iterate on cards
-            comp_str = ""
-            hand_map = {}
-            for c in hand:
-                # Build representative string
-                comp_str += self.mapping()[c]
-
-                # Build representative map
-                if c in hand_map:
-                    hand_map[c] += 1
-                else:
-                    hand_map[c] = 1
+            # Build representative string and map
+            comp_str = hand.translate(self.comp_table)
+            hand_map = Counter(hand)
 
             # Reckon strength
             strength = self.reckon_strength(hand_map)
@@ -109,12 +106,12 @@ class D07Puzzle(AOCPuzzle, ABC):
             # New hand
             h = Hand(strength, comp_str, bid)
             self.hands.append(h)
-            logging.info(f"Parsed hand: {h}")
+            trace("Parsed hand: %s", h)
 
     def solve(self) -> int:
         # Sort list of hands
         sorted_hands = sorted(self.hands)
-        logging.info(f"sorted hands: {sorted_hands}")
+        trace("sorted hands: %s", sorted_hands)
         out = 0
         for rank, h in enumerate(sorted_hands, start=1):
             out += rank * h.bid
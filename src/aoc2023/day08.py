@@ -1,12 +1,16 @@
-import logging
 import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
 from math import lcm
 from pathlib import Path
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 
+from aoc2023.models import slotted
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.sidecar import Tokens
+from aoc2023.tracing import trace
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
 
 """
 Solutions for https://adventofcode.com/2023/day/8
@@ -19,7 +23,7 @@ INSTRUCTION_PATTERN = re.compile("([RL]+)")
 NODES_PATTERN = re.compile("([A-Z1-9]{3}) = \\(([A-Z1-9]{3}), ([A-Z1-9]{3})\\)")
 
 
-@dataclass
+@slotted
 class Node:
     name: str
     left: str
@@ -27,6 +31,10 @@ class Node:
 
 
 class D08Puzzle(AOCPuzzle, ABC):
+    STREAMING = True
+    KEEP_INPUT_LINES = False
+    SIDECAR_FORMAT = "d08.v1"
+
     def __init__(self, input_file: Path):
         self.instructions = None
         self.nodes: Dict[str, Node] = {}
@@ -41,7 +49,25 @@ class D08Puzzle(AOCPuzzle, ABC):
             if m is not None:
                 name = m.group(1)
                 self.nodes[name] = Node(name, m.group(2), m.group(3))
-                logging.info(f"New node: {self.nodes[name]}")
+                trace("New node: %s", self.nodes[name])
+
+    @classmethod
+    def tokenize(cls, data: bytes) -> Tokens:
+        # Lazy import (heavy dependency)
+        import numpy as np
+
+        # Instructions characters, and nodes names (3 x 3 characters per node)
+        text = data.decode()
+        instructions = INSTRUCTION_PATTERN.match(text).group(1)
+        nodes = "".join("".join(m) for m in NODES_PATTERN.findall(text))
+        return {"instructions": np.frombuffer(instructions.encode(), dtype=np.uint8), "nodes": np.frombuffer(nodes.encode(), dtype=np.uint8).reshape(-1, 9)}, {}
+
+    def load_tokens(self, arrays: Dict[str, "np.ndarray"], meta: dict):
+        self.instructions = arrays["instructions"].tobytes().decode()
+        nodes = arrays["nodes"].tobytes().decode()
+        for i in range(0, len(nodes), 9):
+            name = nodes[i : i + 3]
+            self.nodes[name] = Node(name, nodes[i + 3 : i + 6], nodes[i + 6 : i + 9])
 
     @abstractmethod
     def start_nodes(self) -> List[str]:  # pragma: no cover
@@ -1,65 +1,127 @@
-import logging
-import re
 from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Sequence
 
+from aoc2023.ints import scan_ints
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.sidecar import Tokens
+from aoc2023.tracing import trace
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
 
 """
 Solutions for https://adventofcode.com/2023/day/9
 """
 
-# Number pattern
-NUM_PATTERN = re.compile("([0-9-]+)")
+# Max magnitude of extrapolation values computed with int64 (exclusive)
+INT64_BOUND = 2**63
+
+
+# All derivated sequences of a sequence, until a zero one
+def derivatives(seq: List[int]) -> List[List[int]]:
+    all_seqs = [seq]
+    go_on = True
+    while go_on:
+        in_work = all_seqs[-1]
+        delta = [in_work[i + 1] - in_work[i] for i in range(0, len(in_work) - 1)]
+        go_on = any(i != 0 for i in delta)
+        all_seqs.append(delta)
+    return all_seqs
+
+
+# Extrapolated next (or previous) value of a sequence, with Python ints
+def extrapolate(seq: List[int], backward: bool) -> int:
+    all_seqs = [s for s in derivatives(seq) if s]
+    return sum(s[0] if i % 2 == 0 else -s[0] for i, s in enumerate(all_seqs)) if backward else sum(s[-1] for s in all_seqs)
 
 
 class D09Puzzle(AOCPuzzle):
+    BUFFERED_PARSING = True
+    KEEP_INPUT_LINES = False
+    CHUNKED_PARSING = ("sequences",)
+    SIDECAR_FORMAT = "d09.v1"
+
     def __init__(self, input_file: Path):
-        self.seq_of_seqs = []
+        self.sequences: List[List[int]] = []
         super().__init__(input_file)
 
-    def parse_line(self, index: int, line: str) -> str:
-        # Parse sequence
-        line = super().parse_line(index, line)
-        seq = [int(m.group(1)) for m in re.finditer(NUM_PATTERN, line)]
-        logging.info(f"sequence at line {index}: {seq}")
-        all_seqs = [seq]
-
-        # Iterate until 0 delta, and build all derivated sequences
-        go_on = True
-        while go_on:
-            in_work = all_seqs[-1]
-            delta = [in_work[i + 1] - in_work[i] for i in range(0, len(in_work) - 1)]
-            go_on = any(i != 0 for i in delta)
-            all_seqs.append(delta)
-
-        self.seq_of_seqs.append(all_seqs)
+    @classmethod
+    def tokenize(cls, data: bytes) -> Tokens:
+        # Lazy import (heavy dependency)
+        import numpy as np
+
+        # All sequences values, and sequences lengths (one sequence per non-empty line)
+        values, lines = scan_ints(data)
+        return {"values": values, "lengths": np.unique(lines, return_counts=True)[1]}, {}
+
+    def load_tokens(self, arrays: Dict[str, "np.ndarray"], meta: dict):
+        values = arrays["values"].tolist()
+        start = 0
+        for length in arrays["lengths"].tolist():
+            self.sequences.append(values[start : start + length])
+            start += length
+        trace("parsed %s sequences", len(self.sequences))
+
+    @staticmethod
+    def extrapolate_all(puzzles: Sequence["D09Puzzle"], backward: bool) -> List[int]:
+        # Lazy import (heavy dependency)
+        import numpy as np
+
+        # Group sequences of all puzzles by length
+        groups = {}
+        for index, p in enumerate(puzzles):
+            for seq in p.sequences:
+                owners, seqs = groups.setdefault(len(seq), ([], []))
+                owners.append(index)
+                seqs.append(seq)
+
+        # Vectorized extrapolation for each group:
+        # - next value is the sum of last values of all derivated sequences
+        # - previous value is the alternated sum of first values of all derivated sequences
+        # Each derivation at most doubles values magnitude: groups which may overflow int64 are extrapolated with Python ints
+        totals = [0] * len(puzzles)
+        for length, (owners, seqs) in groups.items():
+            try:
+                d = np.array(seqs, dtype=np.int64)
+            except OverflowError:
+                d = None
+            if d is None or (d.size > 0 and (int(np.abs(d).max()) << length) >= INT64_BOUND):
+                values = [extrapolate(seq, backward) for seq in seqs]
+            else:
+                values = np.zeros(len(seqs), dtype=np.int64)
+                sign = 1
+                while d.shape[1] > 0:
+                    values += sign * d[:, 0] if backward else d[:, -1]
+                    sign = -sign
+                    d = np.diff(d, axis=1)
+                values = values.tolist()
+            for owner, value in zip(owners, values):
+                totals[owner] += value
+        return totals
 
 
 class D09Step1Puzzle(D09Puzzle):
     def solve(self) -> int:
-        # Iterate on sequences
-        total = 0
-        for all_seqs in self.seq_of_seqs:
-            # Predict next value
-            for n in range(len(all_seqs) - 1, 0, -1):
-                all_seqs[n - 1].append(all_seqs[n - 1][-1] + all_seqs[n][-1])
+        # Sum of predicted next values
+        return sum(sum(s[-1] for s in derivatives(seq)) for seq in self.sequences)
 
-            # Sum
-            total += all_seqs[0][-1]
-
-        return total
+    @classmethod
+    def solve_batch(cls, puzzles: Sequence[D09Puzzle]) -> List[int]:
+        return cls.extrapolate_all(puzzles, backward=False)
 
 
 class D09Step2Puzzle(D09Puzzle):
     def solve(self) -> int:
-        # Iterate on sequences
+        # Sum of predicted previous values
         total = 0
-        for all_seqs in self.seq_of_seqs:
+        for seq in self.sequences:
             # Predict previous value
-            for n in range(len(all_seqs) - 1, 0, -1):
-                all_seqs[n - 1].insert(0, all_seqs[n - 1][0] - all_seqs[n][0])
-
-            # Sum
-            total += all_seqs[0][0]
-
+            previous = 0
+            for s in reversed(derivatives(seq)[:-1]):
+                previous = s[0] - previous
+            total += previous
         return total
+
+    @classmethod
+    def solve_batch(cls, puzzles: Sequence[D09Puzzle]) -> List[int]:
+        return cls.extrapolate_all(puzzles, backward=True)
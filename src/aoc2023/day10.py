@@ -1,85 +1,67 @@
-import logging
-from enum import IntEnum, auto
 from pathlib import Path
+from typing import List
 
-from aoc2023.puzzle import AOCPuzzle
+from aoc2023.grid import GridPuzzle
+from aoc2023.search import UNREACHED, Search
+from aoc2023.tracing import trace
 
 """
 Solutions for https://adventofcode.com/2023/day/10
 """
 
-
-class Direction(IntEnum):
-    left = auto()
-    right = auto()
-    top = auto()
-    bottom = auto()
-
-
-OUTPUTS = {
-    "-": {Direction.left: Direction.left, Direction.right: Direction.right},
-    "|": {Direction.top: Direction.top, Direction.bottom: Direction.bottom},
-    "7": {Direction.right: Direction.bottom, Direction.top: Direction.left},
-    "L": {Direction.bottom: Direction.right, Direction.left: Direction.top},
-    "J": {Direction.right: Direction.top, Direction.bottom: Direction.left},
-    "F": {Direction.top: Direction.right, Direction.left: Direction.bottom},
+# Connected cells of each pipe (row, col offsets)
+CONNECTIONS = {
+    ord("-"): ((0, -1), (0, 1)),
+    ord("|"): ((-1, 0), (1, 0)),
+    ord("7"): ((0, -1), (1, 0)),
+    ord("L"): ((-1, 0), (0, 1)),
+    ord("J"): ((-1, 0), (0, -1)),
+    ord("F"): ((1, 0), (0, 1)),
 }
 
-NEXT = {Direction.left: (0, -1), Direction.right: (0, 1), Direction.top: (-1, 0), Direction.bottom: (1, 0)}
+
+# Vertical pipes
+VERTICAL = b"|JL"
 
 
-class D10Puzzle(AOCPuzzle):
+class D10Puzzle(GridPuzzle):
     def __init__(self, input_file: Path):
-        self.maze = []
-        self.start = None
         super().__init__(input_file)
-        self.size_x = len(self.maze[0])
-        self.size_y = len(self.maze)
-        self.paths_nodes = []
-
-    def parse_line(self, index: int, line: str) -> str:
-        line = super().parse_line(index, line)
-        if "S" in line:
-            self.start = (index - 1, line.find("S"))
-            logging.info(f"Start found at {self.start}")
-        self.maze.append(line)
+        self.maze = self.grid
+        self.size_x = self.maze.width
+        self.size_y = self.maze.height
+        self.start = self.maze.find(ord("S"))
+        trace("Start found at %s", self.start)
+
+    def start_neighbours(self) -> List[int]:
+        # Cells with a pipe connected to the start one
+        s_y, s_x = self.start
+        out = []
+        for c_y, c_x in self.maze.neighbours(s_y, s_x):
+            if (s_y - c_y, s_x - c_x) in CONNECTIONS.get(self.maze.at(c_y, c_x), ()):
+                out.append(self.maze.index(c_y, c_x))
+        return out
+
+    def walk_loop(self) -> Search:
+        # Walk the loop in both directions at once from start (i.e. breadth-first search through pipes connections)
+        start = self.maze.index(*self.start)
+        start_neighbours = self.start_neighbours()
+        trace("Path starts: %s", [self.maze.position(i) for i in start_neighbours])
+        assert len(start_neighbours) == 2
+        cells = self.maze.cells
+        deltas = {pipe: tuple(d_y * self.size_x + d_x for d_y, d_x in c) for pipe, c in CONNECTIONS.items()}
+
+        def neighbours(index: int) -> List[int]:
+            return start_neighbours if index == start else [index + d for d in deltas[cells[index]]]
+
+        search = Search(len(cells))
+        search.bfs((start,), neighbours)
+        self.count("expansions", search.expansions)
+        return search
 
     def solve(self) -> int:
-        # Find paths from start
-        s_y, s_x = self.start
-        paths_current = []
-        directions = []
-        for d in Direction:
-            c_y, c_x = (s_y + NEXT[d][0], s_x + NEXT[d][1])
-            if not ((0 <= c_y <= self.size_y) and (0 <= c_x <= self.size_x)):
-                continue
-            c_step = self.maze[c_y][c_x]
-            if c_step in OUTPUTS and d in OUTPUTS[c_step]:
-                paths_current.append((c_y, c_x))
-                s = set()
-                s.add((c_y, c_x))
-                self.paths_nodes.append(s)
-                directions.append(d)
-
-        logging.info(f"Path starts: {paths_current}")
-        assert len(paths_current) == 2
-        steps = 1
-        go_on = True
-        while go_on:
-            for i in range(len(paths_current)):
-                # Move next
-                s_y, s_x = paths_current[i]
-                s_step = self.maze[s_y][s_x]
-                d = OUTPUTS[s_step][directions[i]]
-                c_y, c_x = (s_y + NEXT[d][0], s_x + NEXT[d][1])
-                self.paths_nodes[i].add((c_y, c_x))
-                paths_current[i] = (c_y, c_x)
-                directions[i] = d
-
-                # Continue only if not already in the other path
-                go_on = (c_y, c_x) not in self.paths_nodes[(i + 1) % 2]
-            steps += 1
-        return steps
+        # Farthest point from start
+        return len(self.walk_loop().levels) - 1
 
 
 class D10Step1Puzzle(D10Puzzle):
@@ -89,18 +71,18 @@ class D10Step1Puzzle(D10Puzzle):
 class D10Step2Puzzle(D10Puzzle):
     def solve(self) -> int:
         # Find all maze nodes
-        super().solve()
-        all_nodes = self.paths_nodes[0].union(self.paths_nodes[1])
-        all_nodes.add((self.start))
+        distances = self.walk_loop().distances
 
         # Iterate on all nodes
         all_inside = 0
+        cells = self.maze.cells
         for y in range(self.size_y):
             in_loop = 0
             for x in range(self.size_x):
-                if (y, x) in all_nodes:
+                index = y * self.size_x + x
+                if distances[index] != UNREACHED:
                     # Vertical pipe?
-                    if self.maze[y][x] in "|JL":
+                    if cells[index] in VERTICAL:
                         in_loop = (in_loop + 1) % 2
                 else:
                     # Count cell if in the loop
@@ -1,46 +1,34 @@
-import logging
-import re
 from itertools import combinations
 from pathlib import Path
 
-from aoc2023.puzzle import AOCPuzzle
+from aoc2023.grid import GridPuzzle
+from aoc2023.tracing import trace
 
 """
 Solutions for https://adventofcode.com/2023/day/11
 """
 
 
-class D11Puzzle(AOCPuzzle):
+# Galaxy cell
+GALAXY = ord("#")
+
+
+class D11Puzzle(GridPuzzle):
     def __init__(self, input_file: Path):
-        self.galaxies = []
-        self.empty_rows = []
-        self.empty_cols = []
-        self.universe = []
         super().__init__(input_file)
-        self.size_cols = len(self.universe[0])
-        self.size_rows = len(self.universe)
-
-        # Find also empty columns
-        for x in range(self.size_cols):
-            if not any(self.universe[y][x] == "#" for y in range(self.size_rows)):
-                self.empty_cols.append(x)
-
-        logging.info(f"Empty rows: {self.empty_rows}")
-        logging.info(f"Empty columns: {self.empty_cols}")
-        logging.info(f"Galaxies: {len(self.galaxies)}")
-
-    def parse_line(self, index: int, line: str) -> str:
-        line = super().parse_line(index, line)
-        self.universe.append(line)
-        galaxy_found = False
-        for m in re.finditer("#", line):
-            # One more galaxy
-            self.galaxies.append((index - 1, m.start()))
-            galaxy_found = True
-
-        if not galaxy_found:
-            # No galaxy on the row: empty line
-            self.empty_rows.append(index - 1)
+        self.universe = self.grid
+        self.size_cols = self.universe.width
+        self.size_rows = self.universe.height
+
+        # Find galaxies, and rows/columns without any galaxy
+        is_galaxy = self.universe.array == GALAXY
+        self.galaxies = self.universe.find_all(GALAXY)
+        self.empty_rows = [int(y) for y in (~is_galaxy.any(axis=1)).nonzero()[0]]
+        self.empty_cols = [int(x) for x in (~is_galaxy.any(axis=0)).nonzero()[0]]
+
+        trace("Empty rows: %s", self.empty_rows)
+        trace("Empty columns: %s", self.empty_cols)
+        trace("Galaxies: %s", len(self.galaxies))
 
     def solve(self, age_factor: int) -> int:
         # Iterate on pairs
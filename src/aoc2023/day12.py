@@ -1,10 +1,10 @@
-import logging
 import re
-from functools import cache
 from pathlib import Path
 from typing import Tuple
 
+from aoc2023.memo import memoize
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.tracing import trace
 
 """
 Solutions for https://adventofcode.com/2023/day/12
@@ -14,39 +14,41 @@ Solutions for https://adventofcode.com/2023/day/12
 LINE_PATTERN = re.compile("([.#?]+) +([0-9,]+)")
 
 
-# Count possible solutions (with cache to improve performances on repeated patterns)
-@cache
-def count_solutions(search_space: str, sizes: Tuple[int], done: int = 0) -> int:
-    # Nothing more in string?
-    if len(search_space) == 0:
-        # Solution found if no more sizes to resolve
-        return 1 if ((len(sizes) == 0) and (done == 0)) else 0
+# Count possible solutions, from a position in search space and a group index: either an operational spring here, or the whole group
+# of damaged springs starting here (memoized to improve performances on repeated sub-problems; they are rarely shared between lines,
+# so that a bounded cache is enough)
+@memoize(max_entries=100_000)
+def count_solutions(search_space: str, sizes: Tuple[int, ...], index: int = 0, group: int = 0) -> int:
+    # All groups are resolved?
+    if group == len(sizes):
+        # Solution found if no more damaged springs
+        return 0 if "#" in search_space[index:] else 1
+
+    # Not enough room left for next group?
+    end = index + sizes[group]
+    if end > len(search_space):
+        return 0
 
     # Number of solutions
     nb = 0
 
-    # Possible branches
-    branches = [".", "#"] if (search_space[0] == "?") else search_space[0]
-    for c in branches:
-        # New damaged spring?
-        if c == "#":
-            # Yes: recursive call on next step
-            nb += count_solutions(search_space[1:], sizes, done + 1)
-        else:
-            # No: running group?
-            if done:
-                # Yes: group is resolved?
-                if (len(sizes) > 0) and (sizes[0] == done):
-                    # Go to next group
-                    nb += count_solutions(search_space[1:], sizes[1:])
-            else:
-                # Was not is a running group, simply go forward
-                nb += count_solutions(search_space[1:], sizes)
+    # Operational spring: simply go forward
+    if search_space[index] != "#":
+        nb += count_solutions(search_space, sizes, index + 1, group)
+
+    # Damaged group: must not contain operational springs, and must be followed by an operational one (or by the end)
+    if "." not in search_space[index:end] and (end == len(search_space) or search_space[end] != "#"):
+        nb += count_solutions(search_space, sizes, end + 1, group + 1)
 
     return nb
 
 
 class D12Puzzle(AOCPuzzle):
+    STREAMING = True
+    KEEP_INPUT_LINES = False
+    CHUNKED_PARSING = ("lines",)
+    MEMOS = (count_solutions,)
+
     def __init__(self, input_file: Path):
         self.lines = []
         super().__init__(input_file)
@@ -56,7 +58,7 @@ class D12Puzzle(AOCPuzzle):
         if m:  # pragma: no branch
             search_space = m.group(1)
             sizes = tuple(int(g) for g in m.group(2).split(","))
-            logging.info(f"New line: {search_space} {sizes}")
+            trace("New line: %s %s", search_space, sizes)
             self.lines.append((search_space, sizes))
 
 
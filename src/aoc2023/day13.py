@@ -1,9 +1,10 @@
-import logging
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List
 
+from aoc2023.grid import Grid
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.tracing import trace
 
 """
 Solutions for https://adventofcode.com/2023/day/13
@@ -13,11 +14,11 @@ Solutions for https://adventofcode.com/2023/day/13
 @dataclass
 class Pattern:
     coef: int
-    patterns: List[str]
+    patterns: List[bytes]
     mirrors: List[int]
 
 
-def find_smudge(a: str, b: str) -> int:
+def find_smudge(a: bytes, b: bytes) -> int:
     diff = None
     for index, (c_a, c_b) in enumerate(zip(a, b)):
         if c_a != c_b:
@@ -29,13 +30,16 @@ def find_smudge(a: str, b: str) -> int:
 
 
 class D13Puzzle(AOCPuzzle):
+    STREAMING = True
+    KEEP_INPUT_LINES = False
+
     def __init__(self, input_file: Path):
-        self.candidate = None
+        self.candidate: List[str] = None
         self.patterns = []
         super().__init__(input_file)
         self.end_pattern()
 
-    def add_pattern(self, line: str, candidate: Pattern):
+    def add_pattern(self, line: bytes, candidate: Pattern):
         candidate.patterns.append(line)
         if len(candidate.patterns) > 1 and candidate.patterns[-1] == candidate.patterns[-2]:
             candidate.mirrors.append(len(candidate.patterns) - 1)
@@ -44,15 +48,17 @@ class D13Puzzle(AOCPuzzle):
         if self.candidate is None:  # pragma: no cover
             return
 
-        # Build another pattern with reversed lines
-        reversed_pattern = Pattern(1, [], [])
-        for x in range(len(self.candidate.patterns[0])):
-            line = "".join(row[x] for row in self.candidate.patterns)
+        # Build pattern from grid rows, and another one with reversed lines (i.e. grid columns)
+        grid = Grid.from_lines(self.candidate)
+        pattern, reversed_pattern = Pattern(100, [], []), Pattern(1, [], [])
+        for line in grid.rows():
+            self.add_pattern(line, pattern)
+        for line in grid.transposed().rows():
             self.add_pattern(line, reversed_pattern)
 
         # Add pair of patterns
-        self.patterns.append((self.candidate, reversed_pattern))
-        logging.info(f"new pattern: {self.patterns[-1]}")
+        self.patterns.append((pattern, reversed_pattern))
+        trace("new pattern: %s", self.patterns[-1])
 
         # No more candidate
         self.candidate = None
@@ -61,8 +67,8 @@ class D13Puzzle(AOCPuzzle):
         line = super().parse_line(index, line)
         if line:
             if self.candidate is None:
-                self.candidate = Pattern(100, [], [])
-            self.add_pattern(line, self.candidate)
+                self.candidate = []
+            self.candidate.append(line)
         else:
             self.end_pattern()
 
@@ -83,7 +89,7 @@ class D13Puzzle(AOCPuzzle):
                     break
 
         if mirror_found:
-            logging.info(f"mirror found: {mirror} * {pattern.coef}")
+            trace("mirror found: %s * %s", mirror, pattern.coef)
             return pattern.coef * mirror
         return 0
 
@@ -119,8 +125,14 @@ class D13Step2Puzzle(D13Puzzle):
                         smudge_candidate = find_smudge(line, pattern.patterns[index + offset])
                         if smudge_candidate is not None:
                             mirror = index + (offset // 2) + 1
-                            logging.info(
-                                f"pattern {pattern_id}, pair {pair_id}: smudge candidate: {index}<-->{index+offset} (mirror {mirror}), character {smudge_candidate}"
+                            trace(
+                                "pattern %s, pair %s: smudge candidate: %s<-->%s (mirror %s), character %s",
+                                pattern_id,
+                                pair_id,
+                                index,
+                                index + offset,
+                                mirror,
+                                smudge_candidate,
                             )
 
                             # Test with this smudge candidate
@@ -1,18 +1,18 @@
-import logging
 import re
-from functools import cache
 from pathlib import Path
 from typing import Dict
 
+from aoc2023.memo import memoize
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.tracing import Lazy, trace
 
 """
 Solutions for https://adventofcode.com/2023/day/15
 """
 
 
-# Hash algorithm
-@cache
+# Hash algorithm (memoized, as labels are repeated in instructions)
+@memoize(max_entries=10_000)
 def get_hash(input_str: str) -> int:
     out = 0
     for c in input_str:
@@ -27,6 +27,10 @@ INSTRUCTION = re.compile("([a-z]+)([-=])([0-9]+)?")
 
 
 class D15Puzzle(AOCPuzzle):
+    STREAMING = True
+    KEEP_INPUT_LINES = False
+    MEMOS = (get_hash,)
+
     def __init__(self, input_file: Path):
         self.patterns = []
         super().__init__(input_file)
@@ -62,7 +66,7 @@ class D15Step2Puzzle(D15Puzzle):
             else:
                 # Add
                 box[name] = int(m.group(3))
-        logging.info("boxes:\n" + "\n".join(f"{k}: {v}" for k, v in boxes.items()))
+        trace("boxes:\n%s", Lazy(lambda: "\n".join(f"{k}: {v}" for k, v in boxes.items())))
 
         # Reckon focusing power
         power = 0
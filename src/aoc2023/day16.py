@@ -1,88 +1,121 @@
 from pathlib import Path
-from typing import Dict, Set, Tuple
+from typing import List, Sequence, Tuple
 
-from aoc2023.puzzle import OFFSETS, AOCPuzzle, Direction
+from aoc2023.grid import GridPuzzle
+from aoc2023.puzzle import DIR_E, DIR_LEFT, DIR_N, DIR_RIGHT, DIR_S, DIR_W, DIRS, flat_offsets
+from aoc2023.shared import SharedArrays, SharedArraysHandle
 
 """
 Solutions for https://adventofcode.com/2023/day/16
 """
 
 
-# Turn instructions
-TURN_TO = {
-    "/": {
-        Direction.N: Direction.E,
-        Direction.E: Direction.N,
-        Direction.S: Direction.W,
-        Direction.W: Direction.S,
-    },
-    "\\": {
-        Direction.N: Direction.W,
-        Direction.E: Direction.S,
-        Direction.S: Direction.E,
-        Direction.W: Direction.N,
-    },
-}
+# Tiles
+OUTSIDE = ord(" ")
 
 
-# Split instructions
-SPLIT_TO = {"-": (Direction.E, Direction.W), "|": (Direction.N, Direction.S)}
+# Next beam directions for each tile and incoming direction, as a flat table indexed by tile * 4 + direction
+def beam_transitions() -> List[Tuple[int, ...]]:
+    # Default: go forward
+    out = [(d,) for _ in range(256) for d in DIRS]
+    for d in DIRS:
+        vertical = d in (DIR_N, DIR_S)
+        # Mirrors: turn
+        out[ord("/") * 4 + d] = (DIR_RIGHT[d] if vertical else DIR_LEFT[d],)
+        out[ord("\\") * 4 + d] = (DIR_LEFT[d] if vertical else DIR_RIGHT[d],)
+        # Splitters: split if not going along them
+        if vertical:
+            out[ord("-") * 4 + d] = (DIR_E, DIR_W)
+        else:
+            out[ord("|") * 4 + d] = (DIR_N, DIR_S)
+    return out
 
 
-class D16Puzzle(AOCPuzzle):
+TRANSITIONS = beam_transitions()
+
+
+# Energized tiles count for a beam entering the (padded) contraption on a flat index, in a direction
+def energized_count(contraption: Sequence[int], offsets: Tuple[int, ...], index: int, direction: int) -> int:
+    visited = bytearray(len(contraption) * 4)
+    energized = bytearray(len(contraption))
+    count = 0
+
+    # Pending beams (split ones are followed later)
+    beams = [(index, direction)]
+    while beams:
+        index, direction = beams.pop()
+
+        # Follow beam until getting out of the box, or on an already visited tile in the same direction
+        tile = contraption[index]
+        while tile != OUTSIDE and not visited[index * 4 + direction]:
+            # Position is now energized
+            visited[index * 4 + direction] = 1
+            if not energized[index]:
+                energized[index] = 1
+                count += 1
+
+            # Next direction(s), and move
+            next_directions = TRANSITIONS[tile * 4 + direction]
+            if len(next_directions) > 1:
+                beams.append((index + offsets[next_directions[1]], next_directions[1]))
+            direction = next_directions[0]
+            index += offsets[direction]
+            tile = contraption[index]
+    return count
+
+
+# Worker process task: best energized tiles count for a batch of beams, on a contraption shared by the solving process
+def max_energized(handle: SharedArraysHandle, offsets: Tuple[int, ...], beams: List[Tuple[int, int]]) -> int:
+    with handle.attach() as arrays, arrays["contraption"].data as contraption:
+        return max(energized_count(contraption, offsets, index, direction) for index, direction in beams)
+
+
+class D16Puzzle(GridPuzzle):
     def __init__(self, input_file: Path):
-        self.contraption = ""
-        self.size_x = None
-        self.size_y = 0
         super().__init__(input_file)
+        self.size_x = self.grid.width
+        self.size_y = self.grid.height
 
-    def parse_line(self, index: int, line: str) -> str:
-        line = super().parse_line(index, line)
-        self.contraption += line
-        self.size_y += 1
-        if self.size_x is None:
-            self.size_x = len(line)
+        # Contraption surrounded by outside tiles, so that beams stop on them
+        padded = self.grid.padded(OUTSIDE)
+        self.contraption = padded.cells
+        self.width = padded.width
+        self.offsets = flat_offsets(self.width)
+
+    # Flat index of a contraption position
+    def index(self, pos: Tuple[int, int]) -> int:
+        return (pos[1] + 1) * self.width + pos[0] + 1
 
     # Energized tiles count reckon function
-    def follow(self, pos: Tuple[int, int], direction: Direction, visited: Dict[Tuple[int, int], Set[Direction]]) -> int:
-        # Follow position until getting out of the box
-        while (0 <= pos[0] < self.size_x) and (0 <= pos[1] < self.size_y) and (direction not in visited.get(pos, set())):
-            # Position is now energized
-            directions = visited.setdefault(pos, set())
-            directions.add(direction)
-
-            # Check tile on position
-            tile = self.contraption[pos[1] * self.size_x + pos[0]]
-            if (tile == ".") or (tile in SPLIT_TO and direction in SPLIT_TO[tile]):
-                # Ok, go forward
-                pass
-            elif tile in ["/", "\\"]:
-                # Turn, and go forward
-                direction = TURN_TO[tile][direction]
-            else:
-                # Split
-                self.follow(pos, SPLIT_TO[tile][0], visited)
-                direction = SPLIT_TO[tile][1]
-
-            # Move
-            m = OFFSETS[direction]
-            pos = (pos[0] + m[0], pos[1] + m[1])
-        return len(visited)
+    def follow(self, pos: Tuple[int, int], direction: int) -> int:
+        return energized_count(self.contraption, self.offsets, self.index(pos), direction)
 
 
 class D16Step1Puzzle(D16Puzzle):
     def solve(self) -> int:
-        return self.follow((0, 0), Direction.E, {})
+        return self.follow((0, 0), DIR_E)
 
 
 class D16Step2Puzzle(D16Puzzle):
     def solve(self) -> int:
-        # Maximize energized tiles for all starting positions
-        energized = []
+        # All starting beams
+        beams = []
         for x in range(self.size_x):
-            for y, direction in zip((0, self.size_y - 1), (Direction.S, Direction.N)):
-                energized.append(self.follow((x, y), direction, {}))
+            for y, direction in zip((0, self.size_y - 1), (DIR_S, DIR_N)):
+                beams.append((self.index((x, y)), direction))
         for y in range(self.size_y):
-            for x, direction in zip((0, self.size_x - 1), (Direction.E, Direction.W)):
-                energized.append(self.follow((x, y), direction, {}))
-        return max(energized)
+            for x, direction in zip((0, self.size_x - 1), (DIR_E, DIR_W)):
+                beams.append((self.index((x, y)), direction))
+
+        workers = min(self.SOLVE_WORKERS, len(beams))
+        if workers < 2:
+            # Maximize energized tiles for all starting beams
+            return max(energized_count(self.contraption, self.offsets, index, direction) for index, direction in beams)
+
+        # Lazy import (only needed for parallel solving)
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Fan beams out to worker processes, sharing the contraption instead of sending it with each batch
+        with SharedArrays({"contraption": self.contraption}) as shared, ProcessPoolExecutor(max_workers=workers) as executor:
+            batches = [beams[i::workers] for i in range(workers)]
+            return max(executor.map(max_energized, [shared.handle] * workers, [self.offsets] * workers, batches))
@@ -1,9 +1,9 @@
-import logging
 import re
 from pathlib import Path
 from typing import List, Tuple
 
 from aoc2023.puzzle import OFFSETS, AOCPuzzle, Direction
+from aoc2023.tracing import Lazy, trace
 
 """
 Solutions for https://adventofcode.com/2023/day/18
@@ -27,10 +27,13 @@ def shoelace(points: List[Tuple[int, int]]):
 
 
 class D18Puzzle(AOCPuzzle):
+    STREAMING = True
+    KEEP_INPUT_LINES = False
+
     def __init__(self, input_file: Path):
         self.instructions: List[Tuple[Direction, int]] = []
         super().__init__(input_file)
-        logging.info(f"Parsed instructions: {self.instructions}")
+        trace("Parsed instructions: %s", self.instructions)
 
     def parse_line(self, index: int, line: str) -> str:
         m = INSTRUCTIONS.match(super().parse_line(index, line))
@@ -49,7 +52,7 @@ class D18Puzzle(AOCPuzzle):
             col += col_offset * distance
             row += row_offset * distance
             points.append((col, row))
-        logging.info(f"All points: {points}; shoelace: {shoelace(points)}")
+        trace("All points: %s; shoelace: %s", points, Lazy(lambda: shoelace(points)))
 
         # See https://en.wikipedia.org/wiki/Pick%27s_theorem
         return int(-shoelace(points) + sum(distance for _, distance in self.instructions) / 2 + 1)
@@ -1,11 +1,14 @@
-import logging
 import re
-from dataclasses import dataclass
-from math import prod
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
+from aoc2023.intervals import SplitGraph, boxes_of, volumes
+from aoc2023.models import slotted
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.tracing import trace
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
 
 """
 Solutions for https://adventofcode.com/2023/day/19
@@ -17,11 +20,17 @@ WORKFLOW_PATTERN = re.compile(r"([a-z]+)\{(.+)\}")
 # Instruction inside workflow
 INSTRUCTION_PATTERN = re.compile(r",?(([xmas])([<>])([0-9]+):)?([a-zAR]+)")
 
+# Parts properties
+PROPERTIES = "xmas"
+
+# Final outcomes (as split graph nodes)
+OUTCOMES = {"A": -1, "R": -2}
+
 # Part definition
 PART_PATTERN = re.compile(r"\{x=([0-9]+),m=([0-9]+),a=([0-9]+),s=([0-9]+)\}")
 
 
-@dataclass
+@slotted
 class Instruction:
     prop_name: str
     operator: str
@@ -29,7 +38,7 @@ class Instruction:
     target_group: str
 
 
-@dataclass
+@slotted
 class Workflow:
     src_group: str
     instructions: List[Instruction]
@@ -37,11 +46,17 @@ class Workflow:
 
 
 class D19Puzzle(AOCPuzzle):
+    STREAMING = True
+    KEEP_INPUT_LINES = False
+
     def __init__(self, input_file: Path):
         self.workflows: Dict[str, Workflow] = {}
-        self.parts: List[Dict[str, Tuple[int, int]]] = []
+        self.parts: List[Tuple[int, int, int, int]] = []
         super().__init__(input_file)
 
+        # Workflows, compiled as a split graph
+        self.graph, self.start = self.split_graph()
+
     def parse_line(self, index: int, line: str) -> str:
         # Super call to get line
         line = super().parse_line(index, line)
@@ -51,7 +66,7 @@ class D19Puzzle(AOCPuzzle):
         if m is not None:
             src_group = m.group(1)
             instructions = []
-            for n in re.finditer(INSTRUCTION_PATTERN, m.group(2)):
+            for n in INSTRUCTION_PATTERN.finditer(m.group(2)):
                 if n.group(1) is not None:
                     prop_name = n.group(2)
                     operator = n.group(3)
@@ -62,66 +77,65 @@ class D19Puzzle(AOCPuzzle):
                 else:
                     default_group = n.group(5)
             self.workflows[src_group] = Workflow(src_group, instructions, default_group)
-            logging.info(f"Parsed workflow: {self.workflows[src_group]}")
+            trace("Parsed workflow: %s", self.workflows[src_group])
         else:
             # Try to parse part
             m = PART_PATTERN.match(line)
             if m is not None:
-                self.parts.append(
-                    {
-                        "x": (int(m.group(1)), int(m.group(1))),
-                        "m": (int(m.group(2)), int(m.group(2))),
-                        "a": (int(m.group(3)), int(m.group(3))),
-                        "s": (int(m.group(4)), int(m.group(4))),
-                    }
-                )
-                logging.info(f"Parsed part: {self.parts[-1]}")
-
-    def accepted(self, input_parts: List[Dict[str, Tuple[int, int]]]) -> List[Dict[str, Tuple[int, int]]]:
-        # Iterate on parts
-        pending_parts = list(input_parts)
-        accepted_parts: List[Dict[str, Tuple[int, int]]] = []
-        while pending_parts:
-            # Process workflows
-            part = pending_parts.pop(0)
-            current_workflow = "in"
-            while current_workflow not in ["A", "R"]:
-                # Iterate on instructions
-                w = self.workflows[current_workflow]
-                for instruction in w.instructions:
-                    min_v, max_v = part[instruction.prop_name]
-                    if ((instruction.operator == ">") and (min_v > instruction.value)) or ((instruction.operator == "<") and (max_v < instruction.value)):
-                        # Condition match, continue with next workflow
-                        current_workflow = instruction.target_group
-                        break
-
-                    if min_v < instruction.value < max_v:
-                        # New part with excluded range: recursive process on accepted parts for this one
-                        new_part = dict(part)
-                        new_part[instruction.prop_name] = (instruction.value, max_v) if (instruction.operator == "<") else (min_v, instruction.value)
-                        accepted_parts.extend(self.accepted([new_part]))
-
-                        # Keep part which satisfies the condition
-                        part[instruction.prop_name] = (min_v, instruction.value - 1) if (instruction.operator == "<") else (instruction.value + 1, max_v)
-                        current_workflow = instruction.target_group
-                        break
+                self.parts.append(tuple(int(v) for v in m.groups()))
+                trace("Parsed part: %s", self.parts[-1])
+
+    def split_graph(self) -> Tuple[SplitGraph, int]:
+        # One split node per instruction, numbered in workflows order
+        first_nodes: Dict[str, int] = {}
+        node = 0
+        for w in self.workflows.values():
+            first_nodes[w.src_group] = node
+            node += len(w.instructions)
+
+        def entry(group: str) -> int:
+            # Entry node of a group (i.e. first instruction of its workflow), or final outcome
+            if group in OUTCOMES:
+                return OUTCOMES[group]
+            w = self.workflows[group]
+            return first_nodes[group] if w.instructions else entry(w.default_group)
+
+        # Each node sends matching part to the target group, and other part to the next instruction (or to the default group after the last one)
+        nodes = []
+        for w in self.workflows.values():
+            for i, instruction in enumerate(w.instructions):
+                target = entry(instruction.target_group)
+                next_node = first_nodes[w.src_group] + i + 1 if i + 1 < len(w.instructions) else entry(w.default_group)
+                dim = PROPERTIES.index(instruction.prop_name)
+                if instruction.operator == "<":
+                    nodes.append((dim, instruction.value, target, next_node))
                 else:
-                    # None of the conditions are satisfied, go to default
-                    current_workflow = w.default_group
-
-            if current_workflow == "A":
-                accepted_parts.append(part)
+                    nodes.append((dim, instruction.value + 1, next_node, target))
+        return SplitGraph(nodes), entry("in")
 
-        return accepted_parts
+    def accepted(self, boxes: "np.ndarray") -> "np.ndarray":
+        # Route all parts boxes through workflows at once
+        accepted = self.graph.route(boxes, self.start).get(OUTCOMES["A"], boxes[:0])
+        self.count("accepted_boxes", len(accepted))
+        return accepted
 
 
 class D19Step1Puzzle(D19Puzzle):
     def solve(self) -> int:
-        # Sum all accepted parts properties
-        return sum(sum(t[0] for t in p.values()) for p in self.accepted(self.parts))
+        # Lazy import (heavy dependency)
+        import numpy as np
+
+        # Parts are boxes with a single value for each property; sum all accepted parts properties
+        points = np.array(self.parts, dtype=np.int64).reshape(-1, len(PROPERTIES))
+        accepted = self.accepted(boxes_of(points, points))
+        return int(accepted[:, :, 0].sum())
 
 
 class D19Step2Puzzle(D19Puzzle):
     def solve(self) -> int:
-        accepted = self.accepted([{"x": (1, 4000), "m": (1, 4000), "a": (1, 4000), "s": (1, 4000)}])
-        return sum(prod((t[1] - t[0] + 1) for t in a.values()) for a in accepted)
+        # Lazy import (heavy dependency)
+        import numpy as np
+
+        # All possible parts at once
+        accepted = self.accepted(boxes_of(np.full((1, len(PROPERTIES)), 1), np.full((1, len(PROPERTIES)), 4000)))
+        return int(volumes(accepted).sum())
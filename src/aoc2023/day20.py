@@ -1,11 +1,13 @@
-import logging
 import re
 from dataclasses import dataclass, field
 from math import lcm
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
 
+from aoc2023.cycles import CycleDetector
+from aoc2023.models import slotted
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.tracing import trace
 
 """
 Solutions for https://adventofcode.com/2023/day/20
@@ -31,7 +33,7 @@ class PulseStack:
 
 
 # Base module model
-@dataclass
+@slotted
 class Module:
     name: str
     outputs_names: List[str]
@@ -49,9 +51,9 @@ class Module:
         for m in self.outputs:
             pulse_stack.add_to_stack(m, self.name, pulse)
 
-    def get_state(self) -> str:
+    def get_state(self) -> Iterable[bool]:
         # Default: no state
-        return ""
+        return ()
 
     def reset(self):
         # Reset state: nothing to do by default
@@ -60,13 +62,15 @@ class Module:
 
 # Broadcaster module
 class BroadcasterModule(Module):
+    __slots__ = ()
+
     def handle_pulse(self, source: str, pulse: bool, pulse_stack: PulseStack):
         # Distribute to all outputs
         self.propagate(pulse, pulse_stack)
 
 
 # Flip-flop module
-@dataclass
+@slotted
 class FlipFlopModule(Module):
     state: bool = False
 
@@ -81,16 +85,16 @@ class FlipFlopModule(Module):
             # Propagate
             self.propagate(self.state, pulse_stack)
 
-    def get_state(self) -> str:
+    def get_state(self) -> Iterable[bool]:
         # Internal state
-        return str(self.state)
+        return (self.state,)
 
     def reset(self):
         self.state = False
 
 
 # Conjunction module
-@dataclass
+@slotted
 class ConjunctionModule(Module):
     input_states: Dict[str, bool] = field(default_factory=dict)
 
@@ -106,9 +110,9 @@ class ConjunctionModule(Module):
         super().add_input(module)
         self.input_states[module.name] = False
 
-    def get_state(self) -> str:
+    def get_state(self) -> Iterable[bool]:
         # Internal state
-        return str(self.input_states)
+        return self.input_states.values()
 
     def reset(self):
         for k in self.input_states.keys():
@@ -117,12 +121,17 @@ class ConjunctionModule(Module):
 
 # Fake button module
 class ButtonModule(Module):
+    __slots__ = ()
+
     def handle_pulse(self, source: str, pulse: bool, pulse_stack: PulseStack):
         # Distribute False to all outputs
         self.propagate(False, pulse_stack)
 
 
 class D20Puzzle(AOCPuzzle):
+    STREAMING = True
+    KEEP_INPUT_LINES = False
+
     def __init__(self, input_file: Path):
         self.modules: Dict[str, Module] = {}
         super().__init__(input_file)
@@ -137,7 +146,7 @@ class D20Puzzle(AOCPuzzle):
                 # Handle unknown modules as basic modules
                 if output not in self.modules:
                     new_m = self.create_module("", output, [])
-                    logging.info(f"New missing module (from outputs): {new_m}")
+                    trace("New missing module (from outputs): %s", new_m)
                     missing_modules[output] = new_m
         self.modules.update(missing_modules)
 
@@ -164,53 +173,42 @@ class D20Puzzle(AOCPuzzle):
         assert m is not None
         mod_type, name, output_names = m.group(1), m.group(2), m.group(3).split(", ")
         m = self.create_module(mod_type, name, output_names)
-        logging.info(f"New module: {m}")
+        trace("New module: %s", m)
         self.modules[name] = m
 
-    def get_all_states(self) -> str:
-        state_str = ""
+    def get_all_states(self) -> int:
+        # Compact state: all modules state bits, packed in an int
+        state = 0
         for m in self.modules.values():
-            state_str += f"{m.name}:{m.get_state()};"
-        return state_str
+            for bit in m.get_state():
+                state = (state << 1) | bit
+        return state
 
 
 class D20Step1Puzzle(D20Puzzle):
-    def solve(self) -> int:
+    def push(self, state: int) -> int:
+        # Push button once (from current modules state), and remember pulses counts for this push
         pulse_stack = PulseStack()
-        push_max_count = 1000
-        modules_states = {}
-
-        # Push button until getting a repeating state pattern
-        m_state = self.get_all_states()
-        pos = 0
-        while self.get_all_states() not in modules_states and (pos < push_max_count):
-            modules_states[m_state] = pos
-            pos += 1
-
-            logging.info(f"--> Push button! ({pos})")
-            self.modules["button"].handle_pulse(None, False, pulse_stack)
-            while pulse_stack.stack:
-                target, source, pulse = pulse_stack.stack.pop(0)
-                target.handle_pulse(source, pulse, pulse_stack)
-
-            m_state = self.get_all_states()
+        self.modules["button"].handle_pulse(None, False, pulse_stack)
+        while pulse_stack.stack:
+            target, source, pulse = pulse_stack.stack.pop(0)
+            target.handle_pulse(source, pulse, pulse_stack)
+        self.low_pulses.append(pulse_stack.low_count)
+        self.high_pulses.append(pulse_stack.high_count)
+        return self.get_all_states()
 
-        total_pulse = pulse_stack.high_count * pulse_stack.low_count
-        logging.info(f"repeating state found after {pos} button push; pulse count for one pattern: {total_pulse}")
-        if pos < push_max_count:
-            assert modules_states[m_state] == 0
-
-        # How many patterns over 1000?
-        pattern_size = len(modules_states)
-        patterns_count = ((push_max_count - pattern_size) // pattern_size) + 1
-        logging.info(f"total: {patterns_count} repeating patterns (including first one)")
-        total_pulse *= patterns_count * patterns_count
+    def solve(self) -> int:
+        push_max_count = 1000
+        self.low_pulses, self.high_pulses = [], []
 
-        # Remaining pulse push
-        remaining_pushes = push_max_count - (patterns_count * pattern_size)
-        logging.info(f"still {remaining_pushes} button push to do")
+        # Push button until getting a repeating state pattern (or until max pushes count)
+        detector = CycleDetector(self.get_all_states(), self.push)
+        low_count, high_count = detector.sum_until(self.low_pulses, push_max_count), detector.sum_until(self.high_pulses, push_max_count)
+        trace("repeating state: %s (begin=%s pattern=%s)", detector.found, detector.start, detector.length)
 
-        return total_pulse
+        self.count("button_pushes", len(self.low_pulses))
+        self.count("pulses", sum(self.low_pulses) + sum(self.high_pulses))
+        return low_count * high_count
 
 
 class D20Step2Puzzle(D20Puzzle):
@@ -247,6 +245,8 @@ class D20Step2Puzzle(D20Puzzle):
                         go_on = False
                         break
             inputs_pushes.append(pushes)
+            self.count("button_pushes", pushes)
+            self.count("pulses", pulse_stack.high_count + pulse_stack.low_count)
 
         # Then return lcm of them
         return lcm(*inputs_pushes)
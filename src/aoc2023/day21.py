@@ -1,66 +1,48 @@
-import logging
-from collections import defaultdict
 from pathlib import Path
+from typing import List
 
-from aoc2023.puzzle import OFFSETS, AOCPuzzle, Direction
+from aoc2023.grid import GridPuzzle
+from aoc2023.puzzle import flat_offsets
+from aoc2023.search import Search
+from aoc2023.tracing import trace
 
 """
 Solutions for https://adventofcode.com/2023/day/21
 """
 
 
-class D21Puzzle(AOCPuzzle):
+# Rock cell
+ROCK = ord("#")
+
+
+class D21Puzzle(GridPuzzle):
     def __init__(self, input_file: Path):
-        self.grid = []
-        self.width = None
-        self.height = 0
-        self.start = None
         super().__init__(input_file)
+        self.width = self.grid.width
+        self.height = self.grid.height
+        self.start = self.grid.find(ord("S"))
+        trace("Start found at row=%s, col=%s", self.start[0], self.start[1])
+
+    def possible_spots(self, steps: List[int]) -> List[int]:
+        # Infinite garden: tile the grid enough times around the start, so that borders are never reached within max steps
+        max_steps = max(steps)
+        tiles = 2 * (max_steps // min(self.width, self.height) + 1) + 1
+        width = self.width * tiles
+        cells = b"".join(row * tiles for row in self.grid.rows()) * tiles
+        start_row, start_col = self.start[0] + (tiles // 2) * self.height, self.start[1] + (tiles // 2) * self.width
+
+        north, east, south, west = flat_offsets(width)
+
+        def neighbours(index: int) -> List[int]:
+            return [n for n in (index + north, index + east, index + south, index + west) if cells[n] != ROCK]
+
+        # Use the Breadth first search to find the number of points reached at each step, up to the max steps
+        search = Search(len(cells))
+        search.bfs((start_row * width + start_col,), neighbours, max_steps)
+        self.count("expansions", search.expansions)
 
-    def parse_line(self, index: int, line: str) -> str:
-        line = super().parse_line(index, line)
-        self.grid.append(line)
-        if self.width is None:
-            self.width = len(line)
-        self.height += 1
-
-        if self.start is None:
-            pos = line.find("S")
-            if pos >= 0:
-                self.start = (index - 1, pos)
-                logging.info(f"Start found at row={self.start[0]}, col={self.start[1]}")
-
-    def possible_points(self, point):
-        # Loop over all possible directions, and yield each possible new point
-        # Check the remainder of the point axis' divided by grid size to continue moving outward infinitely for part 2
-        for d in Direction:
-            offset = OFFSETS[d]
-            new_point = (point[0] + offset[0], point[1] + offset[1])
-            if self.grid[new_point[1] % self.height][new_point[0] % self.width] != "#":  # Make sure it wasn't a rock
-                yield new_point
-
-    def bfs(self, point, max_dist):
-        # Use the Breadth first search to find the number of points hit each step, and return the dictionary with key of number of steps taken,
-        # and value of number of points hit
-        tiles = defaultdict(int)
-        visited = set()
-        queue = [(point, 0)]
-        while queue:  # End when the queue is empty
-            curr_point, dist = queue.pop(0)
-            if dist == (max_dist + 1) or curr_point in visited:  # Don't include points that have already been visited
-                continue
-
-            tiles[dist] += 1
-            visited.add(curr_point)
-
-            for next_point in self.possible_points(curr_point):  # Loop over possible points and add to queue
-                queue.append((next_point, (dist + 1)))
-        return tiles
-
-    def calculate_possible_spots(self, start, max_steps):
-        # Get the output from bfs, and then return the sum of all potential stopping points in the tiles output based on even numbers
-        tiles = self.bfs(start, max_steps)
-        return sum(amount for distance, amount in tiles.items() if distance % 2 == max_steps % 2)
+        # Potential stopping points for each steps count: all points reached with the same parity
+        return [sum(search.levels[s % 2 : s + 1 : 2]) for s in steps]
 
     def quad(self, y, n):
         # Use the quadratic formula to find the output at the large steps based on the first three data points
@@ -72,7 +54,7 @@ class D21Puzzle(AOCPuzzle):
 
 class D21Step1Puzzle(D21Puzzle):
     def solve(self, steps: int) -> int:
-        return self.calculate_possible_spots(self.start, steps)
+        return self.possible_spots([steps])[0]
 
 
 class D21Step2Puzzle(D21Puzzle):
@@ -81,7 +63,7 @@ class D21Step2Puzzle(D21Puzzle):
         size = self.height
         edge = size // 2
 
-        y = [self.calculate_possible_spots(self.start, (edge + i * size)) for i in range(3)]
+        y = self.possible_spots([edge + i * size for i in range(3)])
 
         return self.quad(y, ((steps - edge) // size))
 
@@ -1,21 +1,23 @@
-import logging
-import re
-from dataclasses import dataclass, field
+from dataclasses import field
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple
 
+from aoc2023.ints import extract_ints
+from aoc2023.models import slotted
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.sidecar import Tokens
+from aoc2023.tracing import trace
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
 
 """
 Solutions for https://adventofcode.com/2023/day/22
 """
 
-# Brick positions
-BRICK_PATTERN = re.compile("([0-9]+),([0-9]+),([0-9]+)~([0-9]+),([0-9]+),([0-9]+)")
-
 
 # Brick model
-@dataclass
+@slotted
 class Brick:
     nb: int
     top: int
@@ -36,23 +38,31 @@ class Brick:
 
 
 class D22Puzzle(AOCPuzzle):
+    BUFFERED_PARSING = True
+    KEEP_INPUT_LINES = False
+    SIDECAR_FORMAT = "d22.v1"
+
     def __init__(self, input_file: Path):
         self.bricks: Dict[int, Brick] = {}
         self.min_x = self.min_y = self.max_x = self.max_y = None
         self.next_brick_nb = 1
         super().__init__(input_file)
-        logging.info(f"plan corners: {self.min_x},{self.min_y} - {self.max_x},{self.max_y}")
+        trace("plan corners: %s,%s - %s,%s", self.min_x, self.min_y, self.max_x, self.max_y)
 
         # Simplify: both x and y are supposed to be 0-based
         assert self.min_x == 0
         assert self.min_y == 0
 
-    def parse_line(self, index: int, line: str) -> str:
-        # Parse brick
-        line = super().parse_line(index, line)
-        m = BRICK_PATTERN.match(line)
-        assert m is not None
-        x1, y1, z1, x2, y2, z2 = int(m.group(1)), int(m.group(2)), int(m.group(3)), int(m.group(4)), int(m.group(5)), int(m.group(6))
+    @classmethod
+    def tokenize(cls, data: bytes) -> Tokens:
+        # Bricks corners coordinates
+        return {"bricks": extract_ints(data, 6)}, {}
+
+    def load_tokens(self, arrays: Dict[str, "np.ndarray"], meta: dict):
+        for coords in arrays["bricks"].tolist():
+            self.add_brick(*coords)
+
+    def add_brick(self, x1: int, y1: int, z1: int, x2: int, y2: int, z2: int):
         plan_cubes = set()
         min_x, min_y, max_x, max_y = min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
         for x in range(min_x, max_x + 1):
@@ -60,7 +70,7 @@ class D22Puzzle(AOCPuzzle):
                 plan_cubes.add((x, y))
         brick = Brick(self.next_brick_nb, max(z1, z2), min(z1, z2), plan_cubes)
         self.next_brick_nb += 1
-        logging.info(f"new brick: {brick}")
+        trace("new brick: %s", brick)
 
         # Upgrade plan corners
         if self.min_x is None or min_x < self.min_x:
@@ -1,19 +1,24 @@
-import logging
-from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Set, Tuple
 
-from aoc2023.puzzle import OFFSETS, AOCPuzzle, Direction
+from aoc2023.grid import GridPuzzle
+from aoc2023.models import slotted
+from aoc2023.puzzle import DIR_E, DIR_N, DIR_OFFSETS, DIR_S, DIR_W, DIRS
+from aoc2023.tracing import trace
 
 """
 Solutions for https://adventofcode.com/2023/day/23
 """
 
 # Slopes to direction
-SLOPES_TO_DIR = {"^": Direction.N, ">": Direction.E, "v": Direction.S, "<": Direction.W}
+SLOPES_TO_DIR = {ord("^"): DIR_N, ord(">"): DIR_E, ord("v"): DIR_S, ord("<"): DIR_W}
 
+# Cell values
+PATH = ord(".")
+FOREST = ord("#")
 
-@dataclass
+
+@slotted
 class Branch:
     a: Tuple[int, int]
     b: Tuple[int, int]
@@ -21,40 +26,29 @@ class Branch:
     path_len: int
 
 
-class D23Puzzle(AOCPuzzle):
+class D23Puzzle(GridPuzzle):
     def __init__(self, input_file: Path):
-        self.grid: List[str] = []
-        self.width = None
-        self.height = 0
-        self.start = None
         super().__init__(input_file)
-        self.end = (self.height - 1, self.grid[-1].find("."))
-        logging.info(f"start: {self.start} / end: {self.end}")
+        self.width = self.grid.width
+        self.height = self.grid.height
+        self.start = (0, self.grid.row(0).find(PATH))
+        self.end = (self.height - 1, self.grid.row(self.height - 1).find(PATH))
+        trace("start: %s / end: %s", self.start, self.end)
         self.branches: Dict[Tuple[int, int], List[Branch]] = {}
 
-    def parse_line(self, index: int, line: str) -> str:
-        line = super().parse_line(index, line)
-        self.grid.append(line)
-        if self.width is None:
-            self.width = len(line)
-        self.height += 1
-
-        if self.start is None:
-            self.start = (0, line.find("."))
-
     def add_branch(self, a: Tuple[int, int], b: Tuple[int, int], path: Set[Tuple[int, int]], one_way: bool):
         if a not in self.branches:
             self.branches[a] = []
         b_path = set(path)
         b_path.discard(a)
-        logging.info(f"New branch between {a} and {b} ({len(b_path)} steps)")
+        trace("New branch between %s and %s (%s steps)", a, b, len(b_path))
         self.branches[a].append(Branch(a, b, b_path, len(b_path)))
         if not one_way:
             if b not in self.branches:
                 self.branches[b] = []
             b_path = set(path)
             b_path.discard(b)
-            logging.info(f"New branch between {b} and {a} ({len(b_path)} steps)")
+            trace("New branch between %s and %s (%s steps)", b, a, len(b_path))
             self.branches[b].append(Branch(b, a, b_path, len(b_path)))
 
     def build_branches(self, start: Tuple[int, int], coming_from: Tuple[int, int] = None):
@@ -93,22 +87,24 @@ class D23Puzzle(AOCPuzzle):
     def get_candidates(self, pos: Tuple[int, int], path: Set[Tuple[int, int]]) -> List[Tuple[Tuple[int, int], bool]]:
         # Direction may be forced by a slope
         row, col = pos
-        if self.grid[row][col] in SLOPES_TO_DIR:
-            dirs = [SLOPES_TO_DIR[self.grid[row][col]]]
+        tile = self.grid.at(row, col)
+        if tile in SLOPES_TO_DIR:
+            dirs = (SLOPES_TO_DIR[tile],)
             one_way = True
         else:
-            dirs = list(Direction)
+            dirs = DIRS
             one_way = False
 
         # Iterate on possible directions
-        for col_offset, row_offset in map(OFFSETS.get, dirs):
+        for d in dirs:
+            col_offset, row_offset = DIR_OFFSETS[d]
             candidate_col, candidate_row = col + col_offset, row + row_offset
             candidate_pos = (candidate_row, candidate_col)
             if (
                 candidate_pos not in path  # Not already done on this path
                 and (0 <= candidate_col < self.width)  # Not out of col bounds
                 and (0 <= candidate_row < self.height)  # Not out of row bounds
-                and (self.grid[candidate_row][candidate_col] != "#")  # Not going in a tree
+                and (self.grid.at(candidate_row, candidate_col) != FOREST)  # Not going in a tree
             ):
                 yield candidate_pos, one_way
 
@@ -135,7 +131,9 @@ class D23Puzzle(AOCPuzzle):
 
     def solve(self) -> int:
         self.build_branches(self.start)
-        return max(sum(p.values()) for p in self.follow_paths(self.start))
+        paths = self.follow_paths(self.start)
+        self.count("paths", len(paths))
+        return max(sum(p.values()) for p in paths)
 
 
 class D23Step1Puzzle(D23Puzzle):
@@ -146,12 +144,8 @@ class D23Step1Puzzle(D23Puzzle):
 class D23Step2Puzzle(D23Puzzle):
     def solve(self) -> int:
         # Forget all special tiles
-        new_grid = []
-        for line in self.grid:
-            new_line = line
-            for k in SLOPES_TO_DIR.keys():
-                new_line = new_line.replace(k, ".")
-            new_grid.append(new_line)
-        self.grid = new_grid
+        self.grid = self.grid.copy(mutable=True)
+        for slope in SLOPES_TO_DIR:
+            self.grid.array[self.grid.array == slope] = PATH
 
         return super().solve()
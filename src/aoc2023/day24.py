@@ -1,22 +1,20 @@
-import logging
-import re
-from dataclasses import dataclass
 from itertools import combinations
 from pathlib import Path
-from typing import List, Tuple
-
-import numpy as np
-from z3 import IntVector, Solver
+from typing import TYPE_CHECKING, Dict, Tuple
 
+from aoc2023.ints import extract_ints
+from aoc2023.models import StructOfArrays, slotted
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.sidecar import Tokens
+from aoc2023.tracing import Lazy, trace
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
 
 """
 Solutions for https://adventofcode.com/2023/day/24
 """
 
-# Hailstone pattern
-HAILSTONE = re.compile("([-0-9]+), +([-0-9]+), +([-0-9]+) +@ +([-0-9]+), +([-0-9]+), +([-0-9]+)")
-
 
 # Sign
 def sign_of(a: int) -> int:
@@ -26,7 +24,7 @@ def sign_of(a: int) -> int:
 
 
 # Hailstone model
-@dataclass
+@slotted
 class HailStone:
     px: int
     py: int
@@ -77,20 +75,35 @@ class HailStone:
 
 
 class D24Puzzle(AOCPuzzle):
+    BUFFERED_PARSING = True
+    KEEP_INPUT_LINES = False
+    CHUNKED_PARSING = ("hailstones",)
+    SIDECAR_FORMAT = "d24.v1"
+
     def __init__(self, input_file: Path):
-        self.hailstones: List[HailStone] = []
+        # Hailstones are stored as columns of 64-bits integers
+        self.hailstones = StructOfArrays(HailStone, dict.fromkeys(("px", "py", "pz", "vx", "vy", "vz"), "q"))
         super().__init__(input_file)
 
-    def parse_line(self, index: int, line: str) -> str:
-        line = super().parse_line(index, line)
-        m = HAILSTONE.match(line)
-        assert m is not None
-        self.hailstones.append(HailStone(int(m.group(1)), int(m.group(2)), int(m.group(3)), int(m.group(4)), int(m.group(5)), int(m.group(6))))
-        logging.info(f"Parsed hailstone: {self.hailstones[-1]}")
+    @classmethod
+    def tokenize(cls, data: bytes) -> Tokens:
+        # Lazy import (heavy dependency)
+        import numpy as np
+
+        # Hailstones columns (one row per field, so that each column is contiguous)
+        return {"hailstones": np.ascontiguousarray(extract_ints(data, 6).T)}, {}
+
+    def load_tokens(self, arrays: Dict[str, "np.ndarray"], meta: dict):
+        for name, values in zip(self.hailstones.names, arrays["hailstones"]):
+            self.hailstones.column(name).frombytes(memoryview(values.astype("=i8", copy=False)).cast("B"))
+        trace("Parsed hailstones: %s", Lazy(lambda: list(self.hailstones)))
 
 
 class D24Step1Puzzle(D24Puzzle):
     def solve(self, boundaries: Tuple[int, int]) -> int:
+        # Lazy import (heavy dependency)
+        import numpy as np
+
         # Iterate on all combinations
         total = 0
         b_min, b_max = boundaries
@@ -122,6 +135,9 @@ class D24Step1Puzzle(D24Puzzle):
 
 class D24Step2Puzzle(D24Puzzle):
     def solve(self) -> int:
+        # Lazy import (heavy dependency)
+        from z3 import IntVector, Solver
+
         # Prepare int vector for solution
         px, py, pz, vx, vy, vz = IntVector("solution", 6)
         times = IntVector("time", len(self.hailstones))
@@ -1,10 +1,8 @@
-import logging
 import re
 from pathlib import Path
 
-from networkx import Graph, node_connected_component, shortest_path_length
-
 from aoc2023.puzzle import AOCPuzzle
+from aoc2023.tracing import trace
 
 """
 Solutions for https://adventofcode.com/2023/day/25
@@ -15,12 +13,18 @@ COMPONENT_PATTERN = re.compile("([a-z]+): ([a-z ]+)")
 
 
 class D25Puzzle(AOCPuzzle):
+    STREAMING = True
+    KEEP_INPUT_LINES = False
+
     def __init__(self, input_file: Path):
+        # Lazy import (heavy dependency)
+        from networkx import Graph
+
         self.graph = Graph()
         super().__init__(input_file)
 
         # Count things
-        logging.info(f"Found components: {len(self.graph)}")
+        trace("Found components: %s", len(self.graph))
 
     def parse_line(self, index: int, line: str) -> str:
         # Add nodes and edges to the graph
@@ -34,6 +38,9 @@ class D25Puzzle(AOCPuzzle):
 
 class D25Step1Puzzle(D25Puzzle):
     def solve(self) -> int:
+        # Lazy import (heavy dependency)
+        from networkx import node_connected_component, shortest_path_length
+
         # Iterate on edges to find cost for shortest path between nodes with broken link
         costs = []
         for edge in self.graph.edges:
@@ -46,13 +53,13 @@ class D25Step1Puzzle(D25Puzzle):
 
         # Remove this top 3 edges
         for i in range(3):
-            logging.info(f"removing edge {costs[i][0]} (cost {costs[i][1]})")
+            trace("removing edge %s (cost %s)", costs[i][0], costs[i][1])
             self.graph.remove_edge(*costs[i][0])
 
         # Get two groups of components, based on first component pair for which the link was broken
         group1_len = len(node_connected_component(self.graph, costs[0][0][0]))
         group2_len = len(node_connected_component(self.graph, costs[0][0][1]))
-        logging.info(f"2 groups found of size {group1_len} and {group2_len}")
+        trace("2 groups found of size %s and %s", group1_len, group2_len)
         assert group1_len < len(self.graph)
         assert group2_len < len(self.graph)
         assert group1_len + group2_len == len(self.graph)
@@ -0,0 +1,162 @@
+import mmap
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple, Union
+
+from aoc2023.puzzle import BUFFER_TYPES, AOCPuzzle
+from aoc2023.sidecar import Tokens
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+"""
+Grid model shared by grid puzzles
+
+Cells are stored row by row in a flat bytes buffer (fast single cell access from Python code),
+also exposed as a (height, width) uint8 numpy array sharing the same memory (for vectorized operations).
+numpy is only imported on first access to this array, so that puzzles only working on cells don't pay for its import.
+"""
+
+# Line ending characters
+LINE_ENDINGS = b"\r\n"
+
+
+class Grid:
+    def __init__(self, cells: Union[bytes, bytearray], width: int, height: int):
+        assert len(cells) == width * height, f"Inconsistent grid size: {len(cells)} cells for {width}x{height}"
+        self.cells = cells
+        self.width = width
+        self.height = height
+
+    @cached_property
+    def array(self) -> "np.ndarray":
+        # Lazy import (heavy dependency)
+        import numpy as np
+
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.width)
+
+    def __getstate__(self) -> dict:
+        # Array view is not pickled (rebuilt on demand, sharing memory with cells)
+        return {k: v for k, v in self.__dict__.items() if k != "array"}
+
+    @staticmethod
+    def from_bytes(data) -> "Grid":
+        # Remove line endings from raw content (any buffer: bytes, mmap, memoryview, ...)
+        raw = bytes(data)
+        cells = raw.translate(None, LINE_ENDINGS)
+
+        # Width is given by first line
+        eol = raw.find(b"\n")
+        width = len(raw[:eol].rstrip(b"\r")) if eol >= 0 else len(cells)
+        return Grid(cells, width, len(cells) // width if width else 0)
+
+    @staticmethod
+    def from_file(input_file: Path) -> "Grid":
+        # Parse grid from memory-mapped file content
+        with input_file.open("rb") as f:
+            if input_file.stat().st_size == 0:
+                return Grid(b"", 0, 0)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                return Grid.from_bytes(m)
+
+    @staticmethod
+    def from_lines(lines: Iterable[str]) -> "Grid":
+        rows = [line.encode() for line in lines]
+        return Grid(b"".join(rows), len(rows[0]) if rows else 0, len(rows))
+
+    @staticmethod
+    def from_array(array: "np.ndarray", mutable: bool = False) -> "Grid":
+        height, width = array.shape
+        cells = array.astype("uint8", copy=False).tobytes()
+        return Grid(bytearray(cells) if mutable else cells, width, height)
+
+    def padded(self, value: int) -> "Grid":
+        # New grid, surrounded by a border of required value (i.e. flat index moves can stop on it instead of checking bounds)
+        border = bytes([value])
+        side = border * (self.width + 2)
+        return Grid(side + b"".join(border + r + border for r in self.rows()) + side, self.width + 2, self.height + 2)
+
+    def copy(self, mutable: bool = False) -> "Grid":
+        return Grid(bytearray(self.cells) if mutable else bytes(self.cells), self.width, self.height)
+
+    def __repr__(self) -> str:
+        return "\n".join(r.decode() for r in self.rows())
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Grid) and (self.width, self.height, self.cells) == (other.width, other.height, other.cells)
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.width + col
+
+    def position(self, index: int) -> Tuple[int, int]:
+        return divmod(index, self.width)
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return (0 <= row < self.height) and (0 <= col < self.width)
+
+    def at(self, row: int, col: int) -> int:
+        return self.cells[row * self.width + col]
+
+    def wrapped(self, row: int, col: int) -> int:
+        # Cell value, for a grid infinitely repeated in all directions
+        return self.cells[(row % self.height) * self.width + (col % self.width)]
+
+    def neighbours(self, row: int, col: int) -> Iterator[Tuple[int, int]]:
+        # In-bounds neighbours (N, E, S, W)
+        for n_row, n_col in ((row - 1, col), (row, col + 1), (row + 1, col), (row, col - 1)):
+            if (0 <= n_row < self.height) and (0 <= n_col < self.width):
+                yield n_row, n_col
+
+    def row(self, row: int) -> bytes:
+        return bytes(self.cells[row * self.width : (row + 1) * self.width])
+
+    def rows(self) -> List[bytes]:
+        return [self.row(r) for r in range(self.height)]
+
+    def find(self, value: int) -> Union[Tuple[int, int], None]:
+        # First position of a given cell value
+        index = self.cells.find(value)
+        return self.position(index) if index >= 0 else None
+
+    def find_all(self, value: int) -> List[Tuple[int, int]]:
+        return [(int(r), int(c)) for r, c in zip(*(self.array == value).nonzero())]
+
+    def transposed(self) -> "Grid":
+        return Grid.from_array(self.array.T)
+
+
+# Base class for puzzles working on a single grid
+class GridPuzzle(AOCPuzzle):
+    KEEP_INPUT_LINES = False
+    SIDECAR_FORMAT = "grid.v1"
+
+    @classmethod
+    def tokenize(cls, data: bytes) -> Tokens:
+        # Grid cells matrix
+        return {"cells": Grid.from_bytes(data).array}, {}
+
+    def load_tokens(self, arrays: Dict[str, "np.ndarray"], meta: dict):
+        self.grid = Grid.from_array(arrays["cells"])
+
+    def parse_file(self):
+        # In-memory input?
+        if not isinstance(self.input_file, Path):
+            if isinstance(self.input_file, BUFFER_TYPES):
+                self.grid = Grid.from_bytes(self.input_file)
+                self.instrumentation.bytes_read = memoryview(self.input_file).nbytes
+            else:
+                self.grid = Grid.from_lines(line.rstrip("\r\n") for line in self.iter_memory_lines())
+            self.instrumentation.lines = self.grid.height
+            return
+
+        # Pre-tokenized input?
+        if self.load_sidecar():
+            return
+
+        # Check file existence
+        assert self.input_file.is_file(), f"File not found: {self.input_file}"
+
+        # Grid is built from raw file content, not line by line
+        self.grid = Grid.from_file(self.input_file)
+        self.instrumentation.bytes_read = self.input_file.stat().st_size
+        self.instrumentation.lines = self.grid.height
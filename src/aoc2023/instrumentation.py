@@ -0,0 +1,55 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Dict
+
+"""
+Puzzle instrumentation: phases timings, input size, memory peak and custom counters
+"""
+
+
+@dataclass
+class Instrumentation:
+    parse_time: float = 0.0  # Parsing wall time (seconds)
+    lines: int = 0  # Number of parsed lines
+    bytes_read: int = 0  # Input size
+    solve_time: float = 0.0  # Cumulated wall time in solve() calls (seconds)
+    solve_calls: int = 0  # Number of solve() calls
+    memory_peak: int = None  # Peak traced memory (bytes), only when memory tracing is enabled
+    counters: Dict[str, int] = field(default_factory=dict)  # Named counters, incremented by puzzles
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+    def as_json(self) -> str:
+        return json.dumps(self.as_dict(), indent=4)
+
+    @contextmanager
+    def measure(self, phase: str, trace_memory: bool = False):
+        # Start memory tracing if required
+        started = False
+        if trace_memory:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Update phase time
+            elapsed = time.perf_counter() - start
+            setattr(self, f"{phase}_time", getattr(self, f"{phase}_time") + elapsed)
+
+            # Update memory peak
+            if trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                self.memory_peak = peak if self.memory_peak is None else max(peak, self.memory_peak)
+                if started:
+                    tracemalloc.stop()
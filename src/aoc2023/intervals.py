@@ -0,0 +1,152 @@
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+"""
+Integer intervals algebra, on whole batches at once
+
+- ranges: int64 array of shape (n, 2), with inclusive (first, last) bounds on each row
+- boxes (hyper-rectangles): int64 array of shape (n, dims, 2), with inclusive (first, last) bounds for each dimension
+
+Splitting is driven by sorted breakpoints (searchsorted, i.e. a vectorized bisect), so that each range is only compared with the
+breakpoints it actually overlaps, instead of scanning all known intervals for each range.
+Boxes are routed through graphs of splits in rounds, with all boxes moving forward together (whatever the number of nodes).
+"""
+
+
+# Split ranges on sorted breakpoints: each range is cut before each breakpoint inside it
+# Returns the pieces, and the segment of each piece (i.e. the number of breakpoints lower or equal to its first value)
+def split(ranges: "np.ndarray", breakpoints: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    # Lazy import (heavy dependency)
+    import numpy as np
+
+    first = np.searchsorted(breakpoints, ranges[:, 0], side="right")
+    last = np.searchsorted(breakpoints, ranges[:, 1], side="right")
+    if len(breakpoints) == 0 or np.array_equal(first, last):
+        # Nothing to cut
+        return ranges.copy(), first
+
+    # One piece per segment between first and last ones, for each range
+    counts = last - first + 1
+    owners = np.repeat(np.arange(len(ranges)), counts)
+    ranks = np.arange(len(owners)) - np.repeat(np.cumsum(counts) - counts, counts)
+    segments = first[owners] + ranks
+
+    # Pieces bounds: range bounds for first/last pieces, breakpoints otherwise
+    pieces = np.empty((len(owners), 2), dtype=np.int64)
+    pieces[:, 0] = np.where(ranks == 0, ranges[owners, 0], np.take(breakpoints, segments - 1, mode="clip"))
+    pieces[:, 1] = np.where(ranks == counts[owners] - 1, ranges[owners, 1], np.take(breakpoints, segments, mode="clip") - 1)
+    return pieces, segments
+
+
+# Merge ranges in a sorted list of disjoint ones (adjacent ranges are merged as well)
+def merge(ranges: "np.ndarray") -> "np.ndarray":
+    # Lazy import (heavy dependency)
+    import numpy as np
+
+    if len(ranges) == 0:
+        return ranges.copy()
+    ranges = ranges[np.argsort(ranges[:, 0], kind="stable")]
+
+    # A new range starts when its first value is after all previous last values
+    reach = np.maximum.accumulate(ranges[:, 1])
+    starts = np.flatnonzero(np.concatenate(([True], ranges[1:, 0] > reach[:-1] + 1)))
+    return np.column_stack((ranges[starts, 0], reach[np.append(starts[1:], len(ranges)) - 1]))
+
+
+# Intersect ranges with a single (first, last) interval (empty intersections are dropped)
+def intersect(ranges: "np.ndarray", first: int, last: int) -> "np.ndarray":
+    # Lazy import (heavy dependency)
+    import numpy as np
+
+    out = np.column_stack((np.maximum(ranges[:, 0], first), np.minimum(ranges[:, 1], last)))
+    return out[out[:, 0] <= out[:, 1]]
+
+
+# Translation of integers by intervals: disjoint source ranges, each one with its own offset (other integers are unchanged)
+class IntervalMap:
+    def __init__(self, ranges: Iterable[Tuple[int, int, int]]):
+        # Lazy import (heavy dependency)
+        import numpy as np
+
+        # Sorted (first, last, offset) ranges
+        self.ranges = sorted(ranges)
+        firsts = [r[0] for r in self.ranges]
+        for previous, current in zip(self.ranges, self.ranges[1:]):
+            assert current[0] > previous[1], f"Overlapping ranges: {previous} / {current}"
+
+        # Breakpoints delimit segments with constant offset (segment i starts on breakpoint i-1)
+        self.breakpoints = np.array(sorted({b for first, last, _ in self.ranges for b in (first, last + 1)}), dtype=np.int64)
+        offsets = [0]
+        for b in self.breakpoints.tolist():
+            i = bisect_right(firsts, b) - 1
+            offsets.append(self.ranges[i][2] if i >= 0 and b <= self.ranges[i][1] else 0)
+        self.offsets = np.array(offsets, dtype=np.int64)
+
+    def __repr__(self) -> str:
+        return f"IntervalMap({self.ranges})"
+
+    def apply(self, ranges: "np.ndarray") -> "np.ndarray":
+        # Split ranges on breakpoints, then translate each piece with the offset of its segment
+        pieces, segments = split(ranges, self.breakpoints)
+        pieces += self.offsets[segments][:, None]
+        return pieces
+
+
+# Boxes batch from first and last values arrays (both of shape (n, dims))
+def boxes_of(first: "np.ndarray", last: "np.ndarray") -> "np.ndarray":
+    # Lazy import (heavy dependency)
+    import numpy as np
+
+    return np.stack((first, last), axis=-1).astype(np.int64)
+
+
+# Routing of boxes through a graph of splits: each node cuts boxes on a value for one dimension, then sends the part below this value
+# to a node and the part above (or equal) to another one; negative node ids are final outcomes
+class SplitGraph:
+    def __init__(self, nodes: List[Tuple[int, int, int, int]]):
+        # Lazy import (heavy dependency)
+        import numpy as np
+
+        # (dimension, value, node below, node above) columns
+        self.dims, self.values, self.below, self.above = np.array(nodes, dtype=np.int64).reshape(-1, 4).T.copy()
+
+    def route(self, boxes: "np.ndarray", start: int) -> Dict[int, "np.ndarray"]:
+        # Lazy import (heavy dependency)
+        import numpy as np
+
+        # All boxes move forward together, one node per round (i.e. number of rounds is the longest path length)
+        outcomes: Dict[int, List["np.ndarray"]] = {}
+        nodes = np.full(len(boxes), start, dtype=np.int64)
+        while len(boxes) and start >= 0:
+            dims, values = self.dims[nodes], self.values[nodes]
+            rows = np.arange(len(boxes))
+            is_below = boxes[rows, dims, 0] < values
+            is_above = boxes[rows, dims, 1] >= values
+
+            # Boxes parts below/above the split value
+            below, below_dims = boxes[is_below], dims[is_below]
+            below_rows = np.arange(len(below))
+            below[below_rows, below_dims, 1] = np.minimum(below[below_rows, below_dims, 1], values[is_below] - 1)
+            above, above_dims = boxes[is_above], dims[is_above]
+            above_rows = np.arange(len(above))
+            above[above_rows, above_dims, 0] = np.maximum(above[above_rows, above_dims, 0], values[is_above])
+            boxes = np.concatenate((below, above))
+            nodes = np.concatenate((self.below[nodes[is_below]], self.above[nodes[is_above]]))
+
+            # Set aside boxes that reached a final outcome
+            final = nodes < 0
+            if final.any():
+                for outcome in np.unique(nodes[final]).tolist():
+                    outcomes.setdefault(outcome, []).append(boxes[nodes == outcome])
+                boxes, nodes = boxes[~final], nodes[~final]
+        if start < 0:
+            outcomes[start] = [boxes]
+        return {outcome: np.concatenate(parts) for outcome, parts in outcomes.items()}
+
+
+# Number of integer points in each box
+def volumes(boxes: "np.ndarray") -> "np.ndarray":
+    return (boxes[:, :, 1] - boxes[:, :, 0] + 1).prod(axis=1)
@@ -0,0 +1,56 @@
+from typing import TYPE_CHECKING, Tuple, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+"""
+Vectorized integers extraction: all (signed) integers of a buffer, in one pass of numpy operations instead of a regex match per token
+
+Integers are runs of ASCII digits, negative if preceded by a '-' character. They're returned as int64 (i.e. up to 18 digits).
+"""
+
+# Max digits for an int64 token
+MAX_DIGITS = 18
+
+# Buffer to be scanned
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+# All integers of a buffer, with the (0-based) index of the line of each one
+def scan_ints(data: Buffer) -> Tuple["np.ndarray", "np.ndarray"]:
+    # Lazy import (heavy dependency)
+    import numpy as np
+
+    # Digit bytes classification (non-digit bytes wrap to values >= 10)
+    buf = np.frombuffer(data, dtype=np.uint8)
+    digits = buf - np.uint8(ord("0"))
+    is_digit = digits < 10
+
+    # Tokens are delimited by digit/non-digit transitions
+    edges = np.diff(is_digit.view(np.int8), prepend=np.int8(0), append=np.int8(0))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    lengths = ends - starts
+    assert lengths.max() <= MAX_DIGITS, f"Integer token too long for int64 (more than {MAX_DIGITS} digits)"
+
+    # Each digit is weighted by 10^(its position from the token end), then digits are summed per token
+    weights = 10 ** np.arange(MAX_DIGITS, dtype=np.int64)
+    positions = np.flatnonzero(is_digit)
+    exponents = np.repeat(ends - 1, lengths) - positions
+    first_digits = np.concatenate(([0], np.cumsum(lengths[:-1])))
+    values = np.add.reduceat(digits[positions].astype(np.int64) * weights[exponents], first_digits)
+
+    # Signs
+    values[(starts > 0) & (buf[starts - 1] == ord("-"))] *= -1
+
+    # Line of each token: number of line endings before it
+    lines = np.searchsorted(np.flatnonzero(buf == ord("\n")), starts)
+    return values, lines
+
+
+# All integers of a buffer, reshaped with required columns count (i.e. integers count per record)
+def extract_ints(data: Buffer, columns: int = None) -> "np.ndarray":
+    values, _ = scan_ints(data)
+    return values.reshape(-1, columns) if columns is not None else values
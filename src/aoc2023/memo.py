@@ -0,0 +1,104 @@
+import functools
+import sys
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Tuple
+
+"""
+Bounded memoization of pure functions (positional hashable arguments only)
+
+Unlike functools.cache, memoized values are kept in an LRU cache bounded in entries count and (estimated) size, so that a long-lived
+process (e.g. daemon workers) doesn't keep growing with all inputs it ever solved. Each memoized function records hits, misses and
+evictions; puzzles list the memoized functions they use in their MEMOS class attribute, so that statistics are reported as instrumentation
+counters and caches are cleared after each solve() (i.e. the cache scope is one puzzle solve).
+"""
+
+# Default bound on the number of cached entries
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+
+# Estimated size of a cache entry (key tuple with its items, and value)
+def entry_size(key: Tuple, value: object) -> int:
+    return sys.getsizeof(key) + sum(map(sys.getsizeof, key)) + sys.getsizeof(value)
+
+
+# LRU cache of a memoized function, with its statistics
+class Memo:
+    def __init__(self, name: str, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = None):
+        assert max_entries is None or max_entries > 0, f"Invalid max entries: {max_entries}"
+        assert max_bytes is None or max_bytes > 0, f"Invalid max bytes: {max_bytes}"
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # Cached values (least recently used first), and entries sizes (only when size is bounded)
+        self.entries: OrderedDict = OrderedDict()
+        self.sizes: Dict[Tuple, int] = {}
+        self.size = 0
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def put(self, key: Tuple, value: object):
+        self.entries[key] = value
+        if self.max_bytes is not None:
+            size = entry_size(key, value)
+            self.size += size - self.sizes.get(key, 0)
+            self.sizes[key] = size
+        self.evict()
+
+    def evict(self):
+        # Evict least recently used entries until bounds are respected
+        while (self.max_entries is not None and len(self.entries) > self.max_entries) or (self.max_bytes is not None and self.size > self.max_bytes):
+            evicted, _ = self.entries.popitem(last=False)
+            if self.max_bytes is not None:
+                self.size -= self.sizes.pop(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        # Forget cached values and reset statistics
+        self.entries.clear()
+        self.sizes.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        out = {"entries": len(self.entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+        if self.max_bytes is not None:
+            out["size"] = self.size
+        return out
+
+
+# Decorator for memoized functions; the returned function has a "memo" attribute (its Memo instance)
+def memoize(max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = None) -> Callable[[Callable], Callable]:
+    def decorator(func: Callable) -> Callable:
+        memo = Memo(func.__name__, max_entries, max_bytes)
+        entries, move_to_end = memo.entries, memo.entries.move_to_end
+        limit = max_entries if max_entries is not None else sys.maxsize
+
+        @functools.wraps(func)
+        def wrapper(*args: Hashable):
+            try:
+                value = entries[args]
+            except KeyError:
+                memo.misses += 1
+                value = func(*args)
+                if max_bytes is not None:
+                    memo.put(args, value)
+                else:
+                    # Fast path when only entries count is bounded
+                    entries[args] = value
+                    if len(entries) > limit:
+                        memo.evict()
+                return value
+            memo.hits += 1
+            move_to_end(args)
+            return value
+
+        wrapper.memo = memo
+        return wrapper
+
+    return decorator
@@ -0,0 +1,85 @@
+import dataclasses
+from array import array
+from typing import Dict, Iterator, List, Sequence, Type
+
+"""
+Compact data models
+
+- slotted: dataclass without per-instance __dict__ (same as dataclass(slots=True), which is not available on python 3.9)
+- StructOfArrays: columns storage for many records of a same model (one typed array per numeric field)
+"""
+
+
+# Rebind zero-argument super() in class methods (they still refer to the original class otherwise)
+def _rebind_class_cells(old_cls: type, new_cls: type):
+    for member in new_cls.__dict__.values():
+        if isinstance(member, (classmethod, staticmethod)):
+            member = member.__func__
+        elif isinstance(member, property):
+            member = member.fget
+        for cell in getattr(member, "__closure__", None) or ():
+            if cell.cell_contents is old_cls:
+                cell.cell_contents = new_cls
+
+
+# Dataclass decorator, with __slots__ for all fields
+def slotted(cls: type = None, **kwargs):
+    def wrap(cls: type) -> type:
+        cls = dataclasses.dataclass(cls, **kwargs)
+
+        # Only add slots for fields that are not already slotted in base classes
+        inherited = {name for base in cls.__mro__[1:] for name in getattr(base, "__slots__", ())}
+        names = tuple(f.name for f in dataclasses.fields(cls) if f.name not in inherited)
+
+        # Build a new class: slots can't be added to an existing one
+        cls_dict = dict(cls.__dict__)
+        cls_dict["__slots__"] = names
+        for name in names + ("__dict__", "__weakref__"):
+            # Defaults are already known by dataclass __init__, and would conflict with slots
+            cls_dict.pop(name, None)
+        new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+        new_cls.__qualname__ = cls.__qualname__
+        _rebind_class_cells(cls, new_cls)
+        return new_cls
+
+    return wrap if cls is None else wrap(cls)
+
+
+# Columns storage for records of a dataclass model
+class StructOfArrays:
+    def __init__(self, model: Type, typecodes: Dict[str, str] = None):
+        # Numeric fields with a typecode (see array module) are stored in typed arrays, other ones in lists
+        typecodes = typecodes if typecodes is not None else {}
+        self.model = model
+        self.names = [f.name for f in dataclasses.fields(model)]
+        self.columns: Dict[str, Sequence] = {name: array(typecodes[name]) if name in typecodes else [] for name in self.names}
+        self._columns: List[Sequence] = list(self.columns.values())
+
+    def append(self, *values):
+        # Add a record, from its fields values
+        assert len(values) == len(self._columns), f"Expected {len(self._columns)} values, got {len(values)}"
+        for column, value in zip(self._columns, values):
+            column.append(value)
+
+    def extend(self, other: "StructOfArrays"):
+        # Add all records of another container
+        assert other.names == self.names, f"Can't extend with other fields: {other.names}"
+        for column, other_column in zip(self._columns, other._columns):
+            column.extend(other_column)
+
+    def column(self, name: str) -> Sequence:
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return len(self._columns[0]) if self._columns else 0
+
+    def __getitem__(self, index: int):
+        # Build a record instance for this index
+        return self.model(*(column[index] for column in self._columns))
+
+    def __iter__(self) -> Iterator:
+        for values in zip(*self._columns):
+            yield self.model(*values)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.model.__name__}, {len(self)} records)"
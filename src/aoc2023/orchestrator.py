@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Union
+
+from aoc2023.registry import REGISTRY
+from aoc2023.runner import SOLVE_ARGS, find_puzzle, run_puzzle
+from aoc2023.state_cache import StateCache
+
+"""
+Solve all puzzles of an input batch in a pool of processes
+
+Jobs are scheduled longest first (from historical timings), so that the total runtime gets close to the slowest job one.
+"""
+
+# Default input file name pattern in a batch folder
+INPUT_PATTERN = "d{day:02}.input.txt"
+
+# Estimated solve durations (in seconds), used when no history is known yet for a job
+DEFAULT_ESTIMATES = {
+    (23, 2): 59.3,
+    (14, 2): 6.2,
+    (24, 2): 4.9,
+    (12, 2): 4.3,
+    (17, 2): 3.8,
+    (16, 2): 3.4,
+    (22, 2): 2.7,
+    (21, 2): 2.0,
+    (6, 2): 1.5,
+    (17, 1): 1.5,
+    (20, 2): 1.0,
+    (24, 1): 0.7,
+}
+
+
+# Job to be solved
+@dataclass
+class Job:
+    day: int
+    step: int
+    input_file: Path
+
+    @property
+    def key(self) -> str:
+        return f"d{self.day:02}/s{self.step}"
+
+
+# Job results
+@dataclass
+class JobResult:
+    job: Job
+    solution: Union[int, str, List[str]] = None
+    parse_time: float = 0.0
+    solve_time: float = 0.0
+    latency: float = 0.0
+    error: str = None
+    instrumentation: dict = None
+
+
+# Results for the whole batch
+@dataclass
+class BatchResult:
+    results: List[JobResult] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    @property
+    def total_latency(self) -> float:
+        return sum(r.latency for r in self.results)
+
+    def as_table(self) -> List[Tuple]:
+        return [
+            (r.job.day, r.job.step, r.error if r.error else r.solution, f"{r.parse_time:.3f}", f"{r.solve_time:.3f}", f"{r.latency:.3f}") for r in self.results
+        ]
+
+
+# Historical timings, persisted in a json file
+class TimingsHistory:
+    def __init__(self, history_file: Path = None):
+        self.history_file = history_file
+        self.timings: Dict[str, float] = {}
+        if history_file is not None and history_file.is_file():
+            self.timings = json.loads(history_file.read_text())
+
+    def estimate(self, job: Job) -> float:
+        return self.timings.get(job.key, DEFAULT_ESTIMATES.get((job.day, job.step), 0.0))
+
+    def update(self, results: Iterable[JobResult]):
+        for r in filter(lambda r: r.error is None, results):
+            self.timings[r.job.key] = r.latency
+        if self.history_file is not None:
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            self.history_file.write_text(json.dumps(self.timings, indent=4, sort_keys=True))
+
+
+# List all jobs for days with an input file in a batch folder
+def list_jobs(inputs_dir: Path, days: Iterable[int] = None, pattern: str = INPUT_PATTERN) -> List[Job]:
+    out = []
+    for day in days or range(1, 26):
+        input_file = inputs_dir / pattern.format(day=day)
+        if not input_file.is_file():
+            logging.warning(f"No input for day {day}: {input_file}")
+            continue
+        for step in (1, 2):
+            if (day, step) not in REGISTRY:
+                # No solution for this step (e.g. day 25 step 2)
+                continue
+            out.append(Job(day, step, input_file))
+    return out
+
+
+# Sort jobs, longest first
+def schedule(jobs: List[Job], history: TimingsHistory) -> List[Job]:
+    return sorted(jobs, key=history.estimate, reverse=True)
+
+
+# Solve one job (in a worker process)
+def solve_job(job: Job, state_cache: StateCache = None) -> JobResult:
+    out = JobResult(job)
+    start = time.perf_counter()
+    try:
+        r = run_puzzle(find_puzzle(job.day, job.step), job.input_file, SOLVE_ARGS.get((job.day, job.step)), state_cache=state_cache)
+        out.solution, out.parse_time, out.solve_time = r.solution, r.parse.values[0], r.solve.values[0]
+        out.instrumentation = r.instrumentation.as_dict()
+    except Exception as e:
+        out.error = f"{type(e).__name__}: {e}"
+    out.latency = time.perf_counter() - start
+    return out
+
+
+# Solve all jobs in a process pool
+def solve_all(jobs: List[Job], workers: int = None, history: TimingsHistory = None, state_cache: StateCache = None) -> BatchResult:
+    history = history if history is not None else TimingsHistory()
+    out = BatchResult()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        # Submit longest jobs first
+        futures = [executor.submit(solve_job, job, state_cache) for job in schedule(jobs, history)]
+        results = [f.result() for f in futures]
+    out.wall_time = time.perf_counter() - start
+
+    # Results are reported in days/steps order
+    out.results = sorted(results, key=lambda r: (r.job.day, r.job.step))
+    history.update(out.results)
+    return out
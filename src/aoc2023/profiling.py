@@ -0,0 +1,141 @@
+import cProfile
+import hashlib
+import os
+import pstats
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+
+"""
+Opt-in profiling of puzzles parsing and solving
+
+When enabled (AOC2023_PROFILE environment variable set to an output folder when puzzles are built, or run --profile option), parsing
+and solve() are profiled separately with cProfile, and each phase produces two files named by day, step, input hash and phase (with
+solve() arguments if any, as some puzzle classes serve several steps, e.g. "d11-<hash>-solve-1000000"):
+* <name>.pstats: raw profile, for pstats/snakeviz/...
+* <name>.collapsed: collapsed stacks ("a;b;c <microseconds>" lines), for flamegraph tools (flamegraph.pl, speedscope, ...)
+
+cProfile only records callers of each function (not whole stacks): collapsed stacks are rebuilt from the callers graph, by splitting
+the time of each function between its callers in proportion of the cumulative time spent from each of them. To keep this linear in
+the graph size (shared helpers reached from many callers would make the number of paths explode), each function only gets one stack
+(its first path from a root, along heaviest calls): stacks are approximate above the direct caller.
+"""
+
+# Environment variable enabling profiling (output folder)
+PROFILE_ENV = "AOC2023_PROFILE"
+
+# Default output folder (when enabled from command line)
+DEFAULT_PROFILE_DIR = Path("out") / "profiles"
+
+# Puzzle class names
+CLASS_PATTERN = re.compile(r"D([0-9]+)(?:Step([0-9]+))?Puzzle")
+
+# Profiled function (file, line, name), as in pstats
+Function = Tuple[str, int, str]
+
+
+# Output folder from environment (or None if profiling is disabled)
+def env_profile_dir() -> Union[Path, None]:
+    value = os.environ.get(PROFILE_ENV)
+    return Path(value) if value else None
+
+
+# Phase name, with its arguments if any (ints or tuples of ints)
+def phase_name(phase: str, args: tuple = ()) -> str:
+    values = [v for a in args for v in (a if isinstance(a, (tuple, list)) else (a,))]
+    return "-".join([phase] + [str(v) for v in values])
+
+
+# Short hash of a puzzle input (streamed inputs can't be hashed without consuming them)
+def input_digest(input_file) -> str:
+    h = hashlib.sha256()
+    if isinstance(input_file, Path):
+        # Hashed by chunks, not to load the whole file
+        with input_file.open("rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+    elif isinstance(input_file, str):
+        h.update(input_file.encode())
+    elif isinstance(input_file, (bytes, bytearray, memoryview)):
+        h.update(input_file)
+    elif isinstance(input_file, (list, tuple)):
+        for line in input_file:
+            h.update(line.encode())
+    else:
+        return "stream"
+    return h.hexdigest()[:12]
+
+
+# Profile files base name, for a puzzle class, input hash and phase
+def profile_name(class_name: str, digest: str, phase: str) -> str:
+    m = CLASS_PATTERN.fullmatch(class_name)
+    prefix = (f"d{int(m.group(1)):02}" + (f"-step{m.group(2)}" if m.group(2) else "")) if m is not None else class_name
+    return f"{prefix}-{digest}-{phase}"
+
+
+# Readable function label
+def function_label(func: Function) -> str:
+    file, line, name = func
+    if file == "~":
+        # Built-in
+        return name
+    return f"{name} ({Path(file).name}:{line})"
+
+
+# Collapsed stacks from profile stats, with their own time (microseconds)
+def collapsed_stacks(stats: pstats.Stats, max_depth: int = 100) -> Dict[str, int]:
+    # Callees of each function, with cumulative time spent from this caller
+    callees: Dict[Function, List[Tuple[Function, float]]] = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, caller_ct) in callers.items():
+            callees.setdefault(caller, []).append((func, caller_ct))
+
+    # Stack of each function: path from a root (function without callers) in a spanning tree of the calls graph, walked depth first
+    # along heaviest calls first (each call edge is walked once)
+    paths: Dict[Function, Tuple[str, ...]] = {}
+    todo = [(func, ()) for func, (_, _, _, _, callers) in stats.stats.items() if not callers]
+    while todo:
+        func, parent_path = todo.pop()
+        if func in paths:
+            continue
+        paths[func] = (parent_path + (function_label(func),))[-max_depth:]
+        todo.extend((callee, paths[func]) for callee, _ in sorted(callees.get(func, []), key=lambda t: t[1]) if callee not in paths)
+
+    # Own time of each function, split between the stacks of its callers in proportion of the cumulative time spent from each of them
+    # (recursive calls are folded; functions which can't be reached from a root are skipped)
+    out: Dict[str, int] = {}
+    for func, (_, _, tt, _, callers) in stats.stats.items():
+        label = function_label(func)
+        total_ct = sum(caller_ct for _, _, _, caller_ct in callers.values())
+        shares = [(paths[c], c_ct / total_ct if total_ct > 0 else 1 / len(callers)) for c, (_, _, _, c_ct) in callers.items() if c in paths]
+        for caller_path, share in shares if callers else [((), 1.0)]:
+            stack = caller_path[: caller_path.index(label) + 1] if label in caller_path else (caller_path + (label,))[-max_depth:]
+            own = int(tt * share * 1_000_000)
+            if own > 0:
+                key = ";".join(stack)
+                out[key] = out.get(key, 0) + own
+    return out
+
+
+# Write profile files (pstats and collapsed stacks)
+def write_profile(profiler: cProfile.Profile, output: Path, name: str) -> Tuple[Path, Path]:
+    output.mkdir(parents=True, exist_ok=True)
+    stats = pstats.Stats(profiler)
+    pstats_file = output / f"{name}.pstats"
+    stats.dump_stats(pstats_file)
+    collapsed_file = output / f"{name}.collapsed"
+    collapsed_file.write_text("".join(f"{stack} {value}\n" for stack, value in sorted(collapsed_stacks(stats).items())))
+    return pstats_file, collapsed_file
+
+
+# Profile a code block, and write profile files
+@contextmanager
+def profiled(output: Path, name: str) -> Iterator[cProfile.Profile]:
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        write_profile(profiler, output, name)
@@ -1,7 +1,19 @@
+import functools
+import io
+import mmap
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
 from enum import IntEnum, auto
 from pathlib import Path
-from typing import List, Union
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from aoc2023.instrumentation import Instrumentation
+from aoc2023.profiling import env_profile_dir, input_digest, phase_name, profile_name, profiled
+from aoc2023.sidecar import Tokens, is_fresh, read_sidecar, sidecar_path
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
 
 
 # Directions
@@ -28,24 +40,332 @@ OFFSETS = {
     Direction.W: (-1, 0),
 }
 
+# Small-int directions (same order as Direction), for grids hot loops: tables below are indexed by them
+DIR_N, DIR_E, DIR_S, DIR_W = range(4)
+DIRS = (DIR_N, DIR_E, DIR_S, DIR_W)
+
+# Small-int direction of each Direction
+DIR_OF = {d: i for i, d in enumerate(Direction)}
+
+# (col, row) offsets
+DIR_OFFSETS = tuple(OFFSETS[d] for d in Direction)
+
+# Opposite direction, and directions after a turn on the right/left
+DIR_OPPOSITE = (DIR_S, DIR_W, DIR_N, DIR_E)
+DIR_RIGHT = (DIR_E, DIR_S, DIR_W, DIR_N)
+DIR_LEFT = (DIR_W, DIR_N, DIR_E, DIR_S)
+
+
+# Flat index offsets for a grid of a given width (i.e. index = row * width + col)
+def flat_offsets(width: int) -> Tuple[int, int, int, int]:
+    return tuple(row * width + col for col, row in DIR_OFFSETS)
+
+
+# Puzzle input: file path, or in-memory content (raw bytes, text, or lines)
+# (note that a str is an input content, not a file path)
+PuzzleInput = Union[Path, bytes, bytearray, memoryview, str, Iterable[str]]
+
+# In-memory raw content types
+BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+
+# Minimum size of input chunks for chunked parsing (smaller inputs are split in less chunks)
+MIN_CHUNK_SIZE = 64 * 1024
+
+
+# Input chunk, parsed in a worker process (lines are numbered from first_line)
+@dataclass
+class InputChunk:
+    data: bytes
+    first_line: int
+
+
+# Split a buffer in (at most) count chunks, on line boundaries
+def split_chunks(data: bytes, count: int, min_size: int = None) -> List[InputChunk]:
+    size = len(data)
+    count = max(1, min(count, size // max(1, min_size if min_size is not None else MIN_CHUNK_SIZE)))
+    out = []
+    start, first_line = 0, 1
+    for i in range(1, count + 1):
+        # Chunk ends after the first line ending following its theoretical end
+        end = size if i == count else data.find(b"\n", max(start, size * i // count)) + 1
+        end = end if end > 0 else size
+        if end > start:
+            out.append(InputChunk(data[start:end], first_line))
+            first_line += data.count(b"\n", start, end)
+        start = end
+    return out
+
+
+# Parse an input chunk (in a worker process), and return parsed attributes and lines count
+def parse_chunk(puzzle_class: type, chunk: InputChunk) -> Tuple[Dict[str, object], int]:
+    p = puzzle_class(chunk)
+    return {name: getattr(p, name) for name in puzzle_class.CHUNKED_PARSING}, p.instrumentation.lines
+
+
+# Number of lines of a buffer (last one may have no line ending)
+def count_lines(data: bytes) -> int:
+    return data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+
+
+# Iterate on lines of a memory-mapped file, without loading the whole content
+def iter_mapped_lines(input_file: Path) -> Iterator[str]:
+    with input_file.open("rb") as f:
+        # Empty files can't be mapped
+        if input_file.stat().st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            for line in iter(m.readline, b""):
+                yield line.decode()
+
+
+# Iterate on lines of an in-memory buffer
+def iter_buffer_lines(data: Union[bytes, bytearray, memoryview]) -> Iterator[str]:
+    for line in io.BytesIO(data):
+        yield line.decode()
+
+
+# Iterate on lines, while counting their size
+def iter_counted_lines(lines: Iterable[str], instrumentation: Instrumentation) -> Iterator[str]:
+    for line in lines:
+        instrumentation.bytes_read += len(line)
+        yield line
+
+
+# Decorator for solve() implementations, to measure time in (outermost) solve calls
+def instrumented_solve(solve: Callable) -> Callable:
+    @functools.wraps(solve)
+    def wrapper(self, *args, **kwargs):
+        if self._solving:
+            # Nested call (e.g. super().solve()): already measured
+            return solve(self, *args, **kwargs)
+        self._solving = True
+        try:
+            with self.instrumentation.measure("solve", self.TRACE_MEMORY), self.profiled("solve", args):
+                self.instrumentation.solve_calls += 1
+                return solve(self, *args, **kwargs)
+        finally:
+            self._solving = False
+
+            # Memoized functions are scoped to the solve: report their statistics, then clear them
+            for memoized in self.MEMOS:
+                for name, value in memoized.memo.stats().items():
+                    self.count(f"memo.{memoized.memo.name}.{name}", value)
+                memoized.memo.clear()
+
+    return wrapper
+
 
 # Base class for puzzle solutions
 class AOCPuzzle(ABC):
-    def __init__(self, input_file: Path):
-        # Parse input file
+    # Streaming mode: input file is memory-mapped and parsed line by line, without reading all lines first
+    STREAMING = False
+
+    # Parsed lines are remembered in input_lines (subclasses that don't need them can set this to False)
+    KEEP_INPUT_LINES = True
+
+    # Memory peak is traced with tracemalloc while parsing and solving (slower)
+    TRACE_MEMORY = False
+
+    # Parsing and solving are profiled with cProfile, with profile files written in this folder (see profiling module); when not set,
+    # the folder is read from the environment when the puzzle is built
+    PROFILE_DIR: Path = None
+
+    # Attributes filled by parse_line(), for puzzles which parse each line on its own: if any, input can be split in chunks,
+    # parsed in PARSE_WORKERS processes, and parsed attributes are merged in lines order (lists are extended, dicts are updated)
+    CHUNKED_PARSING: Tuple[str, ...] = ()
+    PARSE_WORKERS = 1
+
+    # Number of processes for puzzles which can fan solve() work out (e.g. independent starting points)
+    SOLVE_WORKERS = 1
+
+    # Buffered parsing: whole input content is parsed at once by parse_buffer() (e.g. with vectorized operations), instead of line by line
+    BUFFERED_PARSING = False
+
+    # Pre-tokenized binary input format (see sidecar module): puzzles supporting it declare a format name, and implement
+    # tokenize() (input content --> arrays) and load_tokens() (arrays --> parsed state)
+    SIDECAR_FORMAT: str = None
+
+    # Memoized functions (see memo module) used by solve(): cleared after each solve, with their statistics reported as counters
+    MEMOS: Tuple[Callable, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Instrument solve() implementations
+        if "solve" in cls.__dict__:
+            cls.solve = instrumented_solve(cls.solve)
+
+    def __init__(self, input_file: PuzzleInput):
+        # Parse input file (or in-memory input content)
         self.input_file = input_file
         self.input_lines = []
-        self.parse_file()
+        self.instrumentation = Instrumentation()
+        self._solving = False
+        self.init_profiling()
+        with self.instrumentation.measure("parse", self.TRACE_MEMORY), self.profiled("parse"):
+            self.parse_file()
+
+    def init_profiling(self):
+        # Profiles folder (if enabled), and input hash (computed on first profiled phase)
+        self._profile_dir = self.PROFILE_DIR if self.PROFILE_DIR is not None else env_profile_dir()
+        self._input_digest = None
+
+    @contextmanager
+    def profiled(self, phase: str, args: tuple = ()):
+        # Profile a phase, if enabled (input chunks are not profiled: the whole parsing is, in the main process)
+        if self._profile_dir is None or isinstance(self.input_file, InputChunk):
+            yield
+            return
+        if self._input_digest is None:
+            self._input_digest = input_digest(self.input_file)
+        with profiled(self._profile_dir, profile_name(type(self).__name__, self._input_digest, phase_name(phase, args))):
+            yield
+
+    def count(self, name: str, n: int = 1):
+        # Increment a named counter (hot loops should rather count locally, and call this once)
+        self.instrumentation.count(name, n)
 
     def parse_file(self):
+        # Input chunk (in a parsing worker process)?
+        if isinstance(self.input_file, InputChunk):
+            self.instrumentation.bytes_read = len(self.input_file.data)
+            self.parse_data(self.input_file.data, self.input_file.first_line)
+            return
+
+        # Pre-tokenized input?
+        if isinstance(self.input_file, Path) and self.load_sidecar():
+            return
+
+        # Chunked parsing?
+        if self.CHUNKED_PARSING and self.PARSE_WORKERS > 1 and isinstance(self.input_file, (Path,) + BUFFER_TYPES):
+            self.parse_chunks()
+            return
+
+        # Whole content at once?
+        if self.BUFFERED_PARSING:
+            self.parse_buffer(self.read_content())
+            return
+
+        # In-memory input?
+        if not isinstance(self.input_file, Path):
+            self.parse_lines(self.iter_memory_lines())
+            return
+
         # Check file existence
         assert self.input_file.is_file(), f"File not found: {self.input_file}"
 
         # Browse input lines
-        with self.input_file.open() as f:
-            for index, line in enumerate(f.readlines(), start=1):
+        self.instrumentation.bytes_read = self.input_file.stat().st_size
+        if self.STREAMING:
+            self.parse_lines(iter_mapped_lines(self.input_file))
+        else:
+            with self.input_file.open() as f:
+                self.parse_lines(f.readlines())
+
+    def read_content(self) -> bytes:
+        # Whole input content, whatever the input type
+        data = self.input_file
+        if isinstance(data, Path):
+            assert data.is_file(), f"File not found: {data}"
+            out = data.read_bytes()
+            self.instrumentation.bytes_read = len(out)
+        elif isinstance(data, BUFFER_TYPES):
+            out = bytes(data)
+            self.instrumentation.bytes_read = len(out)
+        elif isinstance(data, str):
+            # Text size is counted in characters
+            out = data.encode()
+            self.instrumentation.bytes_read = len(data)
+        else:
+            # Lines may come with or without line endings
+            lines = list(data)
+            out = "".join(line if line.endswith("\n") else line + "\n" for line in lines).encode()
+            self.instrumentation.bytes_read = sum(map(len, lines))
+        return out
+
+    def parse_buffer(self, data: bytes):
+        # Default implementation: tokenize, and build state from tokens
+        self.load_tokens(*self.tokenize(data))
+        self.instrumentation.lines = count_lines(data)
+
+    def iter_memory_lines(self) -> Iterator[str]:
+        # Lines of an in-memory input
+        data = self.input_file
+        if isinstance(data, BUFFER_TYPES):
+            self.instrumentation.bytes_read = memoryview(data).nbytes
+            return iter_buffer_lines(data)
+        if isinstance(data, str):
+            # Text size is counted in characters
+            self.instrumentation.bytes_read = len(data)
+            return io.StringIO(data)
+        return iter_counted_lines(data, self.instrumentation)
+
+    def load_sidecar(self) -> bool:
+        # Only if supported, and fresher than input file
+        if self.SIDECAR_FORMAT is None:
+            return False
+        sidecar = sidecar_path(self.input_file)
+        if not is_fresh(self.input_file, sidecar):
+            return False
+        loaded = read_sidecar(sidecar, self.SIDECAR_FORMAT)
+        if loaded is None:
+            return False
+        tokens, self.instrumentation.lines = loaded
+        self.instrumentation.bytes_read = sidecar.stat().st_size
+        self.load_tokens(*tokens)
+        return True
+
+    @classmethod
+    def tokenize(cls, data: bytes) -> Tokens:  # pragma: no cover
+        raise NotImplementedError(f"{cls.__name__} doesn't support pre-tokenized inputs")
+
+    def load_tokens(self, arrays: Dict[str, "np.ndarray"], meta: dict):  # pragma: no cover
+        raise NotImplementedError(f"{type(self).__name__} doesn't support pre-tokenized inputs")
+
+    def parse_chunks(self):
+        # Split input in chunks
+        if isinstance(self.input_file, Path):
+            assert self.input_file.is_file(), f"File not found: {self.input_file}"
+            data = self.input_file.read_bytes()
+        else:
+            data = bytes(self.input_file)
+        self.instrumentation.bytes_read = len(data)
+        chunks = split_chunks(data, self.PARSE_WORKERS)
+        if len(chunks) < 2:
+            # Not worth it
+            self.parse_data(data)
+            return
+
+        # Lazy import (only needed for chunked parsing)
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Parse all chunks in parallel, and merge results in order
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            for attributes, lines in executor.map(parse_chunk, [type(self)] * len(chunks), chunks):
+                for name, value in attributes.items():
+                    merged = getattr(self, name)
+                    if isinstance(merged, dict):
+                        merged.update(value)
+                    else:
+                        merged.extend(value)
+                self.instrumentation.lines += lines
+
+    def parse_data(self, data: bytes, first_line: int = 1):
+        # Parse a whole in-memory content, either at once or line by line
+        if self.BUFFERED_PARSING:
+            self.parse_buffer(data)
+        else:
+            self.parse_lines(iter_buffer_lines(data), first_line)
+
+    def parse_lines(self, lines: Iterator[str], first_line: int = 1):
+        index = first_line - 1
+        for index, line in enumerate(lines, start=first_line):
+            parsed_line = self.parse_line(index, line)
+            if self.KEEP_INPUT_LINES:
                 # Remember parsed line
-                self.input_lines.append(self.parse_line(index, line))
+                self.input_lines.append(parsed_line)
+        self.instrumentation.lines = index - first_line + 1
 
     def parse_line(self, index: int, line: str) -> str:
         # Default implementation: just strip meaningless characters at end of line
@@ -54,3 +374,8 @@ class AOCPuzzle(ABC):
     @abstractmethod
     def solve(self) -> Union[int, str, List[str]]:  # pragma: no cover
         pass
+
+    @classmethod
+    def solve_batch(cls, puzzles: Sequence["AOCPuzzle"], *args) -> List[Union[int, str, List[str]]]:
+        # Solve several puzzles of this class (default: one by one; days may override this to solve them together)
+        return [p.solve(*args) for p in puzzles]
@@ -0,0 +1,112 @@
+import importlib
+import re
+from typing import Dict, Iterator, Tuple, Type, Union
+
+from aoc2023.puzzle import AOCPuzzle
+
+"""
+Registry of puzzles solutions: (day, step) --> puzzle class path ("module:Class")
+
+Modules are only imported when a puzzle class is requested.
+External packages can register their own puzzles:
+- either by calling register(day, step, puzzle), with a class path or the class itself
+- or by declaring entry points in the "aoc2023.puzzles" group, named "d<day>/s<step>", e.g.:
+    [project.entry-points."aoc2023.puzzles"]
+    "d26/s1" = "mypackage.day26:D26Step1Puzzle"
+  Entry points are only scanned on first lookup of a puzzle which is not registered yet, or when listing all puzzles
+  (so they can't override built-in puzzles; use register() for that).
+"""
+
+# Entry points group for external puzzles
+ENTRY_POINTS_GROUP = "aoc2023.puzzles"
+
+# Entry point name pattern
+ENTRY_POINT_NAME = re.compile(r"d([0-9]+)/s([0-9]+)")
+
+# Built-in puzzles (day 25 has only one step)
+BUILTIN_PUZZLES: Dict[Tuple[int, int], str] = {
+    (day, step): f"aoc2023.day{day:02}:D{day:02}Step{step}Puzzle" for day in range(26) for step in (1, 2) if (day, step) != (25, 2)
+}
+
+# Day 11 steps only differ by solve argument
+BUILTIN_PUZZLES.update({(11, 1): "aoc2023.day11:D11Puzzle", (11, 2): "aoc2023.day11:D11Puzzle"})
+
+
+class PuzzleRegistry:
+    def __init__(self, puzzles: Dict[Tuple[int, int], str] = None, entry_points_group: str = None):
+        self.class_paths: Dict[Tuple[int, int], str] = dict(puzzles or {})
+        self.classes: Dict[Tuple[int, int], Type[AOCPuzzle]] = {}
+        self.entry_points_group = entry_points_group
+        self.entry_points_loaded = entry_points_group is None
+
+    def register(self, day: int, step: int, puzzle: Union[str, Type[AOCPuzzle]]):
+        key = (day, step)
+        if isinstance(puzzle, str):
+            assert ":" in puzzle, f"Invalid puzzle class path (expected 'module:Class'): {puzzle}"
+            self.class_paths[key] = puzzle
+            self.classes.pop(key, None)
+        else:
+            self.class_paths[key] = f"{puzzle.__module__}:{puzzle.__qualname__}"
+            self.classes[key] = puzzle
+
+    def unregister(self, day: int, step: int):
+        self.class_paths.pop((day, step), None)
+        self.classes.pop((day, step), None)
+
+    def load_entry_points(self):
+        # Only once
+        if self.entry_points_loaded:
+            return
+        self.entry_points_loaded = True
+
+        # Lazy import (slow to import)
+        from importlib.metadata import entry_points
+
+        # Python 3.9 returns a dict of groups; newer versions have a select method
+        all_entry_points = entry_points()
+        if hasattr(all_entry_points, "select"):
+            group = all_entry_points.select(group=self.entry_points_group)
+        else:  # pragma: no cover
+            group = all_entry_points.get(self.entry_points_group, [])
+        for ep in group:
+            m = ENTRY_POINT_NAME.fullmatch(ep.name)
+            assert m is not None, f"Invalid puzzle entry point name (expected 'd<day>/s<step>'): {ep.name}"
+            self.class_paths.setdefault((int(m.group(1)), int(m.group(2))), ep.value)
+
+    def class_path(self, day: int, step: int) -> str:
+        if (day, step) not in self.class_paths:
+            self.load_entry_points()
+        assert (day, step) in self.class_paths, f"Unknown puzzle: D{day:02}Step{step}Puzzle"
+        return self.class_paths[(day, step)]
+
+    def get(self, day: int, step: int) -> Type[AOCPuzzle]:
+        # Import module on first access
+        key = (day, step)
+        if key not in self.classes:
+            module_name, class_name = self.class_path(day, step).split(":")
+            module = importlib.import_module(module_name)
+            assert hasattr(module, class_name), f"Unknown puzzle: {class_name} not found in {module_name}"
+            self.classes[key] = getattr(module, class_name)
+        return self.classes[key]
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        if key not in self.class_paths:
+            self.load_entry_points()
+        return key in self.class_paths
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        self.load_entry_points()
+        return iter(sorted(self.class_paths))
+
+    def __len__(self) -> int:
+        self.load_entry_points()
+        return len(self.class_paths)
+
+
+# Default registry
+REGISTRY = PuzzleRegistry(BUILTIN_PUZZLES, ENTRY_POINTS_GROUP)
+
+
+# Register a puzzle in the default registry
+def register(day: int, step: int, puzzle: Union[str, Type[AOCPuzzle]]):
+    REGISTRY.register(day, step, puzzle)
@@ -0,0 +1,360 @@
+import math
+import statistics
+import time
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Type, Union
+
+from aoc2023.answer_cache import DEFAULT_ANSWER_CACHE_DIR, DEFAULT_TTL, AnswerCache
+from aoc2023.instrumentation import Instrumentation
+from aoc2023.profiling import DEFAULT_PROFILE_DIR, PROFILE_ENV
+from aoc2023.puzzle import AOCPuzzle
+from aoc2023.registry import REGISTRY
+from aoc2023.state_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_SIZE, StateCache
+
+"""
+Command-line runner for puzzle solutions
+
+Usage:
+    python -m aoc2023 run --day 17 --step 2 [--arg N]... [--repeat N] [--parse-workers N] [--solve-workers N] [--profile [DIR]] <input file>
+    python -m aoc2023 solve-all [--day N]... [--workers N] [--history FILE] <inputs folder>
+    python -m aoc2023 batch --day 9 --step 1 [--arg N]... [--metrics] <input files...>
+    python -m aoc2023 serve [--socket PATH] [--workers N]
+    python -m aoc2023 query --day 17 --step 2 [--arg N]... [--socket PATH] <input file>
+    python -m aoc2023 tokenize --day 22 <input files...>
+    python -m aoc2023 invalidate [--day N [--step N]] [--answers] [input file]
+    python -m aoc2023 list
+
+run and solve-all commands can use a cache of parsed state with --state-cache option.
+run command can use a cache of answers with --answer-cache option (solve-all, batch and the daemon don't use it).
+"""
+
+
+# Default solve arguments, for puzzles which need one (steps only differ by this argument for day 11)
+SOLVE_ARGS = {
+    (11, 1): 2,
+    (11, 2): 1_000_000,
+    (21, 1): 64,
+    (21, 2): 26501365,
+    (24, 1): (200000000000000, 400000000000000),
+}
+
+
+# Find puzzle class for a given day and step (from puzzles registry)
+def find_puzzle(day: int, step: int) -> Type[AOCPuzzle]:
+    return REGISTRY.get(day, step)
+
+
+# Timings statistics
+@dataclass
+class Timings:
+    values: List[float] = field(default_factory=list)
+
+    @property
+    def min_(self) -> float:
+        return min(self.values)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.values)
+
+    @property
+    def p95(self) -> float:
+        # Nearest-rank percentile
+        return sorted(self.values)[math.ceil(0.95 * len(self.values)) - 1]
+
+    def __str__(self) -> str:
+        if len(self.values) == 1:
+            return f"{self.values[0] * 1000:.3f}ms"
+        return f"min={self.min_ * 1000:.3f}ms median={self.median * 1000:.3f}ms p95={self.p95 * 1000:.3f}ms"
+
+
+# Run results
+@dataclass
+class RunResult:
+    solution: Union[int, str, List[str]] = None
+    parse: Timings = field(default_factory=Timings)
+    solve: Timings = field(default_factory=Timings)
+    instrumentation: Instrumentation = None  # Instrumentation of the last run
+
+
+# Build and solve a puzzle, as many times as required
+def run_puzzle(puzzle_class: Type[AOCPuzzle], input_file: Path, solve_arg=None, repeat: int = 1, state_cache: StateCache = None) -> RunResult:
+    out = RunResult()
+    for _ in range(repeat):
+        # Construction (including parsing, or restored from cache)
+        start = time.perf_counter()
+        p = puzzle_class(input_file) if state_cache is None else state_cache.load(puzzle_class, input_file)
+        out.parse.values.append(time.perf_counter() - start)
+
+        # Solve
+        start = time.perf_counter()
+        out.solution = p.solve() if solve_arg is None else p.solve(solve_arg)
+        out.solve.values.append(time.perf_counter() - start)
+        out.instrumentation = p.instrumentation
+    return out
+
+
+# Solve argument from command line (single int, or tuple of ints)
+def to_solve_arg(values: List[int]) -> Union[int, tuple, None]:
+    if not values:
+        return None
+    return values[0] if len(values) == 1 else tuple(values)
+
+
+# State cache from command line
+def to_state_cache(options) -> Union[StateCache, None]:
+    return StateCache(options.state_cache, options.state_cache_size * 1024 * 1024) if options.state_cache else None
+
+
+# Answer cache from command line
+def to_answer_cache(options) -> Union[AnswerCache, None]:
+    return AnswerCache(options.answer_cache, options.answer_cache_ttl * 3600) if options.answer_cache else None
+
+
+# Puzzle class options set for the time of a block, and restored on exit (so that they don't leak into later runs)
+@contextmanager
+def class_options(puzzle_class: Type[AOCPuzzle], **options) -> Iterator[Type[AOCPuzzle]]:
+    saved = {name: vars(puzzle_class)[name] for name in options if name in vars(puzzle_class)}
+    try:
+        for name, value in options.items():
+            setattr(puzzle_class, name, value)
+        yield puzzle_class
+    finally:
+        for name in options:
+            if name in saved:
+                setattr(puzzle_class, name, saved[name])
+            elif name in vars(puzzle_class):
+                delattr(puzzle_class, name)
+
+
+def run_command(options):
+    puzzle_class = find_puzzle(options.day, options.step)
+    class_opts = {"TRACE_MEMORY": options.trace_memory, "PARSE_WORKERS": options.parse_workers, "SOLVE_WORKERS": options.solve_workers}
+    if options.profile is not None:
+        class_opts["PROFILE_DIR"] = options.profile
+    with class_options(puzzle_class, **class_opts):
+        run_puzzle_command(puzzle_class, options)
+
+
+def run_puzzle_command(puzzle_class: Type[AOCPuzzle], options):
+    solve_arg = to_solve_arg(options.arg) if options.arg else SOLVE_ARGS.get((options.day, options.step))
+
+    # Already solved?
+    answer_cache = to_answer_cache(options)
+    if answer_cache is not None:
+        start = time.perf_counter()
+        found, solution = answer_cache.get(puzzle_class, options.input, solve_arg)
+        if found:
+            elapsed = time.perf_counter() - start
+            answer_cache.save_stats()
+            print(f"{puzzle_class.__name__}: {solution}")
+            print(f"cached answer: {elapsed * 1000:.3f}ms (hit rate: {answer_cache.stats()['hit_rate']:.1%})")
+            return
+
+    result = run_puzzle(puzzle_class, options.input, solve_arg, options.repeat, to_state_cache(options))
+    print(f"{puzzle_class.__name__}: {result.solution}")
+    print(f"parse: {result.parse}")
+    print(f"solve: {result.solve}")
+    if options.instrumentation:
+        print(result.instrumentation.as_json())
+    if answer_cache is not None:
+        answer_cache.put(puzzle_class, options.input, result.solution, solve_arg)
+        answer_cache.save_stats()
+
+
+# Print a simple table
+def print_table(headers: tuple, rows: List[tuple], file=None):
+    widths = [max(len(str(v)) for v in [h] + [r[i] for r in rows]) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)).rstrip(), file=file)
+    print("  ".join("-" * w for w in widths), file=file)
+    for r in rows:
+        print("  ".join(str(v).ljust(w) for v, w in zip(r, widths)).rstrip(), file=file)
+
+
+def solve_all_command(options):
+    from aoc2023.orchestrator import TimingsHistory, list_jobs, solve_all
+
+    jobs = list_jobs(options.inputs, options.day, options.pattern)
+    result = solve_all(jobs, options.workers, TimingsHistory(options.history), to_state_cache(options))
+    print_table(("day", "step", "solution", "parse (s)", "solve (s)", "latency (s)"), result.as_table())
+    print(f"wall time: {result.wall_time:.3f}s (total latency: {result.total_latency:.3f}s)")
+
+
+def batch_command(options):
+    from aoc2023.batch import solve_batch
+
+    solve_arg = to_solve_arg(options.arg) if options.arg else SOLVE_ARGS.get((options.day, options.step))
+    result = solve_batch(find_puzzle(options.day, options.step), options.inputs, solve_arg)
+    for input_file, solution in zip(options.inputs, result.solutions):
+        print(f"{input_file}: {solution}")
+    print(f"{result.inputs} inputs in {result.wall_time:.3f}s ({result.inputs_per_s:.1f} inputs/s, {result.mb_per_s:.2f} MB/s)")
+    if options.metrics:
+        print(result.metrics_json())
+
+
+def serve_command(options):
+    from aoc2023.daemon import DEFAULT_MEMORY_CACHE_SIZE, DEFAULT_SOCKET, SolverDaemon
+
+    memory_cache_size = options.memory_cache_size * 1024 * 1024 if options.memory_cache_size is not None else DEFAULT_MEMORY_CACHE_SIZE
+    SolverDaemon(options.socket or DEFAULT_SOCKET, options.workers, memory_cache_size).serve_forever()
+
+
+def query_command(options):
+    from aoc2023.daemon import DEFAULT_SOCKET, DaemonClient
+
+    with DaemonClient(options.socket or DEFAULT_SOCKET) as client:
+        if options.stop:
+            client.shutdown()
+            return
+        assert options.day is not None and options.step is not None and options.input is not None, "Day, step and input are required to solve a puzzle"
+        result = client.solve(options.day, options.step, options.input.read_bytes(), to_solve_arg(options.arg))
+    assert "error" not in result, result.get("error")
+    print(f"D{options.day:02}Step{options.step}Puzzle: {result['solution']}")
+    print(f"parse: {result['parse_time'] * 1000:.3f}ms{' (cached)' if result['cached'] else ''}")
+    print(f"solve: {result['solve_time'] * 1000:.3f}ms")
+    print(f"latency: {result['latency'] * 1000:.3f}ms")
+
+
+def tokenize_command(options):
+    from aoc2023.sidecar import convert
+
+    puzzle_class = find_puzzle(options.day, 1)
+    for input_file in options.inputs:
+        sidecar = convert(puzzle_class, input_file)
+        print(f"{input_file} ({input_file.stat().st_size // 1024}kB) --> {sidecar} ({sidecar.stat().st_size // 1024}kB)")
+
+
+def invalidate_command(options):
+    cache = AnswerCache(options.answer_cache) if options.answers else StateCache(options.state_cache)
+    if options.day is None:
+        assert options.step is None, "Step can't be specified without a day"
+        cache.invalidate(None, options.input)
+        return
+
+    # Specified step, or all steps of the day
+    steps = (options.step,) if options.step is not None else [step for day, step in REGISTRY if day == options.day]
+    assert steps, f"Unknown day: {options.day}"
+    for puzzle_class in {find_puzzle(options.day, step) for step in steps}:
+        cache.invalidate(puzzle_class, options.input)
+
+
+def list_command(options):
+    print_table(("day", "step", "class"), [(day, step, REGISTRY.class_path(day, step)) for day, step in REGISTRY])
+
+
+# Add state cache options to a command parser
+def add_state_cache_options(parser: ArgumentParser, enabled: bool = False):
+    if enabled:
+        parser.add_argument("--state-cache", type=Path, default=DEFAULT_CACHE_DIR, help="parsed state cache folder (default: %(default)s)")
+    else:
+        parser.add_argument(
+            "--state-cache",
+            type=Path,
+            nargs="?",
+            const=DEFAULT_CACHE_DIR,
+            help=f"use a cache of parsed state, in specified folder (default: {DEFAULT_CACHE_DIR})",
+        )
+        parser.add_argument(
+            "--state-cache-size", type=int, default=DEFAULT_MAX_SIZE // (1024 * 1024), help="parsed state cache max size, in MB (default: %(default)s)"
+        )
+
+
+def main(args=None):
+    parser = ArgumentParser(prog="aoc2023", description="Advent of Code 2023 solutions")
+    sub_parsers = parser.add_subparsers(dest="command", required=True)
+
+    # Run command
+    run_parser = sub_parsers.add_parser("run", help="solve a puzzle")
+    run_parser.add_argument("--day", type=int, required=True, help="puzzle day")
+    run_parser.add_argument("--step", type=int, choices=(1, 2), required=True, help="puzzle step")
+    run_parser.add_argument("--arg", type=int, action="append", help="solve argument, may be repeated (default for days 11, 21 and 24: puzzle value)")
+    run_parser.add_argument("--repeat", type=int, default=1, help="number of runs, to get min/median/p95 timings")
+    run_parser.add_argument("--instrumentation", action="store_true", help="print puzzle instrumentation (json) for the last run")
+    run_parser.add_argument("--trace-memory", action="store_true", help="trace memory peak while parsing and solving (slower)")
+    run_parser.add_argument(
+        "--parse-workers", type=int, default=1, help="number of processes for chunked parsing, for days supporting it (default: %(default)s, i.e. no chunks)"
+    )
+    run_parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_PROFILE_DIR,
+        help=f"profile parsing and solving, with pstats and collapsed stacks files written in specified folder (default: {DEFAULT_PROFILE_DIR}; "
+        f"also enabled by {PROFILE_ENV} environment variable)",
+    )
+    run_parser.add_argument("--solve-workers", type=int, default=1, help="number of processes for solving, for days supporting it (default: %(default)s)")
+    add_state_cache_options(run_parser)
+    run_parser.add_argument(
+        "--answer-cache",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_ANSWER_CACHE_DIR,
+        help=f"use a cache of answers, in specified folder (default: {DEFAULT_ANSWER_CACHE_DIR}; only used by this command, not by solve-all, batch or serve)",
+    )
+    run_parser.add_argument("--answer-cache-ttl", type=float, default=DEFAULT_TTL / 3600, help="cached answers time to live, in hours (default: %(default)s)")
+    run_parser.add_argument("input", type=Path, help="puzzle input file")
+    run_parser.set_defaults(handler=run_command)
+
+    # Solve all command
+    all_parser = sub_parsers.add_parser("solve-all", help="solve all puzzles of an inputs folder, in a pool of processes")
+    all_parser.add_argument("--day", type=int, action="append", help="puzzle day, may be repeated (default: all days)")
+    all_parser.add_argument("--workers", type=int, help="number of worker processes (default: CPU count)")
+    all_parser.add_argument("--history", type=Path, help="json file for historical timings, used to schedule longest jobs first")
+    all_parser.add_argument("--pattern", default="d{day:02}.input.txt", help="input file name pattern in the folder (default: %(default)s)")
+    add_state_cache_options(all_parser)
+    all_parser.add_argument("inputs", type=Path, help="inputs folder")
+    all_parser.set_defaults(handler=solve_all_command)
+
+    # Batch command
+    batch_parser = sub_parsers.add_parser("batch", help="solve many inputs of a same puzzle")
+    batch_parser.add_argument("--day", type=int, required=True, help="puzzle day")
+    batch_parser.add_argument("--step", type=int, choices=(1, 2), required=True, help="puzzle step")
+    batch_parser.add_argument("--arg", type=int, action="append", help="solve argument, may be repeated (default for days 11, 21 and 24: puzzle value)")
+    batch_parser.add_argument("--metrics", action="store_true", help="print batch metrics (json)")
+    batch_parser.add_argument("inputs", type=Path, nargs="+", help="puzzle input files")
+    batch_parser.set_defaults(handler=batch_command)
+
+    # Daemon commands
+    serve_parser = sub_parsers.add_parser("serve", help="start a warm solver daemon, listening on a local socket")
+    serve_parser.add_argument("--socket", type=Path, help="daemon socket path (default: ~/.cache/aoc2023/daemon.sock)")
+    serve_parser.add_argument("--workers", type=int, help="number of worker processes (default: CPU count)")
+    serve_parser.add_argument("--memory-cache-size", type=int, help="parsed state memory cache size per worker, in MB (default: 256)")
+    serve_parser.set_defaults(handler=serve_command)
+    query_parser = sub_parsers.add_parser("query", help="solve a puzzle with the solver daemon")
+    query_parser.add_argument("--socket", type=Path, help="daemon socket path (default: ~/.cache/aoc2023/daemon.sock)")
+    query_parser.add_argument("--stop", action="store_true", help="stop the daemon")
+    query_parser.add_argument("--day", type=int, help="puzzle day")
+    query_parser.add_argument("--step", type=int, choices=(1, 2), help="puzzle step")
+    query_parser.add_argument("--arg", type=int, action="append", help="solve argument, may be repeated (default for days 11, 21 and 24: puzzle value)")
+    query_parser.add_argument("input", type=Path, nargs="?", help="puzzle input file")
+    query_parser.set_defaults(handler=query_command)
+
+    # Tokenize command
+    tokenize_parser = sub_parsers.add_parser(
+        "tokenize", help="convert input files to pre-tokenized binary sidecar files, loaded instead of input files while they're up to date"
+    )
+    tokenize_parser.add_argument("--day", type=int, required=True, help="puzzle day")
+    tokenize_parser.add_argument("inputs", type=Path, nargs="+", help="puzzle input files")
+    tokenize_parser.set_defaults(handler=tokenize_command)
+
+    # Invalidate command
+    invalidate_parser = sub_parsers.add_parser(
+        "invalidate", help="invalidate parsed state (or answer) cache entries (all of them if no day/input is specified)"
+    )
+    invalidate_parser.add_argument("--day", type=int, help="puzzle day")
+    invalidate_parser.add_argument("--step", type=int, choices=(1, 2), help="puzzle step (default: all steps of the day)")
+    add_state_cache_options(invalidate_parser, enabled=True)
+    invalidate_parser.add_argument("--answers", action="store_true", help="invalidate cached answers instead of parsed states")
+    invalidate_parser.add_argument("--answer-cache", type=Path, default=DEFAULT_ANSWER_CACHE_DIR, help="answer cache folder (default: %(default)s)")
+    invalidate_parser.add_argument("input", type=Path, nargs="?", help="puzzle input file")
+    invalidate_parser.set_defaults(handler=invalidate_command)
+
+    # List command
+    list_parser = sub_parsers.add_parser("list", help="list registered puzzles")
+    list_parser.set_defaults(handler=list_command)
+
+    options = parser.parse_args(args)
+    options.handler(options)
@@ -0,0 +1,112 @@
+import heapq
+from array import array
+from typing import Callable, Iterable, List, Tuple, Union
+
+"""
+Graph searches over integer-encoded states (0 <= state < states count)
+
+Distances and closed states are stored in flat arrays indexed by state, instead of dicts of tuples:
+- bfs: breadth-first search, level by level (distances in steps)
+- dijkstra: shortest path with a bucket queue (one bucket per cost; edges costs are small non-negative integers)
+- astar: shortest path with a heap of integer keys (f * states count + state), guided by a consistent heuristic
+"""
+
+# Distance of unreached states
+UNREACHED = -1
+
+# Neighbours of a state (unweighted graphs)
+Neighbours = Callable[[int], Iterable[int]]
+
+# Edges of a state, with their costs (weighted graphs)
+Edges = Callable[[int], Iterable[Tuple[int, int]]]
+
+
+class Search:
+    def __init__(self, states_count: int):
+        self.states_count = states_count
+        self.distances = array("q", [UNREACHED]) * states_count
+        self.closed = bytearray(states_count)
+
+        # Number of expanded states, and number of states at each depth (for BFS)
+        self.expansions = 0
+        self.levels: List[int] = []
+
+    def bfs(self, starts: Iterable[int], neighbours: Neighbours, max_depth: int = None) -> array:
+        # Visit states level by level, until max depth (if any)
+        distances = self.distances
+        frontier = []
+        for state in starts:
+            distances[state] = 0
+            frontier.append(state)
+        self.levels.append(len(frontier))
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for state in frontier:
+                for n in neighbours(state):
+                    if distances[n] == UNREACHED:
+                        distances[n] = depth
+                        next_frontier.append(n)
+            self.expansions += len(frontier)
+            if next_frontier:
+                self.levels.append(len(next_frontier))
+            frontier = next_frontier
+        return distances
+
+    def dijkstra(self, starts: Iterable[int], edges: Edges, goal: Callable[[int], bool]) -> Union[int, None]:
+        # Pop states by increasing cost, from buckets (returns cost of first goal state, if any reachable)
+        distances, closed = self.distances, self.closed
+        buckets: List[List[int]] = [[]]
+        for state in starts:
+            distances[state] = 0
+            buckets[0].append(state)
+        cost = 0
+        pending = len(buckets[0])
+        while pending:
+            bucket = buckets[cost]
+            while bucket:
+                state = bucket.pop()
+                pending -= 1
+                if closed[state]:
+                    # Already expanded with a lower cost
+                    continue
+                closed[state] = 1
+                self.expansions += 1
+                if goal(state):
+                    return cost
+                for n, edge_cost in edges(state):
+                    new_cost = cost + edge_cost
+                    if distances[n] == UNREACHED or new_cost < distances[n]:
+                        distances[n] = new_cost
+                        while len(buckets) <= new_cost:
+                            buckets.append([])
+                        buckets[new_cost].append(n)
+                        pending += 1
+            cost += 1
+        return None
+
+    def astar(self, starts: Iterable[int], edges: Edges, goal: Callable[[int], bool], heuristic: Callable[[int], int]) -> Union[int, None]:
+        # Pop states by increasing estimated total cost (returns cost of first goal state, if any reachable)
+        distances, closed, count = self.distances, self.closed, self.states_count
+        heap = []
+        for state in starts:
+            distances[state] = 0
+            heap.append(heuristic(state) * count + state)
+        heapq.heapify(heap)
+        while heap:
+            state = heapq.heappop(heap) % count
+            if closed[state]:
+                # Already expanded with a lower cost
+                continue
+            closed[state] = 1
+            self.expansions += 1
+            cost = distances[state]
+            if goal(state):
+                return cost
+            for n, edge_cost in edges(state):
+                new_cost = cost + edge_cost
+                if distances[n] == UNREACHED or new_cost < distances[n]:
+                    distances[n] = new_cost
+                    heapq.heappush(heap, (new_cost + heuristic(n)) * count + n)
+        return None
@@ -0,0 +1,94 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Dict, Iterator, Tuple, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+"""
+Zero-copy hand-off of immutable arrays (e.g. grid cells) to worker processes
+
+The owner process copies the arrays once in a shared memory block, and sends workers a small picklable handle (block name and arrays
+layout) instead of the arrays themselves. Workers attach to the block for the time of a task, and get read-only numpy views on it:
+views must not outlive the attach block, which closes the worker mapping on exit. The owner unlinks the block when closed.
+"""
+
+# Arrays alignment in the shared block
+ALIGNMENT = 64
+
+# Layout of an array in the shared block: name, dtype, shape, and offset
+ArrayLayout = Tuple[str, str, Tuple[int, ...], int]
+
+
+# Array view on a shared block (holding an export of the block buffer: closing the block fails while the view is alive, instead of
+# leaving it on unmapped memory)
+def view_of(shm: SharedMemory, dtype: str, shape: Tuple[int, ...], offset: int) -> "np.ndarray":
+    # Lazy import (heavy dependency)
+    import numpy as np
+
+    dtype = np.dtype(dtype)
+    count = int(np.prod(shape, dtype=np.int64))
+    return np.frombuffer(shm.buf, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+
+# Picklable reference to arrays in a shared memory block
+@dataclass(frozen=True)
+class SharedArraysHandle:
+    name: str
+    layout: Tuple[ArrayLayout, ...]
+
+    @contextmanager
+    def attach(self) -> Iterator[Dict[str, "np.ndarray"]]:
+        shm = SharedMemory(name=self.name)
+        views = {}
+        try:
+            for name, dtype, shape, offset in self.layout:
+                views[name] = view_of(shm, dtype, shape, offset)
+                views[name].flags.writeable = False
+            yield views
+        finally:
+            # Release views before closing the mapping
+            views.clear()
+            try:
+                shm.close()
+            except BufferError:
+                raise BufferError(f"Views on shared arrays {self.name} are still alive after detach") from None
+
+
+# Owner side of shared arrays: block is created on construction, and freed on close (or on context exit)
+class SharedArrays:
+    def __init__(self, arrays: Dict[str, Union["np.ndarray", bytes, bytearray]]):
+        # Lazy import (heavy dependency)
+        import numpy as np
+
+        # Buffers are shared as uint8 arrays
+        arrays = {name: np.ascontiguousarray(a if isinstance(a, np.ndarray) else np.frombuffer(a, dtype=np.uint8)) for name, a in arrays.items()}
+
+        # Aligned layout
+        layout, size = [], 0
+        for name, a in arrays.items():
+            offset = -(-size // ALIGNMENT) * ALIGNMENT
+            layout.append((name, a.dtype.str, a.shape, offset))
+            size = offset + a.nbytes
+
+        # Copy arrays once in the shared block
+        self.shm = SharedMemory(create=True, size=max(size, 1))
+        try:
+            for (_name, dtype, shape, offset), a in zip(layout, arrays.values()):
+                view_of(self.shm, dtype, shape, offset)[...] = a
+        except BaseException:
+            # Don't leak the block
+            self.close()
+            raise
+        self.handle = SharedArraysHandle(self.shm.name, tuple(layout))
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,121 @@
+import json
+import logging
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Tuple, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+"""
+Pre-tokenized binary inputs ("sidecar" files), to skip text parsing on repeated runs
+
+A sidecar file is stored next to the input file (same name + ".tokens" extension), and is only used while it is newer than the input file.
+Layout:
+* magic bytes (b"AOCT") + json header size (uint32, little endian)
+* json header: {"format": "d22.v1", "lines": 1234, "meta": {...}, "arrays": {"name": {"dtype": "<i8", "shape": [1234, 6], "offset": 0}, ...}}
+* arrays raw data (C order), each one aligned on 64 bytes (offsets are relative to the first aligned position after the header)
+
+Arrays are loaded with numpy.frombuffer() over a memory-mapped file (no copy until the puzzle builds its own state from them).
+"""
+
+# Sidecar files extension
+SIDECAR_EXT = ".tokens"
+
+# File magic bytes
+MAGIC = b"AOCT"
+
+# Prefix: magic + header size
+PREFIX = struct.Struct("<4sI")
+
+# Arrays alignment
+ALIGNMENT = 64
+
+# Tokenized input: named arrays, and json-serializable metadata
+Tokens = Tuple[Dict[str, "np.ndarray"], dict]
+
+
+# Size rounded up to alignment
+def aligned(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+# Sidecar path for an input file
+def sidecar_path(input_file: Path) -> Path:
+    return input_file.with_name(input_file.name + SIDECAR_EXT)
+
+
+# Check if a sidecar can be used for an input file
+def is_fresh(input_file: Path, sidecar: Path) -> bool:
+    return sidecar.is_file() and input_file.is_file() and sidecar.stat().st_mtime_ns >= input_file.stat().st_mtime_ns
+
+
+# Write a sidecar file
+def write_sidecar(sidecar: Path, fmt: str, tokens: Tokens, lines: int):
+    arrays, meta = tokens
+    header = {"format": fmt, "lines": lines, "meta": meta, "arrays": {}}
+
+    # Arrays offsets are relative to the data start (i.e. first aligned position after header)
+    offset = 0
+    for name, a in arrays.items():
+        header["arrays"][name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+        offset += aligned(a.nbytes)
+    header_bytes = json.dumps(header).encode()
+    data_start = aligned(PREFIX.size + len(header_bytes))
+
+    # Write in a temporary file first, so that a partial sidecar is never used
+    tmp_sidecar = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+    with tmp_sidecar.open("wb") as f:
+        f.write(PREFIX.pack(MAGIC, len(header_bytes)) + header_bytes)
+        for name, a in arrays.items():
+            f.seek(data_start + header["arrays"][name]["offset"])
+            f.write(a.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_sidecar, sidecar)
+
+
+# Read a sidecar file (None if it doesn't match the expected format, or if it is damaged)
+def read_sidecar(sidecar: Path, fmt: str) -> Union[Tuple[Tokens, int], None]:
+    # Lazy import (heavy dependency)
+    import numpy as np
+
+    m = None
+    arrays = {}
+    try:
+        with sidecar.open("rb") as f:
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_size = PREFIX.unpack_from(m)
+        if magic != MAGIC:
+            raise ValueError(f"unexpected magic bytes: {magic}")
+        header = json.loads(m[PREFIX.size : PREFIX.size + header_size])
+        if header["format"] != fmt:
+            logging.warning(f"Ignoring sidecar file with another format ({header['format']}; expected: {fmt}): {sidecar}")
+            m.close()
+            return None
+        data_start = aligned(PREFIX.size + header_size)
+
+        # Arrays are views on the mapped file (which stays mapped as long as they are referenced)
+        for name, desc in header["arrays"].items():
+            dtype = np.dtype(desc["dtype"])
+            count = int(np.prod(desc["shape"], dtype=np.int64))
+            arrays[name] = np.frombuffer(m, dtype=dtype, count=count, offset=data_start + desc["offset"]).reshape(desc["shape"])
+        return (arrays, header["meta"]), header["lines"]
+    except (OSError, ValueError, TypeError, KeyError, AttributeError, struct.error) as e:
+        # Damaged file (empty, truncated, invalid header...): release views before unmapping it
+        logging.warning(f"Ignoring invalid sidecar file {sidecar}: {e}")
+        arrays.clear()
+        if m is not None:
+            m.close()
+        return None
+
+
+# Convert an input file to a sidecar file, for a given puzzle class
+def convert(puzzle_class: type, input_file: Path) -> Path:
+    assert puzzle_class.SIDECAR_FORMAT is not None, f"{puzzle_class.__name__} doesn't support pre-tokenized inputs"
+    assert input_file.is_file(), f"File not found: {input_file}"
+    data = input_file.read_bytes()
+    sidecar = sidecar_path(input_file)
+    write_sidecar(sidecar, puzzle_class.SIDECAR_FORMAT, puzzle_class.tokenize(data), len(data.splitlines()))
+    return sidecar
@@ -0,0 +1,188 @@
+import hashlib
+import logging
+import os
+import pickle
+import sys
+from pathlib import Path
+from types import FunctionType, ModuleType
+from typing import Dict, List, Set, Type
+
+from aoc2023.instrumentation import Instrumentation
+from aoc2023.puzzle import BUFFER_TYPES, AOCPuzzle, PuzzleInput
+
+"""
+Content-addressed cache of parsed puzzles state
+
+Puzzle state (instance attributes after construction) is pickled in a local folder, keyed by:
+* the puzzle class
+* the input file content hash
+* the sources hash of the puzzle module and of the aoc2023 modules it (transitively) imports (so that code changes, including in
+  shared modules, don't restore a stale state)
+
+Sources hashes are computed once per class and process: they describe the code actually loaded, even if files change afterwards.
+"""
+
+# Default cache folder
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "aoc2023" / "state"
+
+# Default cache size (bytes)
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# Cache entries extension
+ENTRY_EXT = ".pickle"
+
+
+# Hash of a file content
+def file_digest(input_file: Path) -> str:
+    h = hashlib.sha256()
+    with input_file.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# Hash of a puzzle input content (file, or in-memory buffer)
+def input_digest(input_file: PuzzleInput) -> str:
+    if isinstance(input_file, Path):
+        return file_digest(input_file)
+    assert isinstance(input_file, BUFFER_TYPES), f"Can't hash puzzle input of type {type(input_file).__name__}"
+    return hashlib.sha256(input_file).hexdigest()
+
+
+# Package name (dependencies of puzzle modules are looked for in it)
+PACKAGE = __name__.split(".")[0]
+
+# Sources hashes, by class
+CLASS_DIGESTS: Dict[type, str] = {}
+
+
+# Package modules a module depends on (transitively), including itself: modules, classes and functions of its globals
+# (lazy imports in functions are not seen)
+def module_dependencies(module_name: str) -> Set[str]:
+    out, todo = set(), [module_name]
+    while todo:
+        name = todo.pop()
+        if name in out:
+            continue
+        out.add(name)
+        for value in vars(sys.modules[name]).values():
+            if isinstance(value, ModuleType):
+                dep = value.__name__
+            elif isinstance(value, (type, FunctionType)):
+                dep = value.__module__
+            else:
+                continue
+            if isinstance(dep, str) and dep.split(".")[0] == PACKAGE and dep in sys.modules:
+                todo.append(dep)
+    return out
+
+
+# Hash of the sources a class depends on: its own module (which may be out of the package, for registered puzzles), and the package
+# modules it imports (computed once per class)
+def class_source_digest(puzzle_class: type) -> str:
+    digest = CLASS_DIGESTS.get(puzzle_class)
+    if digest is None:
+        h = hashlib.sha256()
+        for name in sorted(module_dependencies(puzzle_class.__module__)):
+            h.update(f"{name}:{file_digest(Path(sys.modules[name].__file__))}\n".encode())
+        digest = CLASS_DIGESTS[puzzle_class] = h.hexdigest()[:16]
+    return digest
+
+
+# Class full name, used as prefix of cache entries
+def class_name(puzzle_class: type) -> str:
+    return f"{puzzle_class.__module__}.{puzzle_class.__qualname__}"
+
+
+# Instance attributes which are not part of a parsed state: the input itself (states are keyed by its hash), and run-time helpers
+TRANSIENT_ATTRIBUTES = ("input_file", "instrumentation", "_profile_dir", "_input_digest")
+
+
+# Parsed state of a puzzle, to be pickled (input lines are only kept for puzzles which need them)
+def state_of(p: AOCPuzzle) -> dict:
+    state = {name: value for name, value in p.__dict__.items() if name not in TRANSIENT_ATTRIBUTES}
+    if not p.KEEP_INPUT_LINES:
+        state.pop("input_lines", None)
+    return state
+
+
+# Build a puzzle from a parsed state, without parsing
+def restore_state(puzzle_class: Type[AOCPuzzle], state: dict, input_file: PuzzleInput = None) -> AOCPuzzle:
+    p = puzzle_class.__new__(puzzle_class)
+    p.__dict__.update(state)
+    p.input_file = input_file
+    p.__dict__.setdefault("input_lines", [])
+    p.instrumentation = Instrumentation()
+    p.init_profiling()
+    return p
+
+
+class StateCache:
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    def entry_path(self, puzzle_class: Type[AOCPuzzle], input_file: Path) -> Path:
+        return self.cache_dir / f"{class_name(puzzle_class)}-{input_digest(input_file)}-{class_source_digest(puzzle_class)}{ENTRY_EXT}"
+
+    @property
+    def entries(self) -> List[Path]:
+        return list(self.cache_dir.glob(f"*{ENTRY_EXT}")) if self.cache_dir.is_dir() else []
+
+    @property
+    def size(self) -> int:
+        return sum(p.stat().st_size for p in self.entries)
+
+    def load(self, puzzle_class: Type[AOCPuzzle], input_file: Path) -> AOCPuzzle:
+        # Check file existence
+        assert input_file.is_file(), f"File not found: {input_file}"
+
+        # Already in cache?
+        entry = self.entry_path(puzzle_class, input_file)
+        if entry.is_file():
+            try:
+                with entry.open("rb") as f:
+                    state = pickle.load(f)
+            except Exception as e:
+                # Corrupted entry: forget it
+                logging.warning(f"Can't restore cached state from {entry}: {e}")
+                entry.unlink(missing_ok=True)
+            else:
+                # Restore state without parsing
+                logging.info(f"Restored cached state from {entry}")
+                os.utime(entry)
+                return restore_state(puzzle_class, state, input_file)
+
+        # Parse, and store state
+        p = puzzle_class(input_file)
+        self.store(entry, p)
+        return p
+
+    def store(self, entry: Path, p: AOCPuzzle):
+        # Write in a temporary file first, as concurrent processes may share the cache
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_entry = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        with tmp_entry.open("wb") as f:
+            pickle.dump(state_of(p), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_entry, entry)
+        logging.info(f"Stored state in {entry}")
+        self.evict()
+
+    def evict(self):
+        # Remove least recently used entries until the cache size fits
+        entries = sorted(((p, p.stat()) for p in self.entries), key=lambda t: t[1].st_mtime)
+        total_size = sum(s.st_size for _, s in entries)
+        for entry, stat in entries:
+            if total_size <= self.max_size:
+                break
+            logging.info(f"Evicting cached state {entry}")
+            entry.unlink(missing_ok=True)
+            total_size -= stat.st_size
+
+    def invalidate(self, puzzle_class: Type[AOCPuzzle] = None, input_file: Path = None):
+        # Remove all entries matching the class and/or input file (or all entries if none is specified)
+        prefix = f"{class_name(puzzle_class)}-" if puzzle_class is not None else ""
+        digest = f"-{input_digest(input_file)}-" if input_file is not None else ""
+        for entry in filter(lambda p: p.name.startswith(prefix) and digest in p.name, self.entries):
+            logging.info(f"Invalidating cached state {entry}")
+            entry.unlink(missing_ok=True)
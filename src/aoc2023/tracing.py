@@ -0,0 +1,42 @@
+import logging
+from typing import Callable
+
+"""
+Tracing facility for puzzles
+
+Traces are emitted at INFO level on the "aoc2023" logger, and cost (nearly) nothing when this level is disabled:
+- trace() arguments are only formatted (%-style) when the trace is actually emitted
+- arguments that are expensive to compute can be wrapped in a Lazy object, only evaluated when formatted
+- tracing() can be checked once to skip a whole block of tracing code
+"""
+
+# Logger for all puzzles traces
+LOGGER = logging.getLogger("aoc2023")
+
+# Level for traces
+TRACE_LEVEL = logging.INFO
+
+
+# Are traces enabled?
+def tracing() -> bool:
+    return LOGGER.isEnabledFor(TRACE_LEVEL)
+
+
+# Emit a trace (message is only formatted with args if traces are enabled)
+def trace(msg: str, *args):
+    if LOGGER.isEnabledFor(TRACE_LEVEL):
+        LOGGER.log(TRACE_LEVEL, msg, *args, stacklevel=2)
+
+
+# Trace argument, only evaluated when formatted
+class Lazy:
+    __slots__ = ("function",)
+
+    def __init__(self, function: Callable[[], object]):
+        self.function = function
+
+    def __str__(self) -> str:
+        return str(self.function())
+
+    def __repr__(self) -> str:
+        return repr(self.function())
@@ -0,0 +1,57 @@
+import random
+import time
+from argparse import ArgumentParser
+from typing import List
+
+from aoc2023.batch import solve_batch
+from aoc2023.registry import REGISTRY
+from aoc2023.runner import SOLVE_ARGS, print_table
+from benchmarks.generators import GENERATORS
+
+"""
+Batch API throughput: many synthetic inputs of a same puzzle, solved one by one vs. in a batch
+
+Usage: python -m benchmarks.bench_batch [--day N]... [--count N] [--scale N]
+"""
+
+# Days with a batch-specific solve implementation
+DEFAULT_DAYS = (9,)
+
+
+# Different synthetic inputs for a day
+def batch_inputs(day: int, count: int, scale: int) -> List[bytes]:
+    return [GENERATORS[day](random.Random(day * 1_000_000 + scale * 1_000 + i), scale).encode() for i in range(count)]
+
+
+# Measure both modes for a puzzle
+def measure(day: int, step: int, inputs: List[bytes]) -> tuple:
+    puzzle_class = REGISTRY.get(day, step)
+    solve_arg = SOLVE_ARGS.get((day, step))
+
+    # One by one
+    start = time.perf_counter()
+    single = [puzzle_class(i).solve() if solve_arg is None else puzzle_class(i).solve(solve_arg) for i in inputs]
+    single_time = time.perf_counter() - start
+
+    # Batch
+    result = solve_batch(puzzle_class, inputs, solve_arg)
+    assert result.solutions == single, "Batch solutions differ from single ones"
+    return (day, step, len(inputs), f"{len(inputs) / single_time:.1f}", f"{result.inputs_per_s:.1f}", f"{single_time / result.wall_time:.2f}")
+
+
+def main(args=None):
+    parser = ArgumentParser(description="Batch API throughput benchmark")
+    parser.add_argument("--day", type=int, action="append", help=f"day(s) to measure (default: {', '.join(map(str, DEFAULT_DAYS))})")
+    parser.add_argument("--count", type=int, default=200, help="number of inputs (default: %(default)s)")
+    parser.add_argument("--scale", type=int, default=1, help="inputs scale (default: %(default)s)")
+    options = parser.parse_args(args)
+
+    rows = []
+    for day in options.day or DEFAULT_DAYS:
+        inputs = batch_inputs(day, options.count, options.scale)
+        rows.extend(measure(day, step, inputs) for step in (1, 2) if (day, step) in REGISTRY)
+    print_table(("day", "step", "inputs", "single (inputs/s)", "batch (inputs/s)", "speedup"), rows)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
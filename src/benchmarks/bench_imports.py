@@ -0,0 +1,82 @@
+import subprocess
+import sys
+from argparse import ArgumentParser
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from aoc2023.runner import print_table
+from benchmarks.common import SOURCES_ROOT
+
+"""
+Import time of all day modules
+
+Each module is imported in a fresh interpreter with "-X importtime", and the report is parsed to get:
+- the cumulative import time of the module (best of several runs)
+- the heavy third-party packages that got imported along with it (should be none: they're lazily imported by solvers)
+
+Usage: python -m benchmarks.bench_imports [--day N]... [--repeat N]
+"""
+
+# Third-party packages known to be slow to import
+HEAVY_PACKAGES = ("numpy", "z3", "networkx")
+
+
+# Parsed import time report for one module
+@dataclass
+class ImportReport:
+    module: str
+    self_us: int = 0
+    cumulative_us: int = 0
+    packages: Dict[str, int] = field(default_factory=dict)
+
+
+# Parse "-X importtime" output (stderr) for a given module
+def parse_importtime(module: str, report: str) -> ImportReport:
+    out = ImportReport(module)
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # Header line
+            continue
+        name = name.strip()
+        if name == module:
+            out.self_us, out.cumulative_us = int(self_us), int(cumulative_us)
+        elif name in HEAVY_PACKAGES and name not in out.packages:
+            # Heavy package import (remember the outermost one)
+            out.packages[name] = int(cumulative_us)
+    return out
+
+
+# Import module in a fresh interpreter, and parse report
+def measure(module: str) -> ImportReport:
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=SOURCES_ROOT, check=True, capture_output=True, text=True)
+    return parse_importtime(module, p.stderr)
+
+
+# Best of several measures, for all required days
+def run_bench(days: List[int], repeat: int) -> List[ImportReport]:
+    out = []
+    for day in days:
+        module = f"aoc2023.day{day:02}"
+        out.append(min((measure(module) for _ in range(repeat)), key=lambda r: r.cumulative_us))
+    return out
+
+
+def main(args=None):
+    parser = ArgumentParser(description="Import time of all day modules")
+    parser.add_argument("--day", type=int, action="append", help="day(s) to measure (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of imports for each module; best one is reported (default: %(default)s)")
+    options = parser.parse_args(args)
+
+    reports = run_bench(options.day or range(1, 26), options.repeat)
+    rows = [
+        (r.module, f"{r.self_us / 1000:.2f}", f"{r.cumulative_us / 1000:.2f}", ", ".join(f"{k} ({v / 1000:.1f}ms)" for k, v in r.packages.items()) or "-")
+        for r in reports
+    ]
+    print_table(("module", "self (ms)", "cumulative (ms)", "heavy packages"), rows)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,113 @@
+import random
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import List, Union
+
+from aoc2023.runner import print_table
+from benchmarks.common import SOURCES_ROOT
+from benchmarks.generators import generate, unique_names
+
+"""
+Solve time of ranges splitting days (5 and 19), on large synthetic inputs: millions of seed ranges, and deep workflows trees
+
+Each measure runs in a dedicated interpreter; another sources tree can be measured as a baseline, e.g. to compare with a previous revision:
+  git worktree add /tmp/aoc2023-baseline <revision>
+  python -m benchmarks.bench_intervals --baseline /tmp/aoc2023-baseline/src
+
+Usage: python -m benchmarks.bench_intervals [--seeds N] [--depth N] [--parts N] [--repeat N] [--baseline DIR] [--output DIR]
+"""
+
+# Child process code: only relies on day modules, so that it can run on any sources tree revision
+CHILD = """
+import importlib, sys, time
+from pathlib import Path
+day, step, input_file, repeat = int(sys.argv[1]), int(sys.argv[2]), Path(sys.argv[3]), int(sys.argv[4])
+cls = getattr(importlib.import_module(f"aoc2023.day{day:02}"), f"D{day:02}Step{step}Puzzle")
+best = None
+for _ in range(repeat):
+    p = cls(input_file)
+    start = time.perf_counter()
+    p.solve()
+    elapsed = time.perf_counter() - start
+    best = elapsed if best is None else min(best, elapsed)
+print(best)
+"""
+
+
+# Day 5 input with many seed ranges (maps are the ones of a regular scaled input)
+def seeds_input(rng: random.Random, count: int) -> str:
+    seeds = []
+    for _ in range(count):
+        seeds.extend((rng.randint(0, 4_000_000_000), rng.randint(1, 10_000_000)))
+    maps = generate(5, 10).split("\n", 1)[1]
+    return f"seeds: {' '.join(map(str, seeds))}\n{maps}"
+
+
+# Day 19 input with a complete workflows tree of required depth (each workflow has 2 children), and many parts
+def workflows_input(rng: random.Random, depth: int, parts_count: int) -> str:
+    names = unique_names(rng, 2**depth, 5, reserved=("in",))
+    workflows = []
+    level = ["in"]
+    for d in range(depth):
+        children = []
+        for name in level:
+            targets = [names.pop(), names.pop()] if d < depth - 1 else [rng.choice("AR"), rng.choice("AR")]
+            rule = f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{targets[0]}"
+            workflows.append(f"{name}{{{rule},{targets[1]}}}")
+            children.extend(targets)
+        level = children
+    rng.shuffle(workflows)
+    parts = [f"{{x={rng.randint(1, 4000)},m={rng.randint(1, 4000)},a={rng.randint(1, 4000)},s={rng.randint(1, 4000)}}}" for _ in range(parts_count)]
+    return "\n".join(workflows) + "\n\n" + "\n".join(parts) + "\n"
+
+
+# Best solve time for a puzzle input, on a given sources tree
+def measure(sources: Path, day: int, step: int, input_file: Path, repeat: int) -> float:
+    p = subprocess.run(
+        [sys.executable, "-c", CHILD, str(day), str(step), str(input_file.absolute()), str(repeat)], cwd=sources, check=True, capture_output=True, text=True
+    )
+    return float(p.stdout)
+
+
+# Measure both steps of both days, on current sources tree (and baseline one if any)
+def run_bench(seeds: int, depth: int, parts: int, repeat: int, output: Path, baseline: Union[Path, None] = None) -> List[tuple]:
+    output.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seeds + depth + parts)
+    inputs = [
+        (5, f"{seeds} seed ranges", seeds_input(rng, seeds)),
+        (19, f"depth {depth}, {parts} parts", workflows_input(rng, depth, parts)),
+    ]
+    rows = []
+    for day, description, text in inputs:
+        input_file = output / f"d{day:02}.input.txt"
+        input_file.write_text(text)
+        for step in (1, 2):
+            current = measure(SOURCES_ROOT, day, step, input_file, repeat)
+            row = (day, step, description, f"{current * 1000:.2f}")
+            if baseline is not None:
+                before = measure(baseline, day, step, input_file, repeat)
+                row += (f"{before * 1000:.2f}", f"{before / current:.2f}" if current > 0 else "")
+            rows.append(row)
+    return rows
+
+
+def main(args=None):
+    parser = ArgumentParser(description="Solve time of ranges splitting days on large inputs")
+    parser.add_argument("--seeds", type=int, default=1_000_000, help="number of seed ranges for day 5 (default: %(default)s)")
+    parser.add_argument("--depth", type=int, default=12, help="workflows tree depth for day 19 (default: %(default)s)")
+    parser.add_argument("--parts", type=int, default=200_000, help="number of parts for day 19 (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of solves for each input; best one is reported (default: %(default)s)")
+    parser.add_argument("--baseline", type=Path, help="sources tree to be measured as a baseline (i.e. folder containing the aoc2023 package)")
+    parser.add_argument("--output", type=Path, default=Path("out") / "intervals", help="generated inputs folder (default: %(default)s)")
+    options = parser.parse_args(args)
+
+    headers = ("day", "step", "input", "solve (ms)")
+    if options.baseline is not None:
+        headers += ("baseline (ms)", "speedup")
+    print_table(headers, run_bench(options.seeds, options.depth, options.parts, options.repeat, options.output, options.baseline))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,65 @@
+import re
+import time
+from argparse import ArgumentParser
+from typing import Callable, List
+
+from aoc2023.ints import extract_ints
+from aoc2023.registry import REGISTRY
+from aoc2023.runner import print_table
+from benchmarks.generators import generate
+
+"""
+Integers extraction throughput (MB/s): per-token regex vs. vectorized scan, and full parsing of days using it, on synthetic inputs
+
+Usage: python -m benchmarks.bench_ints [--day N]... [--scale N] [--repeat N]
+"""
+
+# Days parsed with vectorized integers extraction
+DEFAULT_DAYS = (4, 5, 6, 9, 22, 24)
+
+# Baseline: one regex match + int conversion per token
+INT_TOKEN = re.compile(rb"-?[0-9]+")
+
+
+def regex_ints(data: bytes) -> List[int]:
+    return [int(m.group(0)) for m in INT_TOKEN.finditer(data)]
+
+
+# Best throughput of a function on some data, in MB/s
+def best_throughput(func: Callable, data: bytes, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(data) / (1024 * 1024) / best if best > 0 else float("inf")
+
+
+# Measure regex extraction, vectorized extraction and full parsing, for all required days
+def run_bench(days: List[int], scale: int, repeat: int) -> List[tuple]:
+    rows = []
+    for day in days:
+        puzzle_class = REGISTRY.get(day, 1)
+        data = generate(day, scale).encode()
+        assert len(regex_ints(data)) == len(extract_ints(data)), f"Integers count mismatch for day {day}"
+        regex_mbs = best_throughput(regex_ints, data, repeat)
+        vector_mbs = best_throughput(extract_ints, data, repeat)
+        parse_mbs = best_throughput(puzzle_class, data, repeat)
+        rows.append((day, len(data) // 1024, f"{regex_mbs:.1f}", f"{vector_mbs:.1f}", f"{vector_mbs / regex_mbs:.2f}", f"{parse_mbs:.1f}"))
+    return rows
+
+
+def main(args=None):
+    parser = ArgumentParser(description="Integers extraction throughput")
+    parser.add_argument("--day", type=int, action="append", help=f"day(s) to measure (default: {', '.join(map(str, DEFAULT_DAYS))})")
+    parser.add_argument("--scale", type=int, default=10, help="inputs scale (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of runs for each input; best one is reported (default: %(default)s)")
+    options = parser.parse_args(args)
+
+    rows = run_bench(options.day or DEFAULT_DAYS, options.scale, options.repeat)
+    print_table(("day", "input (kB)", "regex (MB/s)", "vectorized (MB/s)", "speedup", "parse (MB/s)"), rows)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
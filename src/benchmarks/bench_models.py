@@ -0,0 +1,132 @@
+import dataclasses
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from aoc2023.models import StructOfArrays
+from aoc2023.runner import print_table
+from benchmarks.common import load_class
+
+"""
+Memory footprint and attribute access time of data models, for different layouts:
+- dict: plain dataclass, with a per-instance __dict__ (layout before models were slotted)
+- slots: slotted dataclass (current layout)
+- columns: struct of arrays, for models stored one record per line with numeric fields
+
+Usage: python -m benchmarks.bench_models [--count N] [--model module:Class]...
+"""
+
+# Benchmarked models, with a factory for constructor arguments of the i-th instance
+MODELS: Dict[str, Callable[[int], tuple]] = {
+    "aoc2023.day04:CardModel": lambda i: (i, [i], [i]),
+    "aoc2023.day06:Record": lambda i: (i, i),
+    "aoc2023.day07:Hand": lambda i: (i % 7, str(i), i),
+    "aoc2023.day08:Node": lambda i: (str(i), str(i + 1), str(i + 2)),
+    "aoc2023.day19:Instruction": lambda i: ("x", "<", i, str(i)),
+    "aoc2023.day19:Workflow": lambda i: (str(i), [], "R"),
+    "aoc2023.day20:FlipFlopModule": lambda i: (str(i), []),
+    "aoc2023.day20:ConjunctionModule": lambda i: (str(i), []),
+    "aoc2023.day22:Brick": lambda i: (i, i + 1, i, set()),
+    "aoc2023.day23:Branch": lambda i: ((i, 0), (0, i), set(), i),
+    "aoc2023.day24:HailStone": lambda i: (i << 40, i << 41, i << 42, i % 100, -(i % 50), i % 30),
+}
+
+# Typecodes for struct of arrays layout (only for models with numeric fields)
+COLUMNS = {
+    "aoc2023.day24:HailStone": dict.fromkeys(("px", "py", "pz", "vx", "vy", "vz"), "q"),
+}
+
+# Attribute reads per loop iteration, for access time measure
+READS = 8
+
+
+# Measure record
+@dataclass
+class ModelMeasure:
+    model: str
+    layout: str
+    bytes_per_record: float
+    read_ns: float
+
+    def as_row(self) -> tuple:
+        return (self.model, self.layout, f"{self.bytes_per_record:.1f}", f"{self.read_ns:.1f}")
+
+
+# Equivalent dataclass model, with a per-instance __dict__
+def dict_model(model: type) -> type:
+    return dataclasses.make_dataclass(
+        model.__name__, [(f.name, f.type, dataclasses.field(default=f.default, default_factory=f.default_factory)) for f in dataclasses.fields(model)]
+    )
+
+
+# Allocated bytes for building something (retained memory only)
+def allocated(build: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        out = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del out
+    return size
+
+
+# Time of a loop over some items, with a given statement (best of 3)
+def loop_time(statement: str, items, namespace: dict) -> float:
+    code = compile(f"for o in items:\n    {statement}\n", "<bench>", "exec")
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        exec(code, dict(namespace, items=items))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+# Average time of one read (loop overhead removed), in ns
+def read_ns(statement: str, items, count: int, namespace: dict = None) -> float:
+    namespace = namespace if namespace is not None else {}
+    return max(loop_time("; ".join([statement] * READS), items, namespace) - loop_time("pass", items, namespace), 0.0) * 1e9 / (READS * count)
+
+
+# Measure all layouts for a model
+def measure(class_path: str, count: int) -> List[ModelMeasure]:
+    model = load_class(class_path)
+    factory = MODELS[class_path]
+    first = dataclasses.fields(model)[0].name
+    out = []
+
+    # Records layouts (fields values are built along with records, as when parsing)
+    for layout, cls in (("dict", dict_model(model)), ("slots", model)):
+        size = allocated(lambda cls=cls: [cls(*factory(i)) for i in range(count)])
+        records = [cls(*factory(i)) for i in range(count)]
+        out.append(ModelMeasure(class_path, layout, size / count, read_ns(f"o.{first}", records, count)))
+
+    # Columns layout
+    if class_path in COLUMNS:
+
+        def build() -> StructOfArrays:
+            soa = StructOfArrays(model, COLUMNS[class_path])
+            for i in range(count):
+                soa.append(*factory(i))
+            return soa
+
+        column = build().column(first)
+        out.append(ModelMeasure(class_path, "columns", allocated(build) / count, read_ns("column[o]", range(count), count, {"column": column})))
+    return out
+
+
+def main(args=None):
+    parser = ArgumentParser(description="Memory and attribute access benchmark of data models layouts")
+    parser.add_argument("--count", type=int, default=100_000, help="number of records for each model (default: %(default)s)")
+    parser.add_argument("--model", action="append", choices=sorted(MODELS), help="model(s) to measure (default: all)")
+    options = parser.parse_args(args)
+
+    measures = [m for class_path in options.model or MODELS for m in measure(class_path, options.count)]
+    print_table(("model", "layout", "bytes/record", "read (ns)"), [m.as_row() for m in measures])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
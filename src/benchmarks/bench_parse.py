@@ -0,0 +1,79 @@
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import List, Union
+
+from aoc2023.runner import print_table
+from benchmarks.common import INPUTS_ROOT, SOURCES_ROOT
+
+"""
+Parse time of all days, on full inputs
+
+Each measure runs in a dedicated interpreter, with default logging configuration (i.e. traces disabled).
+Another sources tree can be measured as a baseline, e.g. to compare with a previous revision:
+  git worktree add /tmp/aoc2023-baseline <revision>
+  python -m benchmarks.bench_parse --baseline /tmp/aoc2023-baseline/src
+
+Chunked parsing (for days supporting it) can be measured against sequential parsing of the same tree, e.g. on scaled inputs:
+  python -m benchmarks.bench_parse --day 24 --inputs out/scaled --parse-workers 4 --baseline .
+
+Usage: python -m benchmarks.bench_parse [--day N]... [--repeat N] [--baseline DIR] [--parse-workers N] [--inputs DIR]
+"""
+
+# Child process code: only relies on day modules, so that it can run on any sources tree revision
+CHILD = """
+import importlib, sys, time
+from pathlib import Path
+day, input_file, repeat, workers = int(sys.argv[1]), Path(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4])
+m = importlib.import_module(f"aoc2023.day{day:02}")
+cls = getattr(m, f"D{day:02}Step1Puzzle", None) or getattr(m, f"D{day:02}Puzzle")
+cls.PARSE_WORKERS = workers
+best = None
+for _ in range(repeat):
+    start = time.perf_counter()
+    cls(input_file)
+    elapsed = time.perf_counter() - start
+    best = elapsed if best is None else min(best, elapsed)
+print(best)
+"""
+
+
+# Best parse time for a day input, on a given sources tree
+def measure(sources: Path, day: int, input_file: Path, repeat: int, parse_workers: int = 1) -> float:
+    args = [sys.executable, "-c", CHILD, str(day), str(input_file.absolute()), str(repeat), str(parse_workers)]
+    p = subprocess.run(args, cwd=sources, check=True, capture_output=True, text=True)
+    return float(p.stdout)
+
+
+# Measure all required days, on current sources tree (and baseline one if any)
+def run_bench(days: List[int], repeat: int, baseline: Union[Path, None] = None, parse_workers: int = 1, inputs: Path = INPUTS_ROOT) -> List[tuple]:
+    rows = []
+    for day in days:
+        input_file = inputs / f"d{day:02}.input.txt"
+        current = measure(SOURCES_ROOT, day, input_file, repeat, parse_workers)
+        row = (day, input_file.stat().st_size // 1024, f"{current * 1000:.2f}")
+        if baseline is not None:
+            before = measure(baseline, day, input_file, repeat)
+            row += (f"{before * 1000:.2f}", f"{before / current:.2f}" if current > 0 else "")
+        rows.append(row)
+    return rows
+
+
+def main(args=None):
+    parser = ArgumentParser(description="Parse time of all days on full inputs")
+    parser.add_argument("--day", type=int, action="append", help="day(s) to measure (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of parsings for each input; best one is reported (default: %(default)s)")
+    parser.add_argument("--baseline", type=Path, help="sources tree to be measured as a baseline (i.e. folder containing the aoc2023 package)")
+    parser.add_argument("--parse-workers", type=int, default=1, help="number of processes for chunked parsing on current sources tree (default: %(default)s)")
+    parser.add_argument("--inputs", type=Path, default=INPUTS_ROOT, help="inputs folder, with dNN.input.txt files (default: tests inputs)")
+    options = parser.parse_args(args)
+
+    headers = ("day", "input (kB)", "parse (ms)")
+    if options.baseline is not None:
+        headers += ("baseline (ms)", "speedup")
+    print_table(headers, run_bench(options.day or range(1, 26), options.repeat, options.baseline, options.parse_workers, options.inputs))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,90 @@
+import time
+from argparse import ArgumentParser
+from typing import Iterator, List, Tuple
+
+from aoc2023.day17 import D17Puzzle, D17Step1Puzzle
+from aoc2023.runner import print_table
+from aoc2023.search import Search
+from benchmarks.generators import generate
+
+"""
+Node expansions per second of graph searches, on large synthetic grids (day 17 heat loss maps)
+
+- bfs: all blocks, moving to 4 neighbours
+- dijkstra/astar: day 17 crucible moves (1 to 3 blocks in a row, then turn), from top-left to bottom-right block
+
+Usage: python -m benchmarks.bench_search [--scale N]... [--algorithm NAME]...
+"""
+
+# Supported algorithms
+ALGORITHMS = ("bfs", "dijkstra", "astar")
+
+
+# Run one search on a day 17 grid; returns the search object (with expansions count)
+def run_search(puzzle: D17Puzzle, algorithm: str) -> Search:
+    width, height, end = puzzle.width, puzzle.height, puzzle.end
+    if algorithm == "bfs":
+        search = Search(width * height)
+
+        def neighbours(index: int) -> List[int]:
+            row, col = divmod(index, width)
+            return [r * width + c for r, c in ((row - 1, col), (row, col + 1), (row + 1, col), (row, col - 1)) if 0 <= r < height and 0 <= c < width]
+
+        search.bfs((0,), neighbours)
+        return search
+
+    search = Search(2 * width * height)
+
+    def edges(state: int) -> Iterator[Tuple[int, int]]:
+        return puzzle.moves(state, 1, 3)
+
+    def goal(state: int) -> bool:
+        return state // 2 == end
+
+    if algorithm == "dijkstra":
+        search.dijkstra((0, 1), edges, goal)
+    else:
+        # Manhattan distance to end (each block costs at least 1)
+        def heuristic(state: int) -> int:
+            row, col = divmod(state // 2, width)
+            return (height - 1 - row) + (width - 1 - col)
+
+        search.astar((0, 1), edges, goal, heuristic)
+    return search
+
+
+# Measure all required algorithms, on grids of all required scales
+def run_bench(scales: List[int], algorithms: List[str]) -> List[tuple]:
+    rows = []
+    for scale in scales:
+        puzzle = D17Step1Puzzle(generate(17, scale))
+        for algorithm in algorithms:
+            start = time.perf_counter()
+            search = run_search(puzzle, algorithm)
+            elapsed = time.perf_counter() - start
+            rows.append(
+                (
+                    scale,
+                    f"{puzzle.width}x{puzzle.height}",
+                    algorithm,
+                    search.states_count,
+                    search.expansions,
+                    f"{elapsed * 1000:.2f}",
+                    f"{search.expansions / elapsed / 1000:.1f}" if elapsed > 0 else "",
+                )
+            )
+    return rows
+
+
+def main(args=None):
+    parser = ArgumentParser(description="Graph searches node expansions per second")
+    parser.add_argument("--scale", type=int, action="append", help="grids scale(s) (default: 1, 10)")
+    parser.add_argument("--algorithm", choices=ALGORITHMS, action="append", help="algorithm(s) to measure (default: all)")
+    options = parser.parse_args(args)
+
+    rows = run_bench(options.scale or [1, 10], options.algorithm or ALGORITHMS)
+    print_table(("scale", "grid", "algorithm", "states", "expansions", "time (ms)", "kexp/s"), rows)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
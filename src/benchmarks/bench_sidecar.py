@@ -0,0 +1,72 @@
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import List
+
+from aoc2023.registry import REGISTRY
+from aoc2023.runner import print_table
+from aoc2023.sidecar import convert, sidecar_path
+from benchmarks.generators import generate
+
+"""
+Load time of pre-tokenized (sidecar) inputs vs. text parsing, on synthetic inputs
+
+Usage: python -m benchmarks.bench_sidecar [--day N]... [--scale N] [--repeat N] [--output DIR]
+"""
+
+# Days with a specific sidecar format (grid days share a generic one)
+DEFAULT_DAYS = (5, 8, 22, 24)
+
+
+# Best construction time of a puzzle
+def best_time(puzzle_class: type, input_file: Path, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        puzzle_class(input_file)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+# Measure text parsing, then sidecar loading, for all required days
+def run_bench(days: List[int], scale: int, repeat: int, output: Path) -> List[tuple]:
+    output.mkdir(parents=True, exist_ok=True)
+    rows = []
+    for day in days:
+        puzzle_class = REGISTRY.get(day, 1)
+        assert puzzle_class.SIDECAR_FORMAT is not None, f"Day {day} doesn't support pre-tokenized inputs"
+        input_file = output / f"d{day:02}.input.txt"
+        input_file.write_text(generate(day, scale))
+        sidecar_path(input_file).unlink(missing_ok=True)
+
+        text_time = best_time(puzzle_class, input_file, repeat)
+        sidecar = convert(puzzle_class, input_file)
+        sidecar_time = best_time(puzzle_class, input_file, repeat)
+        rows.append(
+            (
+                day,
+                input_file.stat().st_size // 1024,
+                sidecar.stat().st_size // 1024,
+                f"{text_time * 1000:.2f}",
+                f"{sidecar_time * 1000:.2f}",
+                f"{text_time / sidecar_time:.2f}" if sidecar_time > 0 else "",
+            )
+        )
+    return rows
+
+
+def main(args=None):
+    parser = ArgumentParser(description="Pre-tokenized inputs load time")
+    parser.add_argument("--day", type=int, action="append", help=f"day(s) to measure (default: {', '.join(map(str, DEFAULT_DAYS))})")
+    parser.add_argument("--scale", type=int, default=10, help="inputs scale (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of loads for each input; best one is reported (default: %(default)s)")
+    parser.add_argument("--output", type=Path, default=Path("out") / "sidecar", help="generated inputs folder (default: %(default)s)")
+    options = parser.parse_args(args)
+
+    rows = run_bench(options.day or DEFAULT_DAYS, options.scale, options.repeat, options.output)
+    print_table(("day", "input (kB)", "sidecar (kB)", "text (ms)", "sidecar (ms)", "speedup"), rows)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
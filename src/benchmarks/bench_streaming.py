@@ -0,0 +1,66 @@
+import subprocess
+import sys
+from argparse import SUPPRESS, ArgumentParser
+from pathlib import Path
+
+from aoc2023.runner import print_table
+from benchmarks.common import INPUTS_ROOT, SOURCES_ROOT, load_class, peak_rss_kb
+
+"""
+Peak RSS comparison between default and streaming parsing modes
+
+Each measure runs in a dedicated interpreter, so that peak RSS only reflects the parsing of one input file.
+
+Usage: python -m benchmarks.bench_streaming [--day N] [input files...]
+"""
+
+
+# Child process: build puzzle in required mode, and print peak RSS
+def measure(class_path: str, streaming: bool, input_file: Path):
+    puzzle_class = load_class(class_path)
+    baseline = peak_rss_kb()
+    mode_class = type(puzzle_class.__name__, (puzzle_class,), {"STREAMING": streaming, "KEEP_INPUT_LINES": puzzle_class.KEEP_INPUT_LINES and not streaming})
+    mode_class(input_file)
+    print(baseline, peak_rss_kb())
+
+
+# Parent process: spawn one interpreter per measure
+def spawn(class_path: str, streaming: bool, input_file: Path) -> tuple:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_streaming", "--child", class_path, str(input_file.absolute())] + (["--streaming"] if streaming else []),
+        cwd=SOURCES_ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    baseline, peak = map(int, out.stdout.split())
+    return baseline, peak
+
+
+def main(args=None):
+    parser = ArgumentParser(description="Compare peak RSS of default and streaming parsing modes")
+    parser.add_argument("--day", type=int, action="append", help="day(s) to measure (default: all)")
+    parser.add_argument("--child", metavar="CLASS", help=SUPPRESS)
+    parser.add_argument("--streaming", action="store_true", help=SUPPRESS)
+    parser.add_argument("inputs", nargs="*", type=Path, help="input files (default: dNN.input.txt from tests inputs)")
+    options = parser.parse_args(args)
+
+    if options.child:
+        measure(options.child, options.streaming, options.inputs[0])
+        return
+
+    # Iterate on required days
+    rows = []
+    for day in options.day or range(1, 26):
+        class_path = f"aoc2023.day{day:02}:D{day:02}Step1Puzzle"
+        for input_file in options.inputs or [INPUTS_ROOT / f"d{day:02}.input.txt"]:
+            base_default, peak_default = spawn(class_path, False, input_file)
+            base_streaming, peak_streaming = spawn(class_path, True, input_file)
+            parse_default, parse_streaming = peak_default - base_default, peak_streaming - base_streaming
+            rows.append((day, input_file.name, input_file.stat().st_size // 1024, parse_default, parse_streaming, peak_default, peak_streaming))
+
+    print_table(("day", "input", "size (kB)", "default parse (kB)", "streaming parse (kB)", "default peak (kB)", "streaming peak (kB)"), rows)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,26 @@
+import importlib
+import resource
+import sys
+from pathlib import Path
+from typing import Type
+
+from aoc2023.puzzle import AOCPuzzle
+
+# Sources root (to run benchmark modules in child interpreters)
+SOURCES_ROOT = Path(__file__).parent.parent
+
+# Inputs shipped with tests
+INPUTS_ROOT = SOURCES_ROOT / "tests" / "inputs"
+
+
+# Peak resident set size of the current process, in kB
+def peak_rss_kb() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in kB elsewhere
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+# Load a puzzle class from its "module:ClassName" path
+def load_class(class_path: str) -> Type[AOCPuzzle]:
+    module_name, class_name = class_path.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
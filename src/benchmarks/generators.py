@@ -0,0 +1,439 @@
+import math
+import random
+import string
+from typing import Callable, Dict, List, Tuple
+
+"""
+Deterministic synthetic inputs generators, for all days
+
+Each generator builds an input which is valid for the day solvers, with a size growing with the scale factor:
+* line-based inputs: number of lines is multiplied by the scale
+* grid inputs: grid area is multiplied by the scale (i.e. side is multiplied by its square root)
+"""
+
+# Generators registry
+GENERATORS: Dict[int, Callable[[random.Random, int], str]] = {}
+
+
+def generator(day: int):
+    def register(f: Callable[[random.Random, int], str]):
+        GENERATORS[day] = f
+        return f
+
+    return register
+
+
+# Generate input for a given day and scale (same input for the same day and scale)
+def generate(day: int, scale: int) -> str:
+    return GENERATORS[day](random.Random(day * 1_000_000 + scale), scale)
+
+
+# Side of a square grid, for an area scaled from a base side
+def scaled_side(base: int, scale: int, odd: bool = False) -> int:
+    side = round(base * math.sqrt(scale))
+    return side + 1 if odd and side % 2 == 0 else side
+
+
+# Unique lowercase names
+def unique_names(rng: random.Random, count: int, length: int, reserved: Tuple[str] = ()) -> List[str]:
+    names = set()
+    while len(names) < count:
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+        if name not in reserved:
+            names.add(name)
+    return sorted(names)
+
+
+# Grid lines from a list of lists of chars
+def grid_lines(grid: List[List[str]]) -> str:
+    return "\n".join("".join(row) for row in grid) + "\n"
+
+
+DIGIT_NAMES = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+
+@generator(1)
+def d01(rng: random.Random, scale: int) -> str:
+    lines = []
+    for _ in range(1000 * scale):
+        tokens = [rng.choice(DIGIT_NAMES) if rng.random() < 0.3 else rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 12))]
+        # At least one real digit on each line
+        tokens.insert(rng.randint(0, len(tokens)), str(rng.randint(1, 9)))
+        lines.append("".join(tokens))
+    return "\n".join(lines) + "\n"
+
+
+@generator(2)
+def d02(rng: random.Random, scale: int) -> str:
+    lines = []
+    for g_id in range(1, 100 * scale + 1):
+        sets = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            sets.append(", ".join(f"{rng.randint(1, 20)} {c}" for c in colors))
+        lines.append(f"Game {g_id}: {'; '.join(sets)}")
+    return "\n".join(lines) + "\n"
+
+
+@generator(3)
+def d03(rng: random.Random, scale: int) -> str:
+    side = scaled_side(140, scale)
+    grid = [["."] * side for _ in range(side)]
+    for row in grid:
+        x = rng.randint(0, 4)
+        while x < side - 3:
+            if rng.random() < 0.15:
+                row[x] = rng.choice("*#+$/=%@&-")
+                x += 2
+            else:
+                number = str(rng.randint(1, 999))
+                row[x : x + len(number)] = list(number)
+                x += len(number) + rng.randint(1, 6)
+    return grid_lines(grid)
+
+
+@generator(4)
+def d04(rng: random.Random, scale: int) -> str:
+    lines = []
+    count = 200 * scale
+    for index in range(1, count + 1):
+        winning = rng.sample(range(1, 100), 10)
+        # Can't win more cards than the remaining ones
+        matches = min(rng.choices(range(11), weights=(40, 20, 10, 6, 5, 4, 4, 3, 3, 3, 2))[0], count - index)
+        given = rng.sample(winning, matches) + rng.sample([n for n in range(1, 100) if n not in winning], 25 - matches)
+        rng.shuffle(given)
+        lines.append(f"Card {index:4}: {' '.join(f'{n:2}' for n in winning)} | {' '.join(f'{n:2}' for n in given)}")
+    return "\n".join(lines) + "\n"
+
+
+@generator(5)
+def d05(rng: random.Random, scale: int) -> str:
+    seeds = []
+    for _ in range(10 * scale):
+        seeds.extend((rng.randint(0, 4_000_000_000), rng.randint(1, 200_000_000)))
+    out = f"seeds: {' '.join(map(str, seeds))}\n"
+    types = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+    for source, target in zip(types, types[1:]):
+        # Non-overlapping source ranges
+        bounds = sorted(rng.sample(range(0, 4_300_000_000), 2 * 30 * scale))
+        out += f"\n{source}-to-{target} map:\n"
+        for start, end in zip(bounds[::2], bounds[1::2]):
+            out += f"{rng.randint(0, 4_000_000_000)} {start} {end - start}\n"
+    return out
+
+
+@generator(6)
+def d06(rng: random.Random, scale: int) -> str:
+    times = [rng.randint(40, 99) * scale for _ in range(4)]
+    while True:
+        dists = [rng.randint(t * t // 8, t * t // 4 - 1) for t in times]
+        # Record must also be beatable with all numbers concatenated (step 2)
+        t, d = int("".join(map(str, times))), int("".join(map(str, dists)))
+        if d < t * t // 4:
+            break
+    return f"Time:      {' '.join(f'{t:6}' for t in times)}\nDistance:  {' '.join(f'{d:6}' for d in dists)}\n"
+
+
+@generator(7)
+def d07(rng: random.Random, scale: int) -> str:
+    return "".join(f"{''.join(rng.choice('23456789TJQKA') for _ in range(5))} {rng.randint(1, 1000)}\n" for _ in range(1000 * scale))
+
+
+@generator(8)
+def d08(rng: random.Random, scale: int) -> str:
+    # Names are made of 3 chars, from a limited alphabet
+    alphabet = "123456789BCDEFGHIJKLMNOPQRSTUVWXY"
+    chains_count = 6
+    chain_lengths = [50 * scale + rng.randint(0, 20) for _ in range(chains_count)]
+    names = [a + b + c for a in alphabet for b in alphabet for c in alphabet]
+    rng.shuffle(names)
+    prefixes = rng.sample([a + b for a in alphabet for b in alphabet], 2 * chains_count)
+    lines = []
+    for chain, length in enumerate(chain_lengths):
+        # Chain: start -> ... -> end -> (back to the first node after start)
+        start, end = ("AAA", "ZZZ") if chain == 0 else (prefixes.pop() + "A", prefixes.pop() + "Z")
+        nodes = [start] + [names.pop() for _ in range(length - 1)] + [end]
+        for node, next_node in zip(nodes, nodes[1:] + [nodes[1]]):
+            lines.append(f"{node} = ({next_node}, {next_node})")
+    rng.shuffle(lines)
+    instructions = "".join(rng.choice("LR") for _ in range(rng.randint(200, 300)))
+    return f"{instructions}\n\n" + "\n".join(lines) + "\n"
+
+
+@generator(9)
+def d09(rng: random.Random, scale: int) -> str:
+    lines = []
+    for _ in range(200 * scale):
+        # Polynomial values
+        coefs = [rng.randint(-9, 9) for _ in range(rng.randint(1, 6))]
+        lines.append(" ".join(str(sum(c * x**i for i, c in enumerate(coefs))) for x in range(-5, 16)))
+    return "\n".join(lines) + "\n"
+
+
+# Loop on a grid: outline of a random histogram shape (list of cells, in loop order)
+def histogram_loop(rng: random.Random, width: int, height: int) -> List[Tuple[int, int]]:
+    bottom = height - 2
+    tops = [rng.randint(1, bottom - 2) for _ in range(1, width - 2)]
+    loop = [(1, y) for y in range(bottom, tops[0] - 1, -1)]
+    for x, (top, next_top) in enumerate(zip(tops, tops[1:] + [bottom]), start=2):
+        step = 1 if next_top >= top else -1
+        loop.extend((x, y) for y in range(top, next_top + step, step))
+    loop.extend((x, bottom) for x in range(width - 3, 1, -1))
+    return loop
+
+
+# Pipe shape for a loop cell, from previous and next cells
+PIPES = {
+    frozenset([(0, -1), (0, 1)]): "|",
+    frozenset([(-1, 0), (1, 0)]): "-",
+    frozenset([(0, -1), (1, 0)]): "L",
+    frozenset([(0, -1), (-1, 0)]): "J",
+    frozenset([(0, 1), (-1, 0)]): "7",
+    frozenset([(0, 1), (1, 0)]): "F",
+}
+
+
+@generator(10)
+def d10(rng: random.Random, scale: int) -> str:
+    side = scaled_side(140, scale)
+    grid = [[rng.choice("|-LJ7F..") for _ in range(side)] for _ in range(side)]
+    loop = histogram_loop(rng, side, side)
+    for i, (x, y) in enumerate(loop):
+        (px, py), (nx, ny) = loop[i - 1], loop[(i + 1) % len(loop)]
+        grid[y][x] = PIPES[frozenset([(px - x, py - y), (nx - x, ny - y)])]
+
+    # Start on a horizontal pipe of the bottom line, with no misleading pipes above/below
+    x, y = loop[-2]
+    grid[y][x] = "S"
+    grid[y - 1][x] = grid[y + 1][x] = "."
+    return grid_lines(grid)
+
+
+@generator(11)
+def d11(rng: random.Random, scale: int) -> str:
+    side = scaled_side(140, scale)
+    empty_rows = set(rng.sample(range(side), side // 20))
+    empty_cols = set(rng.sample(range(side), side // 20))
+    grid = [["#" if (y not in empty_rows and x not in empty_cols and rng.random() < 0.02) else "." for x in range(side)] for y in range(side)]
+    return grid_lines(grid)
+
+
+@generator(12)
+def d12(rng: random.Random, scale: int) -> str:
+    lines = []
+    for _ in range(1000 * scale):
+        # Random springs row, then hide some states
+        row = "".join(rng.choice("..#") for _ in range(rng.randint(5, 20)))
+        if "#" not in row:
+            row = "#" + row[1:]
+        groups = [len(g) for g in row.split(".") if g]
+        hidden = "".join("?" if rng.random() < 0.4 else c for c in row)
+        lines.append(f"{hidden} {','.join(map(str, groups))}")
+    return "\n".join(lines) + "\n"
+
+
+@generator(13)
+def d13(rng: random.Random, scale: int) -> str:
+    patterns = []
+    for _ in range(100 * scale):
+        width, height = rng.randint(5, 17), rng.randint(5, 17)
+        mirror = rng.randint(1, height - 1)
+        rows = ["".join(rng.choice(".#") for _ in range(width)) for _ in range(mirror)]
+        # Reflect rows below the mirror line, then random rows if the pattern is longer
+        rows += [rows[mirror - 1 - i] if mirror - 1 - i >= 0 else "".join(rng.choice(".#") for _ in range(width)) for i in range(height - mirror)]
+        if rng.random() < 0.5:
+            # Vertical reflection instead
+            rows = ["".join(r[x] for r in rows) for x in range(width)]
+        patterns.append("\n".join(rows))
+    return "\n\n".join(patterns) + "\n"
+
+
+@generator(14)
+def d14(rng: random.Random, scale: int) -> str:
+    side = scaled_side(100, scale)
+    return grid_lines([[rng.choices("O#.", weights=(2, 1, 5))[0] for _ in range(side)] for _ in range(side)])
+
+
+@generator(15)
+def d15(rng: random.Random, scale: int) -> str:
+    labels = unique_names(rng, 500, 2) + unique_names(rng, 500, 4)
+    steps = []
+    for _ in range(4000 * scale):
+        label = rng.choice(labels)
+        steps.append(f"{label}-" if rng.random() < 0.3 else f"{label}={rng.randint(1, 9)}")
+    return ",".join(steps) + "\n"
+
+
+@generator(16)
+def d16(rng: random.Random, scale: int) -> str:
+    side = scaled_side(110, scale)
+    return grid_lines([[rng.choices("./\\|-", weights=(90, 3, 3, 2, 2))[0] for _ in range(side)] for _ in range(side)])
+
+
+@generator(17)
+def d17(rng: random.Random, scale: int) -> str:
+    side = scaled_side(141, scale)
+    return grid_lines([[str(rng.randint(1, 9)) for _ in range(side)] for _ in range(side)])
+
+
+# Closed rectilinear polygon (histogram shape) as a list of (direction, distance), with the bottom line split in several moves
+def histogram_polygon(rng: random.Random, columns: int, max_distance: int, bottom_moves: int) -> List[Tuple[str, int]]:
+    heights = [rng.randint(1, max_distance)]
+    for _ in range(columns - 1):
+        # Random height, different from the previous one
+        h = rng.randint(1, max_distance - 1)
+        heights.append(h + 1 if h >= heights[-1] else h)
+    widths = [rng.randint(1, max_distance) for _ in range(columns)]
+    out = [("U", heights[0])]
+    for w, h, next_h in zip(widths, heights, heights[1:]):
+        out.append(("R", w))
+        out.append(("U", next_h - h) if next_h > h else ("D", h - next_h))
+    out.extend([("R", widths[-1]), ("D", heights[-1])])
+    total = sum(widths)
+    out.extend(("L", total // bottom_moves + (1 if i < total % bottom_moves else 0)) for i in range(bottom_moves))
+    return out
+
+
+@generator(18)
+def d18(rng: random.Random, scale: int) -> str:
+    columns = 150 * scale
+    # Step 2 distances are limited to 5 hex digits
+    step1 = histogram_polygon(rng, columns, 10, columns // 2)
+    step2 = histogram_polygon(rng, columns, 500_000, columns // 2)
+    digits = {"R": 0, "D": 1, "L": 2, "U": 3}
+    return "".join(f"{d1} {n1} (#{n2:05x}{digits[d2]})\n" for (d1, n1), (d2, n2) in zip(step1, step2))
+
+
+@generator(19)
+def d19(rng: random.Random, scale: int) -> str:
+    # Workflows tree, from "in"
+    names = unique_names(rng, 500 * scale, 4, reserved=("in",))
+    workflows = []
+    pending = ["in"]
+    while pending:
+        name = pending.pop(0)
+        rules = []
+        targets = []
+        for _ in range(rng.randint(1, 3)):
+            targets.append(names.pop() if names and rng.random() < 0.7 else rng.choice("AR"))
+            rules.append(f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{targets[-1]}")
+        default = names.pop() if names and rng.random() < 0.5 else rng.choice("AR")
+        targets.append(default)
+        pending.extend(t for t in targets if t not in "AR")
+        workflows.append(f"{name}{{{','.join(rules + [default])}}}")
+    rng.shuffle(workflows)
+    parts = [f"{{x={rng.randint(1, 4000)},m={rng.randint(1, 4000)},a={rng.randint(1, 4000)},s={rng.randint(1, 4000)}}}" for _ in range(200 * scale)]
+    return "\n".join(workflows) + "\n\n" + "\n".join(parts) + "\n"
+
+
+@generator(20)
+def d20(rng: random.Random, scale: int) -> str:
+    # Binary counters (12 flip-flops) resetting on a given value, all feeding a final conjunction before rx
+    chains_count = 4 * scale
+    bits = 12
+    names = unique_names(rng, chains_count * (bits + 2) + 1, 4, reserved=("rx", "broadcaster"))
+    final = names.pop()
+    lines = [f"&{final} -> rx"]
+    starts = []
+    for _ in range(chains_count):
+        value = rng.randint(2 ** (bits - 1), 2**bits - 1) | 1
+        flip_flops = [names.pop() for _ in range(bits)]
+        hub, inverter = names.pop(), names.pop()
+        for i, ff in enumerate(flip_flops):
+            outputs = flip_flops[i + 1 : i + 2] + ([hub] if value & (1 << i) else [])
+            lines.append(f"%{ff} -> {', '.join(outputs)}")
+        hub_outputs = [ff for i, ff in enumerate(flip_flops) if i == 0 or not value & (1 << i)] + [inverter]
+        lines.append(f"&{hub} -> {', '.join(hub_outputs)}")
+        lines.append(f"&{inverter} -> {final}")
+        starts.append(flip_flops[0])
+    lines.append(f"broadcaster -> {', '.join(starts)}")
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+
+@generator(21)
+def d21(rng: random.Random, scale: int) -> str:
+    side = scaled_side(131, scale, odd=True)
+    middle = side // 2
+    # Rocks everywhere, except on borders and middle row/column
+    grid = [
+        ["#" if (0 < x < side - 1 and 0 < y < side - 1 and x != middle and y != middle and rng.random() < 0.1) else "." for x in range(side)]
+        for y in range(side)
+    ]
+    grid[middle][middle] = "S"
+    return grid_lines(grid)
+
+
+@generator(22)
+def d22(rng: random.Random, scale: int) -> str:
+    count = 1200 * scale
+    lines = ["0,0,1~0,2,1"]
+    for i in range(count - 1):
+        x, y, z = rng.randint(0, 9), rng.randint(0, 9), rng.randint(2, 2 + (i * 350) // 1200)
+        length = rng.randint(0, 4)
+        axis = rng.randint(0, 2)
+        x2, y2, z2 = (min(x + length, 9), y, z) if axis == 0 else ((x, min(y + length, 9), z) if axis == 1 else (x, y, z + length))
+        lines.append(f"{x},{y},{z}~{x2},{y2},{z2}")
+    return "\n".join(lines) + "\n"
+
+
+@generator(23)
+def d23(rng: random.Random, scale: int) -> str:
+    # 5x5 junctions lattice, with longer corridors when the scale grows
+    junctions = 5
+    spacing = scaled_side(24, scale)
+    side = (junctions - 1) * spacing + 3
+    grid = [["#"] * side for _ in range(side)]
+    for i in range(junctions):
+        for j in range(junctions):
+            row, col = 1 + i * spacing, 1 + j * spacing
+            if j < junctions - 1:
+                for c in range(col, col + spacing + 1):
+                    grid[row][c] = "."
+                grid[row][col + 1] = ">"
+            if i < junctions - 1:
+                for r in range(row, row + spacing + 1):
+                    grid[r][col] = "."
+                grid[row + 1][col] = "v"
+    grid[0][1] = "."
+    grid[side - 1][side - 2] = "."
+    return grid_lines(grid)
+
+
+@generator(24)
+def d24(rng: random.Random, scale: int) -> str:
+    # All hailstones are hit by the same rock, and stay in the same area (as in real inputs)
+    rock_p = [rng.randint(200_000_000_000_000, 400_000_000_000_000) for _ in range(3)]
+    rock_v = [rng.randint(-300, 300) for _ in range(3)]
+    velocities = [n for n in range(-300, 301) if n != 0]
+    lines = []
+    for t in rng.sample(range(100_000_000_000, 1_000_000_000_000), 300 * scale):
+        while True:
+            v = [rng.choice(velocities) for _ in range(3)]
+            p = [rp + t * (rv - hv) for rp, rv, hv in zip(rock_p, rock_v, v)]
+            if all(100_000_000_000_000 <= c <= 500_000_000_000_000 for c in p):
+                break
+        lines.append(f"{p[0]}, {p[1]}, {p[2]} @ {v[0]}, {v[1]}, {v[2]}")
+    return "\n".join(lines) + "\n"
+
+
+@generator(25)
+def d25(rng: random.Random, scale: int) -> str:
+    # Two ring lattices (each node linked to its 3 next neighbors), linked by 3 edges between distant nodes
+    size = 750 * scale
+    names = unique_names(rng, 2 * size, 5)
+    rng.shuffle(names)
+    edges = []
+    for offset in (0, size):
+        for i in range(size):
+            edges.extend((names[offset + i], names[offset + (i + d) % size]) for d in (1, 2, 3))
+    for k in range(3):
+        edges.append((names[k * size // 3], names[size + k * size // 3]))
+
+    # Group edges by first node
+    adjacency: Dict[str, List[str]] = {}
+    for a, b in edges:
+        adjacency.setdefault(a, []).append(b)
+    lines = [f"{a}: {' '.join(others)}" for a, others in adjacency.items()]
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
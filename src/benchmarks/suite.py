@@ -0,0 +1,152 @@
+import json
+import math
+import subprocess
+import sys
+from argparse import SUPPRESS, ArgumentParser
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+from aoc2023.registry import REGISTRY
+from aoc2023.runner import SOLVE_ARGS, find_puzzle, print_table, run_puzzle
+from benchmarks.common import SOURCES_ROOT, peak_rss_kb
+from benchmarks.generators import GENERATORS, generate
+
+"""
+Scaling benchmark suite: solve synthetic inputs of growing sizes, for all days
+
+Each measure runs in a dedicated interpreter (for peak RSS, and to enforce a timeout).
+For each scale, the time growth exponent WRT. scale is estimated from the previous scale: ~1 for linear solvers, ~2 for quadratic ones, etc.
+
+Usage: python -m benchmarks.suite [--day N]... [--scale N]... [--timeout S] [--output DIR]
+"""
+
+# Default scales
+DEFAULT_SCALES = (1, 10, 100)
+
+# Default output folder
+DEFAULT_OUTPUT = Path("out") / "bench"
+
+
+# Measure record
+@dataclass
+class Measure:
+    day: int
+    step: int
+    scale: int
+    input_size: int
+    status: str = "ok"
+    solution: str = None
+    parse_time: float = None
+    solve_time: float = None
+    peak_rss_kb: int = None
+    growth: float = None
+
+    @property
+    def total_time(self) -> float:
+        return self.parse_time + self.solve_time
+
+    def as_row(self) -> tuple:
+        if self.status != "ok":
+            return (self.day, self.step, self.scale, self.input_size // 1024, self.status, "", "", "", "")
+        return (
+            self.day,
+            self.step,
+            self.scale,
+            self.input_size // 1024,
+            self.status,
+            f"{self.parse_time:.3f}",
+            f"{self.solve_time:.3f}",
+            self.peak_rss_kb // 1024,
+            f"{self.growth:.2f}" if self.growth is not None else "",
+        )
+
+
+# Child process: solve puzzle and print measures as json
+def child(day: int, step: int, input_file: Path):
+    r = run_puzzle(find_puzzle(day, step), input_file, SOLVE_ARGS.get((day, step)))
+    print(json.dumps({"solution": str(r.solution), "parse_time": r.parse.values[0], "solve_time": r.solve.values[0], "peak_rss_kb": peak_rss_kb()}))
+
+
+# Parent process: spawn one interpreter per measure
+def measure(day: int, step: int, scale: int, input_file: Path, timeout: float) -> Measure:
+    out = Measure(day, step, scale, input_file.stat().st_size)
+    try:
+        p = subprocess.run(
+            [sys.executable, "-m", "benchmarks.suite", "--child", str(input_file.absolute()), "--day", str(day), "--step", str(step)],
+            cwd=SOURCES_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        out.status = "timeout"
+        return out
+    if p.returncode != 0:
+        out.status = "error: " + (p.stderr.strip().splitlines() or ["?"])[-1]
+        return out
+    for k, v in json.loads(p.stdout).items():
+        setattr(out, k, v)
+    return out
+
+
+# Run benchmarks for required days and scales
+def run_suite(days: List[int], scales: List[int], timeout: float, output: Path, steps: List[int] = (1, 2)) -> List[Measure]:
+    inputs_dir = output / "inputs"
+    inputs_dir.mkdir(parents=True, exist_ok=True)
+    out = []
+    for day in days:
+        for step in steps:
+            if (day, step) not in REGISTRY:
+                # No solution for this step
+                continue
+
+            previous = None
+            for scale in sorted(scales):
+                # Generate input (once)
+                input_file = inputs_dir / f"d{day:02}.x{scale}.txt"
+                if not input_file.is_file():
+                    input_file.write_text(generate(day, scale))
+
+                # Measure
+                m = measure(day, step, scale, input_file, timeout)
+                if m.status == "ok" and previous is not None and previous.status == "ok" and previous.total_time > 0:
+                    m.growth = math.log(m.total_time / previous.total_time) / math.log(m.scale / previous.scale)
+                print(f"day {day} step {step} x{scale}: {m.status}", file=sys.stderr)
+                out.append(m)
+                previous = m
+                if m.status != "ok":
+                    # Larger scales won't do better
+                    break
+    return out
+
+
+# Write json and text reports
+def write_report(measures: List[Measure], output: Path) -> str:
+    headers = ("day", "step", "scale", "input (kB)", "status", "parse (s)", "solve (s)", "peak RSS (MB)", "growth")
+    (output / "report.json").write_text(json.dumps([asdict(m) for m in measures], indent=4))
+    with (output / "report.txt").open("w") as f:
+        print_table(headers, [m.as_row() for m in measures], file=f)
+    return (output / "report.txt").read_text()
+
+
+def main(args=None):
+    parser = ArgumentParser(description="Scaling benchmark suite on synthetic inputs")
+    parser.add_argument("--day", type=int, action="append", help="day(s) to benchmark (default: all)")
+    parser.add_argument("--step", type=int, action="append", choices=(1, 2), help="step(s) to benchmark (default: both)")
+    parser.add_argument("--scale", type=int, action="append", help=f"input scale(s) (default: {', '.join(map(str, DEFAULT_SCALES))})")
+    parser.add_argument("--timeout", type=float, default=60.0, help="timeout for each measure, in seconds (default: %(default)s)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="output folder for inputs and reports (default: %(default)s)")
+    parser.add_argument("--child", type=Path, help=SUPPRESS)
+    options = parser.parse_args(args)
+
+    if options.child:
+        child(options.day[0], options.step[0], options.child)
+        return
+
+    measures = run_suite(options.day or sorted(GENERATORS), options.scale or DEFAULT_SCALES, options.timeout, options.output, options.step or (1, 2))
+    print(write_report(measures, options.output), end="")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
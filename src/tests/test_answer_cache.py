@@ -0,0 +1,112 @@
+import hashlib
+import os
+import time
+
+import pytest
+
+from aoc2023 import state_cache
+from aoc2023.answer_cache import AnswerCache
+from aoc2023.day05 import D05Step2Puzzle
+from aoc2023.day11 import D11Puzzle
+from aoc2023.runner import main
+from tests.base import AOCPuzzleTester
+
+
+class TestAnswerCache(AOCPuzzleTester):
+    @property
+    def cache(self) -> AnswerCache:
+        return AnswerCache(self.test_folder / "answers")
+
+    def test_solve(self, monkeypatch):
+        # First solve: build and solve puzzle, and store answer
+        cache = self.cache
+        assert cache.solve(D05Step2Puzzle, self.get_input("d05.sample.txt")) == (46, False)
+        assert len(cache.entries) == 1
+
+        # Second solve: answer is returned without building the puzzle
+        monkeypatch.setattr(D05Step2Puzzle, "__init__", lambda *_: pytest.fail("Unexpected puzzle build"))
+        assert cache.solve(D05Step2Puzzle, self.get_input("d05.sample.txt")) == (46, True)
+        assert cache.stats() == {"hits": 1, "misses": 1, "expired": 0, "evictions": 0, "hit_rate": 0.5}
+
+        # Statistics are shared by cache instances
+        assert self.cache.stats()["hits"] == 1
+
+    def test_solve_arg(self):
+        cache = self.cache
+        assert cache.solve(D11Puzzle, self.get_input("d11.sample.txt"), 10) == (1030, False)
+        assert cache.solve(D11Puzzle, self.get_input("d11.sample.txt"), 100) == (8410, False)
+        assert cache.solve(D11Puzzle, self.get_input("d11.sample.txt"), 10) == (1030, True)
+
+    def test_source_change(self, monkeypatch):
+        cache = self.cache
+        cache.solve(D05Step2Puzzle, self.get_input("d05.sample.txt"))
+        monkeypatch.setattr("aoc2023.answer_cache.class_source_digest", lambda _: "0123456789abcdef")
+        assert cache.get(D05Step2Puzzle, self.get_input("d05.sample.txt")) == (False, None)
+
+    def test_shared_source_change(self, monkeypatch):
+        cache = self.cache
+        cache.solve(D05Step2Puzzle, self.get_input("d05.sample.txt"))
+
+        # Change in a shared module (e.g. intervals, for day 5)
+        monkeypatch.setattr(state_cache, "CLASS_DIGESTS", {})
+        file_digest = state_cache.file_digest
+        monkeypatch.setattr(state_cache, "file_digest", lambda f: "changed" if f.name == "intervals.py" else file_digest(f))
+        assert cache.get(D05Step2Puzzle, self.get_input("d05.sample.txt")) == (False, None)
+
+    def test_buffers(self, monkeypatch):
+        # In-memory inputs are keyed by their content hash, as files
+        cache = self.cache
+        content = self.get_input("d05.sample.txt").read_bytes()
+        assert cache.solve(D05Step2Puzzle, content) == (46, False)
+        assert cache.get(D05Step2Puzzle, bytearray(content)) == (True, 46)
+        assert cache.get(D05Step2Puzzle, self.get_input("d05.sample.txt")) == (True, 46)
+
+        # Known input hash: input is not hashed again
+        digest = hashlib.sha256(content).hexdigest()
+        monkeypatch.setattr(state_cache, "file_digest", lambda f: pytest.fail("Unexpected input hash"))
+        assert cache.get(D05Step2Puzzle, self.get_input("d05.sample.txt"), digest=digest) == (True, 46)
+
+    def test_ttl(self):
+        cache = self.cache
+        cache.solve(D05Step2Puzzle, self.get_input("d05.sample.txt"))
+        entry = cache.entry_path(D05Step2Puzzle, self.get_input("d05.sample.txt"))
+        old = time.time() - 3600
+        os.utime(entry, (old, old))
+        cache.ttl = 60
+        assert cache.get(D05Step2Puzzle, self.get_input("d05.sample.txt")) == (False, None)
+        assert not entry.exists()
+        assert cache.counters["expired"] == 1
+
+    def test_corrupted(self):
+        cache = self.cache
+        entry = cache.entry_path(D05Step2Puzzle, self.get_input("d05.sample.txt"))
+        entry.parent.mkdir(parents=True)
+        entry.write_bytes(b"garbage")
+        assert cache.solve(D05Step2Puzzle, self.get_input("d05.sample.txt")) == (46, False)
+        assert cache.get(D05Step2Puzzle, self.get_input("d05.sample.txt")) == (True, 46)
+
+    def test_eviction(self):
+        cache = self.cache
+        cache.solve(D05Step2Puzzle, self.get_input("d05.input.txt"))
+        cache.max_size = sum(p.stat().st_size for p in cache.entries) + 1
+        cache.solve(D05Step2Puzzle, self.get_input("d05.sample.txt"))
+
+        # Only the last entry is kept
+        assert cache.entries == [cache.entry_path(D05Step2Puzzle, self.get_input("d05.sample.txt"))]
+        assert cache.stats()["evictions"] == 1
+
+    def test_main(self, capsys):
+        folder = self.test_folder / "answers"
+        args = ["run", "--day", "5", "--step", "2", "--answer-cache", str(folder), str(self.get_input("d05.sample.txt"))]
+        main(args)
+        out = capsys.readouterr().out.splitlines()
+        assert out[0] == "D05Step2Puzzle: 46"
+        assert out[1].startswith("parse: ")
+        main(args)
+        out = capsys.readouterr().out.splitlines()
+        assert out[0] == "D05Step2Puzzle: 46"
+        assert out[1].startswith("cached answer: ") and out[1].endswith("(hit rate: 50.0%)")
+
+        # Invalidate
+        main(["invalidate", "--answers", "--answer-cache", str(folder)])
+        assert AnswerCache(folder).entries == []
@@ -0,0 +1,58 @@
+import json
+import math
+
+import pytest
+
+from aoc2023.batch import solve_batch
+from aoc2023.day07 import D07Step1Puzzle
+from aoc2023.day09 import D09Step1Puzzle, D09Step2Puzzle
+from aoc2023.day11 import D11Puzzle
+from aoc2023.runner import main
+from benchmarks.bench_batch import batch_inputs
+from benchmarks.bench_batch import main as bench_main
+from tests.base import AOCPuzzleTester
+
+
+class TestBatch(AOCPuzzleTester):
+    def test_files(self):
+        result = solve_batch(D07Step1Puzzle, [self.get_input("d07.sample.txt"), self.get_input("d07.input.txt"), self.get_input("d07.sample.txt")])
+        assert result.solutions == [6440, 249726565, 6440]
+        assert result.bytes_read == sum(self.get_input(n).stat().st_size for n in ("d07.sample.txt", "d07.input.txt", "d07.sample.txt"))
+        assert result.wall_time == pytest.approx(result.parse_time + result.solve_time)
+
+    def test_buffers(self):
+        sample = self.get_input("d11.sample.txt").read_bytes()
+        assert solve_batch(D11Puzzle, [sample, bytearray(sample)], 100).solutions == [8410, 8410]
+
+    def test_vectorized(self):
+        inputs = [self.get_input("d09.sample.txt"), self.get_input("d09.input.txt")] + batch_inputs(9, 20, 1)
+        for puzzle_class in (D09Step1Puzzle, D09Step2Puzzle):
+            assert solve_batch(puzzle_class, inputs).solutions == [puzzle_class(i).solve() for i in inputs]
+
+    def test_vectorized_overflow(self):
+        # Derivated sequences of large values overflow int64: such groups fall back to Python ints
+        big = " ".join(str(math.comb(i, 19) * 49 * 10**15) for i in range(21)).encode() + b"\n"
+        inputs = [big, self.get_input("d09.sample.txt").read_bytes() + big]
+        assert solve_batch(D09Step1Puzzle, inputs).solutions == [210 * 49 * 10**15, 114 + 210 * 49 * 10**15]
+        assert solve_batch(D09Step2Puzzle, inputs).solutions == [-49 * 10**15, 2 - 49 * 10**15]
+
+    def test_metrics(self):
+        result = solve_batch(D09Step1Puzzle, [self.get_input("d09.sample.txt")] * 3)
+        metrics = json.loads(result.metrics_json())
+        assert metrics["inputs"] == 3
+        assert metrics["bytes_read"] == 3 * self.get_input("d09.sample.txt").stat().st_size
+        assert "solutions" not in metrics
+        assert metrics["inputs_per_s"] > 0
+
+    def test_command(self, capsys):
+        main(["batch", "--day", "9", "--step", "2", "--metrics", str(self.get_input("d09.sample.txt")), str(self.get_input("d09.input.txt"))])
+        out = capsys.readouterr().out.splitlines()
+        assert out[0].endswith("d09.sample.txt: 2")
+        assert out[1].endswith("d09.input.txt: 919")
+        assert out[2].startswith("2 inputs in ")
+        assert json.loads("\n".join(out[3:]))["inputs"] == 2
+
+    def test_bench(self, capsys):
+        bench_main(["--count", "5"])
+        out = capsys.readouterr().out.splitlines()
+        assert [line.split()[:3] for line in out[2:]] == [["9", "1", "5"], ["9", "2", "5"]]
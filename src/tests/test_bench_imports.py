@@ -0,0 +1,28 @@
+from benchmarks.bench_imports import main, parse_importtime, run_bench
+from tests.base import AOCPuzzleTester
+
+# Sample "-X importtime" report
+REPORT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      5000 |     150000 |   numpy
+import time:       300 |     151000 | aoc2023.day99
+"""
+
+
+class TestBenchImports(AOCPuzzleTester):
+    def test_parse(self):
+        r = parse_importtime("aoc2023.day99", REPORT)
+        assert (r.self_us, r.cumulative_us) == (300, 151000)
+        assert r.packages == {"numpy": 150000}
+
+    def test_no_heavy_packages(self):
+        # Heavy packages are only imported when solving
+        for r in run_bench([3, 24, 25], 1):
+            assert r.cumulative_us > 0
+            assert r.packages == {}, f"Heavy packages imported by {r.module}: {r.packages}"
+
+    def test_main(self, capsys):
+        main(["--day", "1", "--repeat", "1"])
+        out = capsys.readouterr().out.splitlines()
+        assert out[0].split()[0] == "module"
+        assert out[2].split()[0] == "aoc2023.day01"
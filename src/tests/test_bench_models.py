@@ -0,0 +1,21 @@
+from aoc2023.day20 import ConjunctionModule
+from benchmarks.bench_models import dict_model, main, measure
+from tests.base import AOCPuzzleTester
+
+
+class TestBenchModels(AOCPuzzleTester):
+    def test_dict_model(self):
+        m = dict_model(ConjunctionModule)("a", [])
+        assert m.input_states == {}
+        assert hasattr(m, "__dict__")
+
+    def test_measure(self):
+        by_layout = {m.layout: m for m in measure("aoc2023.day24:HailStone", 1000)}
+        assert sorted(by_layout) == ["columns", "dict", "slots"]
+        assert by_layout["slots"].bytes_per_record < by_layout["dict"].bytes_per_record
+        assert by_layout["columns"].bytes_per_record < by_layout["slots"].bytes_per_record
+
+    def test_main(self, capsys):
+        main(["--count", "100", "--model", "aoc2023.day06:Record"])
+        out = capsys.readouterr().out.splitlines()
+        assert [line.split()[1] for line in out[2:]] == ["dict", "slots"]
@@ -0,0 +1,11 @@
+from benchmarks.bench_parse import main
+from benchmarks.common import SOURCES_ROOT
+from tests.base import AOCPuzzleTester
+
+
+class TestBenchParse(AOCPuzzleTester):
+    def test_main(self, capsys):
+        main(["--day", "2", "--day", "11", "--repeat", "1", "--baseline", str(SOURCES_ROOT)])
+        out = capsys.readouterr().out.splitlines()
+        assert out[0].split() == ["day", "input", "(kB)", "parse", "(ms)", "baseline", "(ms)", "speedup"]
+        assert [line.split()[0] for line in out[2:]] == ["2", "11"]
@@ -0,0 +1,35 @@
+from aoc2023.cycles import CycleDetector
+from tests.base import AOCPuzzleTester
+
+
+class TestCycles(AOCPuzzleTester):
+    def test_cycle(self):
+        # 0 -> 1 -> 2 -> 3 -> 4 -> 2 -> ...
+        steps = []
+        d = CycleDetector(0, lambda s: steps.append(s) or (s + 1 if s < 4 else 2))
+        assert d.state_at(3) == 3
+        assert not d.found
+        assert d.state_at(1_000_000_000) == 2 + (1_000_000_000 - 2) % 3
+        assert (d.found, d.start, d.length) == (True, 2, 3)
+        assert steps == [0, 1, 2, 3, 4]
+        assert not d.advance()
+
+    def test_sum_until(self):
+        values = []
+        d = CycleDetector(0, lambda s: values.append(10 * s) or (s + 1) % 4)
+        assert d.sum_until(values, 3) == 0 + 10 + 20
+        assert not d.found
+        assert d.sum_until(values, 10) == 2 * (0 + 10 + 20 + 30) + 0 + 10
+
+    def test_key(self):
+        # Compare states on a compact key only
+        d = CycleDetector((0, "a"), lambda s: ((s[0] + 1) % 5, s[1] + "a"), key=lambda s: s[0])
+        assert d.run()
+        assert (d.start, d.length) == (0, 5)
+        assert d.state_at(7) == (2, "aaa")
+
+    def test_no_cycle(self):
+        d = CycleDetector(0, lambda s: s + 1)
+        assert not d.run(100)
+        assert len(d.states) == 101
+        assert d.sum_until(list(range(200)), 100) == sum(range(100))
@@ -0,0 +1,133 @@
+import hashlib
+import os
+import pickle
+import socket
+import struct
+import tempfile
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+
+from aoc2023 import daemon as daemon_module
+from aoc2023.daemon import DaemonClient, ParsedStates, SolverDaemon, recv_frame, send_frame, wait_ready
+from aoc2023.runner import main
+from tests.base import AOCPuzzleTester
+
+
+class TestDaemon(AOCPuzzleTester):
+    @pytest.fixture
+    def daemon(self):
+        # Socket paths are limited in length: use a short temporary folder
+        with tempfile.TemporaryDirectory() as tmp:
+            socket_path = Path(tmp) / "d.sock"
+            d = SolverDaemon(socket_path, workers=2)
+            t = threading.Thread(target=d.serve_forever)
+            t.start()
+            yield socket_path
+            if t.is_alive():
+                d.server.shutdown()
+                t.join()
+
+    def test_frames(self):
+        a, b = socket.socketpair()
+        with a, b:
+            send_frame(a, {"op": "solve", "day": 1}, b"abc")
+            send_frame(a, {"op": "stats"})
+            assert recv_frame(b) == ({"op": "solve", "day": 1}, b"abc")
+            assert recv_frame(b) == ({"op": "stats"}, b"")
+            a.close()
+            with pytest.raises(EOFError):
+                recv_frame(b)
+
+    def test_parsed_states(self):
+        s = ParsedStates(10)
+        s.put(("a", "1"), b"1234")
+        s.put(("a", "2"), b"5678")
+        assert s.get(("a", "1")) == b"1234"
+        s.put(("a", "3"), b"90")
+        s.put(("a", "4"), b"12")
+        assert list(s.states) == [("a", "1"), ("a", "3"), ("a", "4")]
+        assert s.get(("a", "2")) is None
+        assert s.stats()["size"] == 8
+        assert (s.hits, s.misses) == (1, 1)
+
+    def test_cached_state(self, monkeypatch):
+        # Parsed states are cached without the input content (they're already keyed by its hash)
+        monkeypatch.setattr(daemon_module, "WORKER_STATES", ParsedStates(1024 * 1024))
+        payload = self.get_input("d22.sample.txt").read_bytes()
+        digest = hashlib.sha256(payload).hexdigest()
+        assert daemon_module.solve_request(22, 1, digest, payload)["solution"] == 5
+        (blob,) = daemon_module.WORKER_STATES.states.values()
+        assert payload not in blob
+        assert "input_file" not in pickle.loads(blob)
+
+        # Restored puzzle gets its input back
+        out = daemon_module.solve_request(22, 2, digest, payload)
+        assert (out["solution"], out["cached"]) == (7, False)
+        out = daemon_module.solve_request(22, 1, digest, payload)
+        assert (out["solution"], out["cached"]) == (5, True)
+
+    def test_solve(self, daemon):
+        sample = self.get_input("d17.sample.txt").read_bytes()
+        with DaemonClient(daemon) as c:
+            first = c.solve(17, 2, sample)
+            second = c.solve(17, 2, sample)
+            other_step = c.solve(17, 1, sample)
+            assert (first["solution"], first["cached"]) == (94, False)
+            assert (second["solution"], second["cached"]) == (94, True)
+            assert (other_step["solution"], other_step["cached"]) == (102, False)
+            assert c.solve(11, 1, self.get_input("d11.sample.txt").read_bytes(), 100)["solution"] == 8410
+            assert c.solve(24, 1, self.get_input("d24.sample.txt").read_bytes(), [7, 27])["solution"] == 2
+
+            stats = c.stats()
+            assert stats["requests"] == 6
+            assert sum(w["entries"] for w in stats["workers"]) == 4
+            assert sum(w["hits"] for w in stats["workers"]) == 1
+
+    def test_errors(self, daemon):
+        with DaemonClient(daemon) as c:
+            assert c.solve(17, 3, b"")["error"] == "AssertionError: Unknown puzzle: D17Step3Puzzle"
+            assert c.request({"op": "foo"})["error"] == "Unknown request: foo"
+            assert c.request({"op": "solve", "step": 1})["error"].startswith("AssertionError: Missing day/step in request")
+            assert c.request([1, 2])["error"].startswith("AssertionError: Invalid request header")
+
+            # Still serving
+            assert c.solve(1, 1, self.get_input("d01.sample.txt").read_bytes())["solution"] == 142
+
+    def test_invalid_header(self, daemon):
+        with DaemonClient(daemon) as c:
+            c.sock.sendall(struct.pack(">II", 3, 2) + b"{{{ab")
+            assert recv_frame(c.sock)[0]["error"].startswith("Invalid request: ")
+
+            # Still in sync
+            assert c.solve(1, 1, self.get_input("d01.sample.txt").read_bytes())["solution"] == 142
+
+    def test_broken_worker(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            d = SolverDaemon(Path(tmp) / "d.sock", workers=1)
+            try:
+                # Kill the worker process
+                first = d.workers[0]
+                with pytest.raises(BrokenProcessPool):
+                    first.submit(os._exit, 1).result()
+                sample = self.get_input("d01.sample.txt").read_bytes()
+                assert d.handle({"op": "solve", "day": 1, "step": 1}, sample)["error"].startswith("BrokenProcessPool")
+
+                # Restarted
+                assert d.workers[0] is not first
+                assert d.handle({"op": "solve", "day": 1, "step": 1}, sample)["solution"] == 142
+                assert len(d.handle({"op": "stats"}, b"")["workers"]) == 1
+            finally:
+                d.close()
+
+    def test_commands(self, daemon, capsys):
+        assert len(wait_ready(daemon)) == 2
+        main(["query", "--socket", str(daemon), "--day", "17", "--step", "2", str(self.get_input("d17.sample.txt"))])
+        out = capsys.readouterr().out.splitlines()
+        assert out[0] == "D17Step2Puzzle: 94"
+        assert out[1].startswith("parse: ")
+        main(["query", "--socket", str(daemon), "--stop"])
+        with pytest.raises(AssertionError, match="Solver daemon not ready"):
+            wait_ready(daemon, 0.5)
@@ -0,0 +1,41 @@
+import pytest
+
+from aoc2023.runner import SOLVE_ARGS, find_puzzle
+from benchmarks.generators import GENERATORS, generate
+from benchmarks.suite import main
+from tests.base import AOCPuzzleTester
+
+
+class TestGenerators(AOCPuzzleTester):
+    def test_all_days(self):
+        assert sorted(GENERATORS) == list(range(1, 26))
+
+    @pytest.mark.parametrize("day", range(1, 26))
+    def test_parse(self, day):
+        # Generated inputs are deterministic, and can be parsed
+        content = generate(day, 1)
+        assert generate(day, 1) == content
+        input_file = self.test_folder / "input.txt"
+        input_file.write_text(content)
+        find_puzzle(day, 1)(input_file)
+
+    @pytest.mark.parametrize("day,step", [(4, 2), (8, 2), (10, 2), (18, 1), (18, 2), (20, 1), (23, 2), (25, 1)])
+    def test_solve(self, day, step):
+        # Structural assumptions of some solvers are verified by generated inputs
+        input_file = self.test_folder / "input.txt"
+        input_file.write_text(generate(day, 1))
+        p = find_puzzle(day, step)(input_file)
+        solution = p.solve() if (day, step) not in SOLVE_ARGS else p.solve(SOLVE_ARGS[(day, step)])
+        assert solution > 0
+
+    def test_scale(self):
+        assert len(generate(7, 10).splitlines()) == 10 * len(generate(7, 1).splitlines())
+
+    def test_suite(self, capsys):
+        output = self.test_folder / "bench"
+        main(["--day", "7", "--step", "1", "--scale", "1", "--scale", "2", "--output", str(output)])
+        out = capsys.readouterr().out.splitlines()
+        assert out[0].split()[:3] == ["day", "step", "scale"]
+        assert [line.split()[:5] for line in out[2:]] == [["7", "1", "1", "9", "ok"], ["7", "1", "2", "19", "ok"]]
+        assert (output / "report.json").is_file()
+        assert (output / "inputs" / "d07.x2.txt").is_file()
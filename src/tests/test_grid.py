@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import numpy as np
+
+from aoc2023.day03 import D03Step1Puzzle
+from aoc2023.grid import Grid
+from aoc2023.puzzle import DIR_S, flat_offsets
+from tests.base import AOCPuzzleTester
+
+
+class TestGrid(AOCPuzzleTester):
+    def write_input(self, content: bytes) -> Path:
+        out = self.test_folder / "input.txt"
+        out.write_bytes(content)
+        return out
+
+    def test_from_bytes(self):
+        for content in (b"ab.\n#cd\n", b"ab.\r\n#cd\r\n", b"ab.\n#cd"):
+            g = Grid.from_bytes(content)
+            assert (g.width, g.height) == (3, 2)
+            assert g.cells == b"ab.#cd"
+            assert g.array.dtype == np.uint8
+            assert g.array.shape == (2, 3)
+            assert g.array[1, 0] == ord("#")
+
+    def test_from_file(self):
+        g = Grid.from_file(self.write_input(b"ab.\r\n#cd\r\n"))
+        assert g == Grid.from_lines(["ab.", "#cd"])
+        assert repr(g) == "ab.\n#cd"
+        g = Grid.from_file(self.write_input(b""))
+        assert (g.width, g.height) == (0, 0)
+
+    def test_accessors(self):
+        g = Grid.from_lines(["abc", "def"])
+        assert g.at(1, 2) == ord("f")
+        assert g.index(1, 2) == 5
+        assert g.position(5) == (1, 2)
+        assert g.row(1) == b"def"
+        assert g.rows() == [b"abc", b"def"]
+        assert g.find(ord("e")) == (1, 1)
+        assert g.find(ord("z")) is None
+        assert Grid.from_lines(["a.a", ".a."]).find_all(ord("a")) == [(0, 0), (0, 2), (1, 1)]
+        assert g.transposed().rows() == [b"ad", b"be", b"cf"]
+
+    def test_bounds(self):
+        g = Grid.from_lines(["abc", "def"])
+        assert g.in_bounds(1, 2)
+        assert not g.in_bounds(2, 0)
+        assert not g.in_bounds(0, -1)
+        assert list(g.neighbours(0, 0)) == [(0, 1), (1, 0)]
+        assert list(g.neighbours(1, 1)) == [(0, 1), (1, 2), (1, 0)]
+        assert g.wrapped(-1, 3) == ord("d")
+        assert g.wrapped(5, -2) == ord("e")
+
+    def test_padded(self):
+        g = Grid.from_lines(["ab", "cd"]).padded(ord("#"))
+        assert g.rows() == [b"####", b"#ab#", b"#cd#", b"####"]
+        assert g.index(1, 1) + flat_offsets(g.width)[DIR_S] == g.index(2, 1)
+
+    def test_mutable(self):
+        g = Grid.from_lines(["abc"])
+        c = g.copy(mutable=True)
+        c.array[0, 0] = ord("z")
+        assert c.cells == b"zbc"
+        assert g.cells == b"abc"
+
+    def test_puzzle(self):
+        p = D03Step1Puzzle(self.get_input("d03.sample.txt"))
+        assert (p.grid.width, p.grid.height) == (10, 10)
+        assert p.instrumentation.lines == 10
+        assert p.input_lines == []
@@ -0,0 +1,53 @@
+import json
+
+from aoc2023.day10 import D10Step2Puzzle
+from aoc2023.day17 import D17Step1Puzzle
+from aoc2023.day20 import D20Step1Puzzle
+from aoc2023.day23 import D23Step2Puzzle
+from tests.base import AOCPuzzleTester
+
+
+# Same puzzle, with memory tracing
+class TracedD10Step2Puzzle(D10Step2Puzzle):
+    TRACE_MEMORY = True
+
+
+class TestInstrumentation(AOCPuzzleTester):
+    def test_parse(self):
+        input_file = self.get_input("d10.sample.txt")
+        p = D10Step2Puzzle(input_file)
+        i = p.instrumentation
+        assert i.lines == 5
+        assert i.bytes_read == input_file.stat().st_size
+        assert i.parse_time > 0
+        assert i.solve_calls == 0
+        assert i.memory_peak is None
+
+    def test_nested_solve(self):
+        # Step 2 calls super().solve(): only measured once
+        p = D10Step2Puzzle(self.get_input("d10.sample2.txt"))
+        p.solve()
+        assert p.instrumentation.solve_calls == 1
+        assert p.instrumentation.solve_time > 0
+
+    def test_memory(self):
+        p = TracedD10Step2Puzzle(self.get_input("d10.sample2.txt"))
+        p.solve()
+        assert p.instrumentation.memory_peak > 0
+
+    def test_counters(self):
+        for puzzle, input_name, counter in [
+            (D17Step1Puzzle, "d17.sample.txt", "expansions"),
+            (D20Step1Puzzle, "d20.sample.txt", "pulses"),
+            (D23Step2Puzzle, "d23.sample.txt", "paths"),
+        ]:
+            p = puzzle(self.get_input(input_name))
+            p.solve()
+            assert p.instrumentation.counters[counter] > 0
+
+    def test_json(self):
+        p = D20Step1Puzzle(self.get_input("d20.sample.txt"))
+        p.solve()
+        d = json.loads(p.instrumentation.as_json())
+        assert d["counters"] == {"button_pushes": 1, "pulses": 12}
+        assert d["lines"] == 5
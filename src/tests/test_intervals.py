@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from aoc2023.intervals import IntervalMap, SplitGraph, boxes_of, intersect, merge, split, volumes
+from benchmarks.bench_intervals import main as bench_main
+from tests.base import AOCPuzzleTester
+
+
+class TestIntervals(AOCPuzzleTester):
+    def test_split(self):
+        pieces, segments = split(np.array([[0, 9], [12, 12], [20, 30]]), np.array([5, 12, 25]))
+        assert pieces.tolist() == [[0, 4], [5, 9], [12, 12], [20, 24], [25, 30]]
+        assert segments.tolist() == [0, 1, 2, 2, 3]
+        pieces, segments = split(np.array([[0, 9]]), np.array([20]))
+        assert (pieces.tolist(), segments.tolist()) == ([[0, 9]], [0])
+
+    def test_merge(self):
+        assert merge(np.array([[10, 12], [0, 3], [2, 5], [6, 8], [14, 20], [15, 16]])).tolist() == [[0, 8], [10, 12], [14, 20]]
+        assert merge(np.zeros((0, 2), dtype=np.int64)).shape == (0, 2)
+
+    def test_intersect(self):
+        assert intersect(np.array([[0, 3], [5, 9], [12, 20]]), 2, 14).tolist() == [[2, 3], [5, 9], [12, 14]]
+        assert intersect(np.array([[0, 3]]), 5, 9).shape == (0, 2)
+
+    def test_interval_map(self):
+        m = IntervalMap([(10, 19, 100), (0, 4, -1)])
+        assert m.apply(np.array([[0, 30], [12, 13], [7, 8]])).tolist() == [[-1, 3], [5, 9], [110, 119], [20, 30], [112, 113], [7, 8]]
+        with pytest.raises(AssertionError, match="Overlapping ranges"):
+            IntervalMap([(0, 10, 1), (5, 20, 2)])
+
+    def test_split_graph(self):
+        # x < 10 --> A; else y >= 5 --> R; else A
+        g = SplitGraph([(0, 10, -1, 1), (1, 5, -1, -2)])
+        outcomes = g.route(boxes_of(np.array([[0, 0]]), np.array([[19, 9]])), 0)
+        assert outcomes[-1].tolist() == [[[0, 9], [0, 9]], [[10, 19], [0, 4]]]
+        assert outcomes[-2].tolist() == [[[10, 19], [5, 9]]]
+        assert volumes(outcomes[-1]).tolist() == [100, 50]
+        assert g.route(boxes_of(np.array([[0, 0]]), np.array([[1, 1]])), -2)[-2].shape == (1, 2, 2)
+
+    def test_bench(self, capsys):
+        bench_main(["--seeds", "100", "--depth", "3", "--parts", "100", "--repeat", "1", "--output", str(self.test_folder)])
+        out = capsys.readouterr().out.splitlines()
+        assert [line.split()[:2] for line in out[2:]] == [["5", "1"], ["5", "2"], ["19", "1"], ["19", "2"]]
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from aoc2023.ints import extract_ints, scan_ints
+from benchmarks.bench_ints import main as bench_main
+from tests.base import AOCPuzzleTester
+
+
+class TestInts(AOCPuzzleTester):
+    def test_scan(self):
+        values, lines = scan_ints(b"Card 1: 41 -48 83\n\nx=-7,y=0 z-3\n1234567890123")
+        assert values.tolist() == [1, 41, -48, 83, -7, 0, -3, 1234567890123]
+        assert lines.tolist() == [0, 0, 0, 0, 2, 2, 2, 3]
+        assert values.dtype == np.int64
+
+    def test_empty(self):
+        for data in (b"", b"no integers here\n"):
+            values, lines = scan_ints(data)
+            assert len(values) == len(lines) == 0
+
+    def test_extract(self):
+        assert extract_ints(memoryview(b"1,2,3 @ -4,5,-6\n7,8,9 @ 10,11,12\n"), 6).tolist() == [[1, 2, 3, -4, 5, -6], [7, 8, 9, 10, 11, 12]]
+        assert extract_ints(bytearray(b"12 34")).tolist() == [12, 34]
+
+    def test_too_long(self):
+        with pytest.raises(AssertionError, match="Integer token too long"):
+            scan_ints(b"1 " + b"9" * 19)
+
+    def test_bench(self, capsys):
+        bench_main(["--day", "9", "--scale", "1", "--repeat", "1"])
+        out = capsys.readouterr().out.splitlines()
+        assert out[2].split()[0] == "9"
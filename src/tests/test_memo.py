@@ -0,0 +1,67 @@
+from aoc2023.day12 import D12Step2Puzzle, count_solutions
+from aoc2023.memo import memoize
+from tests.base import AOCPuzzleTester
+
+
+class TestMemo(AOCPuzzleTester):
+    def test_hits_misses(self):
+        calls = []
+
+        @memoize()
+        def square(x: int) -> int:
+            calls.append(x)
+            return x * x
+
+        assert [square(x) for x in (1, 2, 1, 3, 2)] == [1, 4, 1, 9, 4]
+        assert calls == [1, 2, 3]
+        assert square.memo.stats() == {"entries": 3, "hits": 2, "misses": 3, "evictions": 0}
+        square.memo.clear()
+        assert square(1) == 1
+        assert square.memo.stats() == {"entries": 1, "hits": 0, "misses": 1, "evictions": 0}
+
+    def test_lru_entries(self):
+        calls = []
+
+        @memoize(max_entries=2)
+        def double(x: int) -> int:
+            calls.append(x)
+            return 2 * x
+
+        double(1)
+        double(2)
+        double(1)  # 2 is now the least recently used
+        double(3)
+        assert list(double.memo.entries) == [(1,), (3,)]
+        double(2)
+        assert calls == [1, 2, 3, 2]
+        assert double.memo.evictions == 2
+
+    def test_max_bytes(self):
+        @memoize(max_entries=None, max_bytes=2000)
+        def text(x: int) -> str:
+            return "x" * x
+
+        for x in range(10):
+            text(500 + x)
+        stats = text.memo.stats()
+        assert 0 < stats["size"] <= 2000
+        assert stats["entries"] + stats["evictions"] == 10
+        assert stats["entries"] < 10
+
+    def test_recursive(self):
+        @memoize(max_entries=10)
+        def fib(n: int) -> int:
+            return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+        assert fib(200) == 280571172992510140037611932413038677189525
+        assert fib.memo.misses == 201
+
+    def test_puzzle_scope(self):
+        # Memoized functions are cleared after solve, with their statistics in counters
+        p = D12Step2Puzzle(self.get_input("d12.sample.txt"))
+        assert p.solve() == 525152
+        assert count_solutions.memo.stats()["entries"] == 0
+        counters = p.instrumentation.counters
+        assert counters["memo.count_solutions.misses"] > 0
+        assert counters["memo.count_solutions.hits"] > 0
+        assert counters["memo.count_solutions.evictions"] == 0
@@ -0,0 +1,74 @@
+import pickle
+from dataclasses import field
+from typing import List
+
+import pytest
+
+from aoc2023.day24 import D24Step2Puzzle, HailStone
+from aoc2023.models import StructOfArrays, slotted
+from tests.base import AOCPuzzleTester
+
+
+@slotted
+class Base:
+    name: str
+    values: List[int] = field(default_factory=list)
+
+    def describe(self) -> str:
+        return f"base {self.name}"
+
+
+@slotted
+class Child(Base):
+    count: int = 0
+
+    def describe(self) -> str:
+        return "child/" + super().describe()
+
+
+class TestModels(AOCPuzzleTester):
+    def test_slotted(self):
+        c = Child("a", [1], 2)
+        assert not hasattr(c, "__dict__")
+        assert Base.__slots__ == ("name", "values")
+        assert Child.__slots__ == ("count",)
+        assert c == Child("a", [1], 2)
+        assert repr(c) == "Child(name='a', values=[1], count=2)"
+        assert Child("b").values == [] and Child("b").count == 0
+        with pytest.raises(AttributeError):
+            c.other = 1
+
+    def test_slotted_super(self):
+        assert Child("a").describe() == "child/base a"
+
+    def test_slotted_pickle(self):
+        c = Child("a", [1], 2)
+        assert pickle.loads(pickle.dumps(c)) == c
+
+    def test_struct_of_arrays(self):
+        soa = StructOfArrays(HailStone, dict.fromkeys(("px", "py", "pz"), "q"))
+        soa.append(1, 2, 3, 4, 5, 6)
+        soa.append(7, 8, 9, -1, -2, -3)
+        assert len(soa) == 2
+        assert soa[1] == HailStone(7, 8, 9, -1, -2, -3)
+        assert soa[-1] == soa[1]
+        assert list(soa) == [HailStone(1, 2, 3, 4, 5, 6), HailStone(7, 8, 9, -1, -2, -3)]
+        assert soa.column("px").typecode == "q"
+        assert soa.column("vx") == [4, -1]
+        with pytest.raises(AssertionError):
+            soa.append(1, 2)
+        with pytest.raises(OverflowError):
+            soa.append(1 << 64, 0, 0, 0, 0, 0)
+
+    def test_struct_of_arrays_extend(self):
+        soa, other = (StructOfArrays(HailStone, {"px": "q"}) for _ in range(2))
+        soa.append(1, 2, 3, 4, 5, 6)
+        other.append(7, 8, 9, -1, -2, -3)
+        soa.extend(other)
+        assert list(soa) == [HailStone(1, 2, 3, 4, 5, 6), HailStone(7, 8, 9, -1, -2, -3)]
+        assert soa.column("px").typecode == "q"
+
+    def test_puzzle_columns(self):
+        p = D24Step2Puzzle(self.get_input("d24.sample.txt"))
+        assert len(p.hailstones) == 5
+        assert p.hailstones[0] == HailStone(19, 13, 30, -2, 1, -2)
@@ -0,0 +1,44 @@
+import json
+
+from aoc2023.orchestrator import Job, TimingsHistory, list_jobs, schedule, solve_all, solve_job
+from aoc2023.runner import main
+from tests.base import AOCPuzzleTester
+
+
+class TestOrchestrator(AOCPuzzleTester):
+    def test_list_jobs(self):
+        jobs = list_jobs(self.INPUTS_ROOT, [11, 25, 26])
+        assert [(j.day, j.step) for j in jobs] == [(11, 1), (11, 2), (25, 1)]
+
+    def test_schedule(self):
+        jobs = [Job(d, s, None) for d, s in [(1, 1), (12, 2), (23, 2), (16, 2)]]
+        assert [j.key for j in schedule(jobs, TimingsHistory())] == ["d23/s2", "d12/s2", "d16/s2", "d01/s1"]
+
+    def test_schedule_history(self):
+        history_file = self.test_folder / "history.json"
+        history_file.write_text(json.dumps({"d01/s1": 100.0}))
+        jobs = [Job(d, s, None) for d, s in [(12, 2), (1, 1)]]
+        assert [j.key for j in schedule(jobs, TimingsHistory(history_file))] == ["d01/s1", "d12/s2"]
+
+    def test_solve_job_error(self):
+        r = solve_job(Job(1, 1, self.get_input("d01.missing.txt")))
+        assert r.solution is None
+        assert r.error.startswith("AssertionError: File not found")
+
+    def test_solve_all(self):
+        history_file = self.test_folder / "history.json"
+        result = solve_all(list_jobs(self.INPUTS_ROOT, [2, 11]), 2, TimingsHistory(history_file))
+        assert [(r.job.key, r.solution) for r in result.results] == [
+            ("d02/s1", 2268),
+            ("d02/s2", 63542),
+            ("d11/s1", 9543156),
+            ("d11/s2", 625243292686),
+        ]
+        assert result.wall_time > 0
+        assert sorted(json.loads(history_file.read_text()).keys()) == ["d02/s1", "d02/s2", "d11/s1", "d11/s2"]
+
+    def test_main_solve_all(self, capsys):
+        main(["solve-all", "--day", "2", "--workers", "1", str(self.INPUTS_ROOT)])
+        out = capsys.readouterr().out.splitlines()
+        assert out[2].split()[:3] == ["2", "1", "2268"]
+        assert out[-1].startswith("wall time: ")
@@ -0,0 +1,90 @@
+import cProfile
+import pstats
+from pathlib import Path
+
+from aoc2023.day05 import D05Step2Puzzle
+from aoc2023.day11 import D11Puzzle
+from aoc2023.profiling import PROFILE_ENV, collapsed_stacks, env_profile_dir, input_digest, phase_name, profile_name
+from aoc2023.runner import main
+from tests.base import AOCPuzzleTester
+
+
+class TestProfiling(AOCPuzzleTester):
+    def test_profile_name(self):
+        assert input_digest(b"abc") == input_digest("abc") == input_digest(["a", "bc"]) == "ba7816bf8f01"
+        assert input_digest(iter(["abc"])) == "stream"
+        assert profile_name("D05Step2Puzzle", "ba7816bf8f01", "parse") == "d05-step2-ba7816bf8f01-parse"
+        assert profile_name("D11Puzzle", "ba7816bf8f01", phase_name("solve", (2,))) == "d11-ba7816bf8f01-solve-2"
+        assert profile_name("Other", "stream", "solve") == "Other-stream-solve"
+        assert phase_name("solve") == "solve"
+        assert phase_name("solve", ((7, 27),)) == "solve-7-27"
+
+    def test_collapsed_shared_helpers(self):
+        # Each level calls the next one through two helpers: paths count doubles at each level, but stacks count stays linear
+        source = "def f0():\n    return sum(range(100))\n"
+        for k in range(1, 15):
+            source += f"def a{k}():\n    return f{k - 1}()\ndef b{k}():\n    return f{k - 1}()\ndef f{k}():\n    return a{k}() + b{k}()\n"
+        functions = {}
+        exec(compile(source, "levels.py", "exec"), functions)
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        functions["f14"]()
+        profiler.disable()
+        stats = pstats.Stats(profiler)
+        stacks = collapsed_stacks(stats)
+        assert 0 < len(stacks) <= len(stats.stats) + sum(len(callers) for _, _, _, _, callers in stats.stats.values())
+        assert all(stack.startswith("f14 (levels.py:") for stack in stacks if "disable" not in stack)
+
+    def test_env(self, monkeypatch):
+        monkeypatch.delenv(PROFILE_ENV, raising=False)
+        assert env_profile_dir() is None
+        monkeypatch.setenv(PROFILE_ENV, "some/folder")
+        assert env_profile_dir() == Path("some/folder")
+
+    def test_profiled_puzzle(self, monkeypatch):
+        output = self.test_folder / "profiles"
+        monkeypatch.setattr(D05Step2Puzzle, "PROFILE_DIR", output)
+        p = D05Step2Puzzle(self.get_input("d05.sample.txt"))
+        assert sorted(f.name for f in output.iterdir()) == ["d05-step2-071c16b135ef-parse.collapsed", "d05-step2-071c16b135ef-parse.pstats"]
+        assert p.solve() == 46
+        assert len(list(output.glob("*-solve.*"))) == 2
+
+        # Profile files can be read by pstats, and collapsed stacks lines are "stack <microseconds>"
+        stats = pstats.Stats(str(output / "d05-step2-071c16b135ef-solve.pstats"))
+        assert any(name == "solve" for _, _, name in stats.stats)
+        lines = (output / "d05-step2-071c16b135ef-solve.collapsed").read_text().splitlines()
+        assert lines
+        for line in lines:
+            stack, value = line.rsplit(" ", 1)
+            assert stack.startswith("solve (day05.py:") and int(value) > 0
+
+    def test_solve_args(self, monkeypatch):
+        # Both steps of day 11 are served by the same class: profiles are named by solve argument
+        output = self.test_folder / "profiles"
+        monkeypatch.setattr(D11Puzzle, "PROFILE_DIR", output)
+        p = D11Puzzle(self.get_input("d11.sample.txt"))
+        assert p.solve(2) == 374
+        assert p.solve(10) == 1030
+        assert sorted(f.name for f in output.glob("*.pstats")) == [f"d11-{p._input_digest}-{phase}.pstats" for phase in ("parse", "solve-10", "solve-2")]
+
+    def test_env_at_construction(self, monkeypatch):
+        # Environment is read when the puzzle is built (not when the module is imported)
+        output = self.test_folder / "profiles"
+        monkeypatch.setenv(PROFILE_ENV, str(output))
+        assert D11Puzzle(self.get_input("d11.sample.txt")).solve(2) == 374
+        assert len(list(output.glob("d11-*.pstats"))) == 2
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.delenv(PROFILE_ENV, raising=False)
+        monkeypatch.setattr(D11Puzzle, "PROFILE_DIR", None)
+        output = self.test_folder / "profiles"
+        assert D11Puzzle(self.get_input("d11.sample.txt")).solve(2) == 374
+        assert not output.exists()
+
+    def test_main(self, capsys, monkeypatch):
+        monkeypatch.setattr(D05Step2Puzzle, "PROFILE_DIR", None)
+        output = self.test_folder / "profiles"
+        main(["run", "--day", "5", "--step", "2", "--profile", str(output), str(self.get_input("d05.sample.txt"))])
+        assert capsys.readouterr().out.splitlines()[0] == "D05Step2Puzzle: 46"
+        assert len(list(output.glob("d05-step2-*.pstats"))) == 2
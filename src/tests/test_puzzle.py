@@ -0,0 +1,139 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from aoc2023 import puzzle
+from aoc2023.day01 import D01Step1Puzzle
+from aoc2023.day03 import D03Step1Puzzle
+from aoc2023.day04 import D04Step1Puzzle
+from aoc2023.day09 import D09Step1Puzzle
+from aoc2023.grid import Grid
+from aoc2023.puzzle import AOCPuzzle, InputChunk, iter_mapped_lines, split_chunks
+from aoc2023.registry import REGISTRY
+from aoc2023.runner import main
+from tests.base import AOCPuzzleTester
+
+
+# Basic puzzle, only remembering lines
+class LinesPuzzle(AOCPuzzle):
+    def solve(self) -> int:
+        return len(self.input_lines)
+
+
+class StreamingLinesPuzzle(LinesPuzzle):
+    STREAMING = True
+
+
+# Parsed state of a puzzle
+def parsed_state(p: AOCPuzzle) -> bytes:
+    return pickle.dumps({k: v for k, v in p.__dict__.items() if k not in ("input_file", "instrumentation")})
+
+
+class TestPuzzle(AOCPuzzleTester):
+    def write_input(self, content: bytes) -> Path:
+        out = self.test_folder / "input.txt"
+        out.write_bytes(content)
+        return out
+
+    def test_mapped_lines(self):
+        assert list(iter_mapped_lines(self.write_input(b"abc\r\ndef\n\nghi"))) == ["abc\r\n", "def\n", "\n", "ghi"]
+
+    def test_mapped_lines_empty(self):
+        assert list(iter_mapped_lines(self.write_input(b""))) == []
+
+    def test_streaming_same_lines(self):
+        input_file = self.get_input("d03.input.txt")
+        assert StreamingLinesPuzzle(input_file).input_lines == LinesPuzzle(input_file).input_lines
+
+    def test_streaming_no_kept_lines(self):
+        assert D01Step1Puzzle.STREAMING and not D01Step1Puzzle.KEEP_INPUT_LINES
+        p = D01Step1Puzzle(self.get_input("d01.sample.txt"))
+        assert p.input_lines == []
+        assert len(p.digits) == 4
+
+    def test_default_mode(self):
+        assert not D03Step1Puzzle.STREAMING
+        self.check_solution(D03Step1Puzzle, "d03.sample.txt", 4361)
+
+    def test_memory_inputs(self):
+        data = b"abc\r\ndef\n\nghi"
+        for memory_input in (data, bytearray(data), memoryview(data), data.decode(), iter(data.decode().splitlines(keepends=True))):
+            p = LinesPuzzle(memory_input)
+            assert p.input_lines == ["abc", "def", "", "ghi"]
+            assert p.instrumentation.bytes_read == len(data)
+            assert p.instrumentation.lines == 4
+        assert LinesPuzzle(["abc", "def"]).input_lines == ["abc", "def"]
+
+    def test_memory_inputs_all_days(self):
+        for day, step in REGISTRY:
+            puzzle_class = REGISTRY.get(day, step)
+            input_file = self.get_input(f"d{day:02}.sample.txt")
+            expected = parsed_state(puzzle_class(input_file))
+            data = input_file.read_bytes()
+            text = data.decode()
+            for memory_input in (data, memoryview(data), text, iter(text.splitlines(keepends=True)), iter(text.splitlines())):
+                assert (
+                    parsed_state(puzzle_class(memory_input)) == expected
+                ), f"Parsed state mismatch for {puzzle_class.__name__} from {type(memory_input).__name__}"
+
+    def test_memory_grid(self):
+        expected = Grid.from_file(self.get_input("d14.sample.txt"))
+        text = self.get_input("d14.sample.txt").read_text()
+        assert Grid.from_bytes(memoryview(text.encode())) == expected
+        assert Grid.from_lines(text.splitlines()) == expected
+
+    def test_split_chunks(self):
+        data = b"a\nbb\nccc\ndddd\n"
+        assert split_chunks(data, 1, 1) == [InputChunk(data, 1)]
+        assert split_chunks(data, 2, 1) == [InputChunk(b"a\nbb\nccc\n", 1), InputChunk(b"dddd\n", 4)]
+        assert split_chunks(data, 10, 1) == [InputChunk(b"a\n", 1), InputChunk(b"bb\n", 2), InputChunk(b"ccc\n", 3), InputChunk(b"dddd\n", 4)]
+        assert split_chunks(data, 2, 10) == [InputChunk(data, 1)]
+        assert split_chunks(b"abc", 3, 1) == [InputChunk(b"abc", 1)]
+        assert split_chunks(b"", 3, 1) == []
+
+    def test_chunked_parsing(self, monkeypatch):
+        monkeypatch.setattr(puzzle, "MIN_CHUNK_SIZE", 100)
+        for day, step in REGISTRY:
+            puzzle_class = REGISTRY.get(day, step)
+            if not puzzle_class.CHUNKED_PARSING:
+                continue
+            input_file = self.get_input(f"d{day:02}.input.txt")
+            expected = puzzle_class(input_file)
+            monkeypatch.setattr(puzzle_class, "PARSE_WORKERS", 3)
+            for chunked_input in (input_file, input_file.read_bytes()):
+                p = puzzle_class(chunked_input)
+                assert parsed_state(p) == parsed_state(expected), f"Parsed state mismatch for {puzzle_class.__name__}"
+                assert p.instrumentation.lines == expected.instrumentation.lines
+                assert p.instrumentation.bytes_read == expected.instrumentation.bytes_read
+        assert sorted({day for day, step in REGISTRY if REGISTRY.get(day, step).CHUNKED_PARSING}) == [1, 2, 4, 7, 9, 12, 24]
+
+    @pytest.mark.parametrize("puzzle_class,input_name,expected", [(D04Step1Puzzle, "d04.input.txt", 20407), (D09Step1Puzzle, "d09.input.txt", 1972648895)])
+    def test_chunked_parsing_small_buffered(self, puzzle_class, input_name, expected, monkeypatch):
+        # Too small to be split: buffered days must still be parsed at once
+        monkeypatch.setattr(puzzle_class, "PARSE_WORKERS", 4)
+        assert puzzle_class.BUFFERED_PARSING
+        for chunked_input in (self.get_input(input_name), self.get_input(input_name).read_bytes()):
+            assert puzzle_class(chunked_input).solve() == expected
+
+    def test_main_parse_workers(self, capsys, monkeypatch):
+        monkeypatch.setattr(puzzle, "MIN_CHUNK_SIZE", 100)
+        workers = []
+        monkeypatch.setattr(puzzle, "split_chunks", lambda data, n: workers.append(n) or split_chunks(data, n))
+        main(["run", "--day", "1", "--step", "1", "--parse-workers", "2", "--instrumentation", str(self.get_input("d01.input.txt"))])
+        out = capsys.readouterr().out.splitlines()
+        assert out[0] == "D01Step1Puzzle: 55029"
+        assert workers == [2]
+
+        # Options are restored after the run
+        assert D01Step1Puzzle.PARSE_WORKERS == 1
+        assert "PARSE_WORKERS" not in vars(D01Step1Puzzle)
+
+    def test_direction_tables(self):
+        for d in puzzle.Direction:
+            i = puzzle.DIR_OF[d]
+            assert puzzle.DIR_OFFSETS[i] == puzzle.OFFSETS[d]
+            assert puzzle.DIR_OPPOSITE[i] == puzzle.DIR_OF[puzzle.OPPOSITE[d]]
+            assert puzzle.DIR_LEFT[puzzle.DIR_RIGHT[i]] == i
+            assert puzzle.DIR_RIGHT[puzzle.DIR_RIGHT[i]] == puzzle.DIR_OPPOSITE[i]
+        assert puzzle.flat_offsets(10) == (-10, 1, 10, -1)
@@ -0,0 +1,86 @@
+import sys
+
+import pytest
+
+from aoc2023.day11 import D11Puzzle
+from aoc2023.day17 import D17Step2Puzzle
+from aoc2023.registry import BUILTIN_PUZZLES, ENTRY_POINTS_GROUP, REGISTRY, PuzzleRegistry
+from aoc2023.runner import main
+from tests.base import AOCPuzzleTester
+
+# External puzzle module
+EXTERNAL_MODULE = """
+from aoc2023.puzzle import AOCPuzzle
+
+
+class D26Step1Puzzle(AOCPuzzle):
+    def solve(self) -> int:
+        return len(self.input_lines)
+"""
+
+
+class TestRegistry(AOCPuzzleTester):
+    @pytest.fixture
+    def external(self, monkeypatch, request):
+        # Install an external puzzles module, with an entry point declaration
+        module_name = f"ext_{request.function.__name__}"
+        self.test_folder.mkdir(parents=True, exist_ok=True)
+        (self.test_folder / f"{module_name}.py").write_text(EXTERNAL_MODULE)
+        dist_info = self.test_folder / "ext_puzzles-1.0.dist-info"
+        dist_info.mkdir(exist_ok=True)
+        (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: ext-puzzles\nVersion: 1.0\n")
+        (dist_info / "entry_points.txt").write_text(f"[{ENTRY_POINTS_GROUP}]\nd26/s1 = {module_name}:D26Step1Puzzle\n")
+        monkeypatch.syspath_prepend(str(self.test_folder))
+        yield module_name
+        sys.modules.pop(module_name, None)
+
+    def test_builtin(self):
+        r = PuzzleRegistry(BUILTIN_PUZZLES)
+        assert len(r) == 51
+        assert (25, 2) not in r
+        assert r.get(17, 2) is D17Step2Puzzle
+        assert r.get(11, 1) is r.get(11, 2) is D11Puzzle
+        for day, step in r:
+            assert r.get(day, step).__module__ == f"aoc2023.day{day:02}"
+
+    def test_unknown(self):
+        with pytest.raises(AssertionError, match="Unknown puzzle: D17Step3Puzzle"):
+            PuzzleRegistry(BUILTIN_PUZZLES).get(17, 3)
+        r = PuzzleRegistry({(1, 1): "aoc2023.day01:Foo"})
+        with pytest.raises(AssertionError, match="Unknown puzzle: Foo not found in aoc2023.day01"):
+            r.get(1, 1)
+        with pytest.raises(AssertionError, match="Invalid puzzle class path"):
+            r.register(1, 2, "aoc2023.day01.Foo")
+
+    def test_register(self, external):
+        r = PuzzleRegistry()
+        r.register(26, 1, f"{external}:D26Step1Puzzle")
+        r.register(17, 2, D17Step2Puzzle)
+        assert list(r) == [(17, 2), (26, 1)]
+        assert r.class_path(17, 2) == "aoc2023.day17:D17Step2Puzzle"
+
+        # Lazy import
+        assert external not in sys.modules
+        assert r.get(26, 1).__name__ == "D26Step1Puzzle"
+        assert external in sys.modules
+
+        r.unregister(26, 1)
+        assert (26, 1) not in r
+
+    def test_entry_points(self, external):
+        r = PuzzleRegistry(BUILTIN_PUZZLES, ENTRY_POINTS_GROUP)
+        assert not r.entry_points_loaded
+        r.get(1, 1)
+        assert not r.entry_points_loaded
+        assert r.class_path(26, 1) == f"{external}:D26Step1Puzzle"
+        assert r.entry_points_loaded
+        assert len(r) == 52
+        assert external not in sys.modules
+        self.check_solution(r.get(26, 1), "d01.sample.txt", 4)
+
+    def test_list(self, capsys):
+        main(["list"])
+        out = capsys.readouterr().out.splitlines()
+        assert out[0].split() == ["day", "step", "class"]
+        assert out[2].split() == ["0", "1", "aoc2023.day00:D00Step1Puzzle"]
+        assert len(out) == 2 + len(REGISTRY)
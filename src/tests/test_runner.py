@@ -0,0 +1,53 @@
+import pytest
+
+from aoc2023.day17 import D17Step2Puzzle
+from aoc2023.runner import Timings, find_puzzle, main, run_puzzle
+from tests.base import AOCPuzzleTester
+
+
+class TestRunner(AOCPuzzleTester):
+    def test_find_puzzle(self):
+        assert find_puzzle(17, 2) is D17Step2Puzzle
+
+    def test_find_unknown_puzzle(self):
+        with pytest.raises(AssertionError, match="Unknown puzzle: D17Step3Puzzle"):
+            find_puzzle(17, 3)
+
+    def test_timings(self):
+        t = Timings([float(i) for i in range(1, 101)])
+        assert t.min_ == 1.0
+        assert t.median == 50.5
+        assert t.p95 == 95.0
+
+    def test_run_repeat(self):
+        r = run_puzzle(D17Step2Puzzle, self.get_input("d17.sample.txt"), repeat=3)
+        assert r.solution == 94
+        assert len(r.parse.values) == 3
+        assert len(r.solve.values) == 3
+
+    def test_main_run(self, capsys):
+        main(["run", "--day", "17", "--step", "2", str(self.get_input("d17.sample.txt"))])
+        out = capsys.readouterr().out.splitlines()
+        assert out[0] == "D17Step2Puzzle: 94"
+        assert out[1].startswith("parse: ")
+        assert out[2].startswith("solve: ")
+
+    def test_main_run_args(self, capsys):
+        main(["run", "--day", "24", "--step", "1", "--arg", "7", "--arg", "27", "--repeat", "2", str(self.get_input("d24.sample.txt"))])
+        out = capsys.readouterr().out.splitlines()
+        assert out[0] == "D24Step1Puzzle: 2"
+        assert "p95=" in out[2]
+
+    def test_main_state_cache(self, capsys):
+        cache_dir = self.test_folder / "cache"
+        for step, expected in ((1, 5), (2, 7)):
+            for _ in range(2):
+                main(["run", "--day", "22", "--step", str(step), "--state-cache", str(cache_dir), str(self.get_input("d22.sample.txt"))])
+                assert capsys.readouterr().out.splitlines()[0] == f"D22Step{step}Puzzle: {expected}"
+        assert len(list(cache_dir.glob("*.pickle"))) == 2
+
+        # Specified step, then all steps of the day
+        main(["invalidate", "--state-cache", str(cache_dir), "--day", "22", "--step", "2"])
+        assert [p.name.split("-")[0] for p in cache_dir.glob("*.pickle")] == ["aoc2023.day22.D22Step1Puzzle"]
+        main(["invalidate", "--state-cache", str(cache_dir), "--day", "22"])
+        assert len(list(cache_dir.glob("*.pickle"))) == 0
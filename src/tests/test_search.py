@@ -0,0 +1,33 @@
+from aoc2023.search import UNREACHED, Search
+from benchmarks.bench_search import main as bench_main
+from tests.base import AOCPuzzleTester
+
+# Weighted graph: 0 -1-> 1 -1-> 2 -1-> 4, 0 -5-> 3 -0-> 4 (and 5 is unreachable)
+EDGES = {0: [(1, 1), (3, 5)], 1: [(2, 1)], 2: [(4, 1)], 3: [(4, 0)], 4: [], 5: [(0, 1)]}
+
+
+class TestSearch(AOCPuzzleTester):
+    def test_bfs(self):
+        s = Search(6)
+        distances = s.bfs((0,), lambda state: [n for n, _ in EDGES[state]])
+        assert list(distances) == [0, 1, 2, 1, 2, UNREACHED]
+        assert (s.levels, s.expansions) == ([1, 2, 2], 5)
+
+        s = Search(6)
+        assert list(s.bfs((0,), lambda state: [n for n, _ in EDGES[state]], max_depth=1)) == [0, 1, UNREACHED, 1, UNREACHED, UNREACHED]
+
+    def test_dijkstra(self):
+        s = Search(6)
+        assert s.dijkstra((0,), EDGES.get, lambda state: state == 4) == 3
+        assert s.distances[3] == 5
+        assert Search(6).dijkstra((0,), EDGES.get, lambda state: state == 5) is None
+
+    def test_astar(self):
+        s = Search(6)
+        assert s.astar((0,), EDGES.get, lambda state: state == 4, lambda state: 0 if state == 4 else 1) == 3
+        assert Search(6).astar((0,), EDGES.get, lambda state: state == 5, lambda state: 0) is None
+
+    def test_bench(self, capsys):
+        bench_main(["--scale", "1"])
+        out = capsys.readouterr().out.splitlines()
+        assert [line.split()[2] for line in out[2:]] == ["bfs", "dijkstra", "astar"]
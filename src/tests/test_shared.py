@@ -0,0 +1,58 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from aoc2023 import shared
+from aoc2023.day16 import D16Step2Puzzle
+from aoc2023.shared import SharedArrays, SharedArraysHandle
+from tests.base import AOCPuzzleTester
+
+
+# Worker task: sum of a shared array
+def shared_sum(handle: SharedArraysHandle, name: str) -> int:
+    with handle.attach() as arrays:
+        return int(arrays[name].sum())
+
+
+class TestShared(AOCPuzzleTester):
+    def test_attach(self):
+        values = np.arange(12, dtype=np.int64).reshape(3, 4)
+        with SharedArrays({"cells": b"abc", "values": values}) as shared:
+            with shared.handle.attach() as arrays:
+                assert arrays["cells"].tobytes() == b"abc"
+                assert np.array_equal(arrays["values"], values)
+                assert arrays["values"].ctypes.data % 64 == 0
+                with pytest.raises(ValueError):
+                    arrays["values"][0, 0] = 1
+                assert arrays["values"].base is not None  # i.e. a view
+        assert not Path("/dev/shm", shared.handle.name).exists()
+
+    def test_copy_failure(self, monkeypatch):
+        # Block is freed if arrays can't be copied in it (object arrays can't be shared)
+        created = []
+        monkeypatch.setattr(shared, "SharedMemory", lambda **kwargs: created.append(SharedMemory(**kwargs)) or created[-1])
+        with pytest.raises(ValueError):
+            SharedArrays({"cells": b"abc", "objects": np.array([None, 1], dtype=object)})
+        assert len(created) == 1
+        assert not Path("/dev/shm", created[0].name).exists()
+
+    def test_workers(self):
+        values = np.arange(1000, dtype=np.int32)
+        with SharedArrays({"values": values}) as shared, ProcessPoolExecutor(max_workers=2) as executor:
+            assert list(executor.map(shared_sum, [shared.handle] * 3, ["values"] * 3)) == [499500] * 3
+
+    @pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+    def test_leaked_view(self):
+        # Views must not outlive the attach block
+        with SharedArrays({"values": np.zeros(4)}) as shared:
+            with pytest.raises(BufferError, match="still alive"):
+                with shared.handle.attach() as arrays:
+                    leaked = arrays["values"]
+            del leaked
+
+    def test_d16_workers(self, monkeypatch):
+        monkeypatch.setattr(D16Step2Puzzle, "SOLVE_WORKERS", 3)
+        assert D16Step2Puzzle(self.get_input("d16.sample.txt")).solve() == 51
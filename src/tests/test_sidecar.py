@@ -0,0 +1,91 @@
+import os
+import pickle
+import shutil
+
+import numpy as np
+
+from aoc2023.day08 import D08Step2Puzzle
+from aoc2023.day24 import D24Step1Puzzle
+from aoc2023.registry import REGISTRY
+from aoc2023.runner import main
+from aoc2023.sidecar import convert, is_fresh, read_sidecar, sidecar_path, write_sidecar
+from benchmarks.bench_sidecar import main as bench_main
+from tests.base import AOCPuzzleTester
+
+
+class TestSidecar(AOCPuzzleTester):
+    def copy_input(self, name: str):
+        self.test_folder.mkdir(parents=True, exist_ok=True)
+        return shutil.copy(self.get_input(name), self.test_folder / name)
+
+    def test_write_read(self):
+        self.test_folder.mkdir(parents=True, exist_ok=True)
+        sidecar = self.test_folder / "foo.tokens"
+        arrays = {"a": np.arange(10, dtype=np.int64).reshape(5, 2), "b": np.frombuffer(b"xyz", dtype=np.uint8), "empty": np.zeros((0, 6), dtype=np.int64)}
+        write_sidecar(sidecar, "foo.v1", (arrays, {"names": ["x"]}), 3)
+        (loaded, meta), lines = read_sidecar(sidecar, "foo.v1")
+        assert (meta, lines) == ({"names": ["x"]}, 3)
+        assert sorted(loaded) == ["a", "b", "empty"]
+        for name, a in arrays.items():
+            assert loaded[name].dtype == a.dtype
+            assert np.array_equal(loaded[name], a)
+            assert not loaded[name].flags.writeable
+        assert read_sidecar(sidecar, "foo.v2") is None
+        sidecar.write_bytes(b"not a sidecar")
+        assert read_sidecar(sidecar, "foo.v1") is None
+
+    def test_damaged(self):
+        # Damaged sidecars are ignored: puzzle is parsed from text
+        input_file = self.copy_input("d24.sample.txt")
+        sidecar = convert(D24Step1Puzzle, input_file)
+        content = sidecar.read_bytes()
+        for damaged in (b"", b"AOCT", content[:20], content[: len(content) - 100], content.replace(b'"lines"', b'"linez"')):
+            sidecar.write_bytes(damaged)
+            os.utime(sidecar, ns=(input_file.stat().st_mtime_ns + 1_000_000_000,) * 2)
+            assert is_fresh(input_file, sidecar)
+            assert read_sidecar(sidecar, "d24.v1") is None
+            p = D24Step1Puzzle(input_file)
+            assert p.instrumentation.bytes_read == input_file.stat().st_size
+            assert p.solve((7, 27)) == 2
+
+    def test_freshness(self):
+        input_file = self.copy_input("d24.sample.txt")
+        sidecar = convert(D24Step1Puzzle, input_file)
+        assert sidecar == sidecar_path(input_file)
+        assert is_fresh(input_file, sidecar)
+        assert D24Step1Puzzle(input_file).instrumentation.bytes_read == sidecar.stat().st_size
+
+        # Input updated after sidecar: parsed from text
+        os.utime(input_file, ns=(sidecar.stat().st_mtime_ns + 1_000_000_000,) * 2)
+        assert not is_fresh(input_file, sidecar)
+        assert D24Step1Puzzle(input_file).instrumentation.bytes_read == input_file.stat().st_size
+
+    def test_same_state(self):
+        for day, step in REGISTRY:
+            puzzle_class = REGISTRY.get(day, step)
+            if puzzle_class.SIDECAR_FORMAT is None:
+                continue
+            for kind in ("sample", "input"):
+                input_file = self.copy_input(f"d{day:02}.{kind}.txt")
+                expected = puzzle_class(input_file)
+                convert(puzzle_class, input_file)
+                p = puzzle_class(input_file)
+                assert p.instrumentation.bytes_read == sidecar_path(input_file).stat().st_size
+                assert p.instrumentation.lines == expected.instrumentation.lines
+                assert pickle.dumps(p.__dict__ | {"input_file": None, "instrumentation": None}) == pickle.dumps(
+                    expected.__dict__ | {"input_file": None, "instrumentation": None}
+                ), f"Parsed state mismatch for {puzzle_class.__name__} ({kind})"
+                sidecar_path(input_file).unlink()
+
+    def test_main_tokenize(self, capsys):
+        input_file = self.copy_input("d08.sample3.txt")
+        main(["tokenize", "--day", "8", str(input_file)])
+        assert capsys.readouterr().out.startswith(f"{input_file} (0kB) --> {sidecar_path(input_file)}")
+        p = D08Step2Puzzle(input_file)
+        assert p.instrumentation.bytes_read == sidecar_path(input_file).stat().st_size
+        assert p.solve() == 6
+
+    def test_bench(self, capsys):
+        bench_main(["--day", "24", "--scale", "1", "--repeat", "1", "--output", str(self.test_folder)])
+        out = capsys.readouterr().out.splitlines()
+        assert out[2].split()[0] == "24"
@@ -0,0 +1,93 @@
+import pytest
+
+from aoc2023 import state_cache
+from aoc2023.day05 import D05Step2Puzzle
+from aoc2023.day19 import D19Step2Puzzle
+from aoc2023.day20 import D20Step2Puzzle
+from aoc2023.day22 import D22Step1Puzzle
+from aoc2023.day25 import D25Step1Puzzle
+from aoc2023.state_cache import StateCache
+from tests.base import AOCPuzzleTester
+
+
+class TestStateCache(AOCPuzzleTester):
+    @property
+    def cache(self) -> StateCache:
+        return StateCache(self.test_folder / "cache")
+
+    @pytest.mark.parametrize(
+        "puzzle,input_name,expected",
+        [
+            (D05Step2Puzzle, "d05.input.txt", 100165128),
+            (D19Step2Puzzle, "d19.input.txt", 136661579897555),
+            (D20Step2Puzzle, "d20.input.txt", 244465191362269),
+            (D22Step1Puzzle, "d22.input.txt", 426),
+            (D25Step1Puzzle, "d25.sample.txt", 54),
+        ],
+    )
+    def test_restore(self, puzzle, input_name, expected, monkeypatch):
+        # First load: parse and store
+        assert self.cache.load(puzzle, self.get_input(input_name)).solve() == expected
+        assert len(self.cache.entries) == 1
+
+        # Second load: restored without parsing
+        monkeypatch.setattr(puzzle, "parse_file", lambda _: pytest.fail("Unexpected parsing"))
+        p = self.cache.load(puzzle, self.get_input(input_name))
+        assert isinstance(p, puzzle)
+        assert p.solve() == expected
+
+    def test_corrupted(self):
+        entry = self.cache.entry_path(D05Step2Puzzle, self.get_input("d05.sample.txt"))
+        entry.parent.mkdir(parents=True)
+        entry.write_bytes(b"garbage")
+        assert self.cache.load(D05Step2Puzzle, self.get_input("d05.sample.txt")).solve() == 46
+        assert entry.read_bytes() != b"garbage"
+
+    def test_missing_file(self):
+        with pytest.raises(AssertionError, match="File not found"):
+            self.cache.load(D05Step2Puzzle, self.get_input("d05.missing.txt"))
+
+    def test_eviction(self):
+        cache = self.cache
+        cache.load(D05Step2Puzzle, self.get_input("d05.input.txt"))
+        cache.max_size = cache.size + 1
+        cache.load(D05Step2Puzzle, self.get_input("d05.sample.txt"))
+
+        # Only the last entry is kept
+        assert cache.entries == [cache.entry_path(D05Step2Puzzle, self.get_input("d05.sample.txt"))]
+
+    def test_shared_source_change(self, monkeypatch):
+        # Entries depend on imported shared modules sources, not only on the puzzle module
+        assert {"aoc2023.day05", "aoc2023.intervals", "aoc2023.puzzle"} <= state_cache.module_dependencies("aoc2023.day05")
+        assert "aoc2023.day17" not in state_cache.module_dependencies("aoc2023.day05")
+        entry = self.cache.entry_path(D05Step2Puzzle, self.get_input("d05.sample.txt"))
+        monkeypatch.setattr(state_cache, "CLASS_DIGESTS", {})
+        file_digest = state_cache.file_digest
+        monkeypatch.setattr(state_cache, "file_digest", lambda f: "changed" if f.name == "intervals.py" else file_digest(f))
+        assert self.cache.entry_path(D05Step2Puzzle, self.get_input("d05.sample.txt")) != entry
+
+    def test_source_digest_once(self, monkeypatch):
+        # Sources are hashed once per class
+        monkeypatch.setattr(state_cache, "CLASS_DIGESTS", {})
+        digest = state_cache.class_source_digest(D05Step2Puzzle)
+        monkeypatch.setattr(state_cache, "file_digest", lambda f: pytest.fail("Unexpected source hash"))
+        assert state_cache.class_source_digest(D05Step2Puzzle) == digest
+
+    def test_invalidate(self):
+        cache = self.cache
+        for input_name in ("d22.sample.txt", "d22.input.txt"):
+            cache.load(D22Step1Puzzle, self.get_input(input_name))
+        cache.load(D05Step2Puzzle, self.get_input("d05.sample.txt"))
+        assert len(cache.entries) == 3
+
+        # By input file
+        cache.invalidate(input_file=self.get_input("d22.sample.txt"))
+        assert len(cache.entries) == 2
+
+        # By class
+        cache.invalidate(D22Step1Puzzle)
+        assert cache.entries == [cache.entry_path(D05Step2Puzzle, self.get_input("d05.sample.txt"))]
+
+        # All
+        cache.invalidate()
+        assert cache.entries == []
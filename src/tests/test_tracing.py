@@ -0,0 +1,35 @@
+import logging
+
+from aoc2023.tracing import LOGGER, Lazy, trace, tracing
+from tests.base import AOCPuzzleTester
+
+
+# Argument remembering if it was formatted
+class Spy:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self) -> str:
+        self.formatted += 1
+        return "spy"
+
+
+class TestTrace(AOCPuzzleTester):
+    def test_enabled(self, caplog):
+        spy = Spy()
+        with caplog.at_level(logging.INFO, logger=LOGGER.name):
+            assert tracing()
+            trace("value: %s / lazy: %s", spy, Lazy(lambda: 42))
+        assert spy.formatted > 0
+        assert [(r.name, r.levelno, r.getMessage()) for r in caplog.records] == [("aoc2023", logging.INFO, "value: spy / lazy: 42")]
+        assert caplog.records[0].funcName == "test_enabled"
+
+    def test_disabled(self, caplog):
+        spy = Spy()
+        calls = []
+        with caplog.at_level(logging.WARNING, logger=LOGGER.name):
+            assert not tracing()
+            trace("value: %s / lazy: %s", spy, Lazy(lambda: calls.append(1)))
+        assert spy.formatted == 0
+        assert calls == []
+        assert caplog.records == []